@@ -0,0 +1,79 @@
+import os
+import numpy as np
+import pygame
+from Sprites import IMAGES_DIR
+
+
+class SpriteAtlas:
+    """
+    Todos os sprites de images/ numa folha só, desenhados por Surface.blits, com variantes
+    pré-rotacionadas a cada `rotation_step` graus. Com convert=False não toca no display.
+    """
+    def __init__(self, images_dir=IMAGES_DIR, rotatable=("projectile.png", "orbital_blade.png"),
+                 rotation_step=2, max_width=1024, padding=1, convert=True):
+        self.rotation_step = rotation_step
+        self.variants_per_turn = 360 // rotation_step
+
+        surfaces = {}
+        for name in sorted(os.listdir(images_dir)):
+            if name.endswith(".png"):
+                surfaces[name] = pygame.image.load(os.path.join(images_dir, name))
+        for name in rotatable:
+            for i in range(self.variants_per_turn):
+                surfaces[(name, i)] = pygame.transform.rotate(surfaces[name], i * rotation_step)
+
+        self.areas = self._pack(surfaces, max_width, padding)
+        # Por sprite rotacionável: áreas e tamanhos das variantes, pelo índice da variante
+        self.rotations = {name: [self.areas[(name, i)] for i in range(self.variants_per_turn)] for name in rotatable}
+        self.rotation_sizes = {name: np.array([area.size for area in areas], dtype=np.float64)
+                               for name, areas in self.rotations.items()}
+        height = max(area.bottom for area in self.areas.values())
+        sheet = pygame.Surface((max_width, height), pygame.SRCALPHA)
+        for key, surface in surfaces.items():
+            sheet.blit(surface, self.areas[key])
+        self.sheet = sheet
+        if convert:
+            self.convert()
+
+    def convert(self):
+        """Converte a folha para o formato do display (precisa do modo de vídeo definido)."""
+        self.sheet = self.sheet.convert_alpha()
+
+    @staticmethod
+    def _pack(surfaces, max_width, padding):
+        """Empacota em prateleiras: mais altos primeiro, da esquerda para a direita."""
+        areas = {}
+        x = y = row_height = 0
+        for key, surface in sorted(surfaces.items(), key=lambda item: -item[1].get_height()):
+            w, h = surface.get_size()
+            if x + w > max_width:
+                x, y = 0, y + row_height + padding
+                row_height = 0
+            areas[key] = pygame.Rect(x, y, w, h)
+            x += w + padding
+            row_height = max(row_height, h)
+        return areas
+
+    def area(self, name):
+        """Área de um sprite sem rotação na folha."""
+        return self.areas[name]
+
+    def rotated_area(self, name, angle):
+        """Área da variante pré-rotacionada mais perto de `angle` graus."""
+        variant = int(round(angle / self.rotation_step)) % self.variants_per_turn
+        return self.areas[(name, variant)]
+
+    def entry(self, name, center, angle=0):
+        """Entrada (folha, destino, área) de blits com o sprite centrado em `center`."""
+        area = self.rotated_area(name, angle) if angle else self.areas[name]
+        return self.sheet, (center[0] - area.width / 2, center[1] - area.height / 2), area
+
+    def rotated_entries(self, name, x, y, angles):
+        """Entradas de blits de várias cópias de um sprite rotacionável, centradas nos arrays (x, y)."""
+        variants = np.rint(angles / self.rotation_step).astype(np.intp) % self.variants_per_turn
+        sizes = self.rotation_sizes[name][variants]
+        left = x - sizes[:, 0] / 2
+        top = y - sizes[:, 1] / 2
+        areas = self.rotations[name]
+        sheet = self.sheet
+        return [(sheet, pos, areas[k]) for pos, k in zip(zip(left.tolist(), top.tolist()), variants.tolist())]
@@ -0,0 +1,346 @@
+import math
+import numpy as np
+from Hitbox import rotated_box, REFERENCE_FPS
+from Sprites import image_size
+
+HIT_MEMORY = 4 # Alvos recentes que cada projétil lembra, para um perfurante acertar cada um uma vez
+
+
+class BulletRing:
+    """
+    Todos os projéteis vivos em arrays NumPy, num buffer circular: as linhas de `head` a
+    `head + count` são os projéteis na ordem de disparo; kill() só marca e sweep() anda
+    a cabeça e a cauda por cima das marcadas, sem nunca compactar.
+    """
+    # Arrays por projétil e seus dtypes
+    FIELDS = (
+        ("x", np.float64),
+        ("y", np.float64),
+        ("prev_x", np.float64), # Posição antes do último update, para o teste varrido e a interpolação
+        ("prev_y", np.float64),
+        ("vx", np.float64), # Pixels por frame a 60 FPS
+        ("vy", np.float64),
+        ("angle", np.float64), # Rotação do sprite, em graus
+        # Caixa girada, como na Hitbox: esquerda = x - anchor_x, direita = esquerda + width
+        ("anchor_x", np.float64),
+        ("anchor_y", np.float64),
+        ("width", np.float64),
+        ("height", np.float64),
+        ("damage", np.float64),
+        ("pierce", np.int32), # Alvos que ainda pode atravessar; o próximo acerto com 0 o destrói
+        ("hit_count", np.int32),
+        ("hit_ids", np.int64), # Ids dos últimos HIT_MEMORY alvos atingidos (0 = vazio)
+        ("dead", np.bool_),
+    )
+    SHAPES = {"hit_ids": (HIT_MEMORY,)}
+
+    def __init__(self, image, speed, capacity=1024):
+        self.image = image
+        self.speed = speed
+        self.base_size = image_size(image)
+        self.head = 0 # Linha do projétil mais antigo
+        self.count = 0 # Linhas entre a cabeça e a cauda, incluindo as marcadas
+        self.live = 0
+
+        # Contadores como os do Pool: um tiro "reaproveita" quando cabe nos arrays já alocados
+        self.acquired = 0
+        self.reused = 0
+        self.peak_live = 0
+
+        self.capacity = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Re)aloca os arrays, desenrolando o buffer para as linhas 0..count-1."""
+        rows = self._span()
+        for name, dtype in self.FIELDS:
+            array = np.zeros((capacity,) + self.SHAPES.get(name, ()), dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:self.count] = old[rows]
+            setattr(self, name, array)
+        self.capacity = capacity
+        self.mask = capacity - 1 # A capacidade é potência de dois: dar a volta é um e bit a bit
+        self.head = 0
+
+    def __len__(self):
+        return self.live
+
+    def clear(self):
+        """Remove todos os projéteis (os arrays mantêm a capacidade)."""
+        self.head = 0
+        self.count = 0
+        self.live = 0
+
+    def _span(self):
+        """Linhas entre a cabeça e a cauda, na ordem de disparo."""
+        return (self.head + np.arange(self.count)) & (self.capacity - 1)
+
+    def _slices(self):
+        """As mesmas linhas como uma ou duas fatias contíguas (duas quando dão a volta)."""
+        end = self.head + self.count
+        if end <= self.capacity:
+            return (slice(self.head, end),)
+        return slice(self.head, self.capacity), slice(0, end - self.capacity)
+
+    def rows(self):
+        """Linhas dos projéteis vivos, na ordem de disparo."""
+        span = self._span()
+        return span[~self.dead[span]]
+
+    def fire(self, origin, target, damage, pierce=0, count=1, spread=0.0):
+        """Dispara `count` projéteis de origin para target, em leque de `spread` radianos entre eles."""
+        ox, oy = origin
+        aim = math.atan2(target[1] - oy, target[0] - ox)
+        width, height = self.base_size
+        for k in range(count):
+            radians = aim + (k - (count - 1) / 2) * spread
+            angle = math.degrees(-radians) + 90
+            i = self._push()
+            self.x[i] = self.prev_x[i] = ox
+            self.y[i] = self.prev_y[i] = oy
+            self.vx[i] = math.cos(radians) * self.speed
+            self.vy[i] = math.sin(radians) * self.speed
+            self.angle[i] = angle
+            self.width[i], self.height[i], self.anchor_x[i], self.anchor_y[i] = rotated_box(width, height, angle)
+            self.damage[i] = damage
+            self.pierce[i] = pierce
+            self.hit_count[i] = 0
+            self.hit_ids[i] = 0
+            self.dead[i] = False
+
+    def _push(self):
+        """Ocupa a linha depois da cauda, crescendo o buffer quando está cheio."""
+        self.acquired += 1
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        else:
+            self.reused += 1
+        i = (self.head + self.count) & self.mask
+        self.count += 1
+        self.live += 1
+        if self.live > self.peak_live:
+            self.peak_live = self.live
+        return i
+
+    def update(self, dt):
+        """Move todos os projéteis dt segundos na sua velocidade."""
+        scale = dt * REFERENCE_FPS
+        for rows in self._slices():
+            x, y = self.x[rows], self.y[rows]
+            self.prev_x[rows] = x
+            self.prev_y[rows] = y
+            x += self.vx[rows] * scale
+            y += self.vy[rows] * scale
+
+    def centers(self, rows, alpha=None):
+        """Arrays (x, y) dos projéteis nas linhas dadas; com alpha, interpolados desde a posição anterior."""
+        x, y = self.x[rows], self.y[rows]
+        if alpha is not None:
+            prev_x, prev_y = self.prev_x[rows], self.prev_y[rows]
+            x = prev_x + (x - prev_x) * alpha
+            y = prev_y + (y - prev_y) * alpha
+        return x, y
+
+    def bounds(self, rows):
+        """Arrays (esquerda, topo, direita, base) das caixas nas linhas dadas."""
+        left = self.x[rows] - self.anchor_x[rows]
+        top = self.y[rows] - self.anchor_y[rows]
+        return left, top, left + self.width[rows], top + self.height[rows]
+
+    def cull(self, left, top, right, bottom):
+        """Destrói os projéteis com a caixa inteira fora da área dada."""
+        rows = self.rows()
+        b_left, b_top, b_right, b_bottom = self.bounds(rows)
+        outside = rows[~((b_right > left) & (b_bottom > top) & (b_left < right) & (b_top < bottom))]
+        self.dead[outside] = True
+        self.live -= len(outside)
+
+    def contacts(self, left, top, right, bottom, move_x, move_y, broad_phase=True):
+        """
+        Pares (linha, alvo) cujas caixas se tocam em algum momento do último update(), na
+        ordem de resolução: projéteis na ordem de disparo e alvos pelo tempo do primeiro
+        contato. Os alvos são caixas no fim do tick que andaram (move_x, move_y) nele;
+        broad_phase só muda como os candidatos são achados, não o resultado.
+        """
+        rows = self.rows()
+        if not len(rows) or not len(left):
+            return np.zeros(0, np.intp), np.zeros(0, np.intp)
+        b_left, b_top, b_right, b_bottom = self.bounds(rows)
+        b_move_x = self.x[rows] - self.prev_x[rows]
+        b_move_y = self.y[rows] - self.prev_y[rows]
+        bullets = (b_left, b_top, b_right, b_bottom, b_move_x, b_move_y)
+        targets = (left, top, right, bottom, move_x, move_y)
+
+        if broad_phase:
+            pairs = [_grid_pairs(bullets, targets)]
+        else:
+            chunk = max(1, (1 << 20) // len(left)) # Projéteis por lote, para cada lote ter cerca de um milhão de pares
+            n = len(left)
+            pairs = [(np.repeat(np.arange(start, min(start + chunk, len(rows))), n),
+                      np.tile(np.arange(n), min(chunk, len(rows) - start)))
+                     for start in range(0, len(rows), chunk)]
+
+        found_b, found_t, found_time = [], [], []
+        for b, t in pairs:
+            hit, time = _swept_overlap(bullets, targets, b, t)
+            found_b.append(b[hit])
+            found_t.append(t[hit])
+            found_time.append(time[hit])
+        b, t, time = np.concatenate(found_b), np.concatenate(found_t), np.concatenate(found_time)
+        order = np.lexsort((t, time, b))
+        return rows[b[order]], t[order]
+
+    def strike(self, i, target_id):
+        """
+        Anota um acerto do projétil i num alvo (target_id estável e não nulo, como um handle);
+        False se o projétil já morreu ou acertou esse alvo há pouco.
+        """
+        if self.dead[i]:
+            return False
+        memory = self.hit_ids[i]
+        if target_id in memory:
+            return False
+        memory[self.hit_count[i] % HIT_MEMORY] = target_id
+        self.hit_count[i] += 1
+        if self.pierce[i] > 0:
+            self.pierce[i] -= 1
+        else:
+            self.kill(i)
+        return True
+
+    def kill(self, i):
+        """Marca o projétil i para remoção; False se já estava marcado."""
+        if self.dead[i]:
+            return False
+        self.dead[i] = True
+        self.live -= 1
+        return True
+
+    def sweep(self):
+        """Anda a cabeça e a cauda por cima das linhas marcadas, liberando-as."""
+        if self.live == 0:
+            self.head = self.count = 0
+            return
+        alive = np.flatnonzero(~self.dead[self._span()])
+        first, last = int(alive[0]), int(alive[-1])
+        self.head = (self.head + first) & self.mask
+        self.count = last - first + 1
+
+    def columns(self):
+        """Os arrays cortados nos projéteis vivos em ordem de disparo (cópias), por nome de campo."""
+        rows = self.rows()
+        return {name: getattr(self, name)[rows] for name, _ in self.FIELDS if name != "dead"}
+
+    def load_columns(self, columns):
+        """Troca todos os projéteis pelas linhas de `columns` (como as de columns()); as caixas saem dos ângulos."""
+        n = len(next(iter(columns.values()))) if columns else 0
+        self.clear()
+        if n > self.capacity:
+            self._allocate(1 << (n - 1).bit_length())
+        for name, _ in self.FIELDS:
+            array = getattr(self, name)
+            array[:n] = columns[name] if name in columns else 0
+        width, height = self.base_size
+        for i, angle in enumerate(self.angle[:n].tolist()):
+            self.width[i], self.height[i], self.anchor_x[i], self.anchor_y[i] = rotated_box(width, height, angle)
+        self.count = self.live = n
+        self.peak_live = max(self.peak_live, n)
+
+    @property
+    def hit_rate(self):
+        """Fração dos tiros que couberam nas linhas já alocadas."""
+        return self.reused / self.acquired if self.acquired else 0.0
+
+    def stats(self):
+        """Cópia dos contadores, com as chaves de Pool.stats()."""
+        return {
+            "acquired": self.acquired,
+            "reused": self.reused,
+            "hit_rate": self.hit_rate,
+            "live": self.live,
+            "peak_live": self.peak_live,
+        }
+
+
+def _sweep_box(left, top, right, bottom, move_x, move_y):
+    """Caixa que cobre uma caixa durante o tick inteiro, do início (fim menos o movimento) ao fim."""
+    return (np.minimum(left, left - move_x), np.minimum(top, top - move_y),
+            np.maximum(right, right - move_x), np.maximum(bottom, bottom - move_y))
+
+
+def _grid_pairs(bullets, targets):
+    """
+    Pares candidatos (projétil, alvo) cujas caixas varridas podem se tocar. Cada alvo fica na
+    célula do canto superior esquerdo, com células do tamanho do maior alvo mais o maior
+    projétil, então cada projétil só olha 2x2 células.
+    """
+    b_left, b_top, b_right, b_bottom = _sweep_box(*bullets)
+    t_left, t_top, t_right, t_bottom = _sweep_box(*targets)
+    t_width = float((t_right - t_left).max())
+    t_height = float((t_bottom - t_top).max())
+    cell = max(t_width, t_height) + max(float((b_right - b_left).max()), float((b_bottom - b_top).max())) + 1.0
+
+    t_col = np.floor(t_left / cell).astype(np.intp)
+    t_row = np.floor(t_top / cell).astype(np.intp)
+    min_col, min_row = int(t_col.min()), int(t_row.min())
+    cols = int(t_col.max()) - min_col + 1
+    rows = int(t_row.max()) - min_row + 1
+    t_key = (t_row - min_row) * cols + (t_col - min_col)
+    by_key = np.argsort(t_key, kind="stable")
+    per_cell = np.bincount(t_key, minlength=cols * rows)
+    first_in_cell = np.cumsum(per_cell) - per_cell
+
+    # Um alvo com o canto em (esquerda - t_width, direita) pode tocar o projétil
+    first_col = np.floor((b_left - t_width) / cell).astype(np.intp) - min_col
+    last_col = np.floor(b_right / cell).astype(np.intp) - min_col
+    first_row = np.floor((b_top - t_height) / cell).astype(np.intp) - min_row
+    last_row = np.floor(b_bottom / cell).astype(np.intp) - min_row
+    query_b, query_key = [], []
+    bullet = np.arange(len(b_left))
+    for d_col in (0, 1):
+        for d_row in (0, 1):
+            col = first_col + d_col
+            row = first_row + d_row
+            valid = (col <= last_col) & (row <= last_row) & (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+            query_b.append(bullet[valid])
+            query_key.append(row[valid] * cols + col[valid])
+    query_b = np.concatenate(query_b)
+    query_key = np.concatenate(query_key)
+
+    start = first_in_cell[query_key]
+    counts = per_cell[query_key]
+    total = int(counts.sum())
+    b = np.repeat(query_b, counts)
+    within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    t = by_key[np.repeat(start, counts) + within]
+    return b, t
+
+
+def _swept_overlap(bullets, targets, b, t):
+    """
+    Teste exato dos pares (projétil, alvo): (máscara de acerto, tempo do primeiro contato
+    como fração do tick), com sobreposição estrita como Rect.colliderect.
+    """
+    b_left, b_top, b_right, b_bottom, b_move_x, b_move_y = bullets
+    t_left, t_top, t_right, t_bottom, t_move_x, t_move_y = targets
+    low_x, high_x = _overlap_interval(b_right[b] - t_left[t], b_left[b] - t_right[t], b_move_x[b] - t_move_x[t])
+    low_y, high_y = _overlap_interval(b_bottom[b] - t_top[t], b_top[b] - t_bottom[t], b_move_y[b] - t_move_y[t])
+    low = np.maximum(low_x, low_y)
+    high = np.minimum(high_x, high_y)
+    hit = (low < high) & (low < 1.0) & (high > 0.0)
+    return hit, 1.0 - np.minimum(high, 1.0)
+
+
+def _overlap_interval(upper, lower, move):
+    """Intervalo aberto de s com lower < s * move < upper (todo s, ou nenhum, com move 0)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = lower / move
+        b = upper / move
+    low = np.where(move > 0, a, b)
+    high = np.where(move > 0, b, a)
+    still = move == 0
+    inside = (lower < 0) & (upper > 0)
+    low[still] = np.where(inside[still], -np.inf, np.inf)
+    high[still] = np.where(inside[still], np.inf, -np.inf)
+    return low, high
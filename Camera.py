@@ -0,0 +1,32 @@
+class Camera:
+    """
+    A janela `width` x `height` do mundo que aparece na tela, centrada no ponto
+    seguido sem passar das bordas do mundo (só depende dele, então é determinística).
+    """
+    def __init__(self, width, height, world_width, world_height):
+        self.width = width
+        self.height = height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.left = 0.0
+        self.top = 0.0
+
+    @property
+    def fixed(self):
+        """True quando o mundo inteiro cabe na janela e a câmera nunca se move."""
+        return self.world_width <= self.width and self.world_height <= self.height
+
+    @property
+    def rect(self):
+        """(esquerda, topo, direita, base) da janela, em coordenadas do mundo."""
+        return self.left, self.top, self.left + self.width, self.top + self.height
+
+    def view_at(self, x, y):
+        """Canto superior esquerdo da janela seguindo (x, y), sem mover a câmera."""
+        left = min(max(x - self.width / 2, 0), max(self.world_width - self.width, 0))
+        top = min(max(y - self.height / 2, 0), max(self.world_height - self.height, 0))
+        return left, top
+
+    def follow(self, x, y):
+        """Move a janela para seguir (x, y)."""
+        self.left, self.top = self.view_at(x, y)
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class ChunkStore:
+    """
+    Linhas de um armazenamento em colunas (como o EnemySwarm) paradas longe da câmera,
+    guardadas por chunk quadrado de `chunk_size`; aqui dentro elas não custam nada por tick.
+    """
+    def __init__(self, chunk_size=512):
+        self.chunk_size = chunk_size
+        self.chunks = {} # (coluna, linha) -> {campo: array}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.chunks.clear()
+        self.count = 0
+
+    def put(self, columns):
+        """Guarda as linhas de `columns` (campo -> array, com "x" e "y") no chunk de cada uma."""
+        n = len(columns["x"])
+        if not n:
+            return
+        col = np.floor_divide(columns["x"], self.chunk_size).astype(np.int64)
+        row = np.floor_divide(columns["y"], self.chunk_size).astype(np.int64)
+        order = np.lexsort((row, col)) # Estável: as linhas mantêm a ordem dentro de cada chunk
+        col, row = col[order], row[order]
+        starts = np.flatnonzero(np.r_[True, (col[1:] != col[:-1]) | (row[1:] != row[:-1])])
+        ends = np.r_[starts[1:], n]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            rows = order[start:end]
+            key = (int(col[start]), int(row[start]))
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                self.chunks[key] = {name: array[rows] for name, array in columns.items()}
+            else:
+                for name, array in columns.items():
+                    chunk[name] = np.concatenate((chunk[name], array[rows]))
+        self.count += n
+
+    def take(self, left, top, right, bottom, limit=None):
+        """
+        Tira e retorna, em colunas, as linhas dos chunks que tocam o retângulo (None se não houver).
+        Com `limit`, no máximo tantas linhas, dos chunks mais perto do centro primeiro.
+        """
+        if not self.chunks or (limit is not None and limit <= 0):
+            return None
+        size = self.chunk_size
+        keys = [(col, row) for col in range(int(left // size), int(right // size) + 1)
+                for row in range(int(top // size), int(bottom // size) + 1) if (col, row) in self.chunks]
+        if limit is not None:
+            center_x, center_y = (left + right) / 2, (top + bottom) / 2
+            keys.sort(key=lambda key: ((key[0] + 0.5) * size - center_x) ** 2 + ((key[1] + 0.5) * size - center_y) ** 2)
+        taken = []
+        for key in keys:
+            chunk = self.chunks[key]
+            if limit is not None and len(chunk["x"]) > limit:
+                # Só parte do chunk cabe: saem as linhas mais antigas, o resto espera
+                taken.append({name: array[:limit] for name, array in chunk.items()})
+                self.chunks[key] = {name: array[limit:] for name, array in chunk.items()}
+                break
+            taken.append(self.chunks.pop(key))
+            if limit is not None:
+                limit -= len(chunk["x"])
+                if limit == 0:
+                    break
+        if not taken:
+            return None
+        columns = {name: np.concatenate([chunk[name] for chunk in taken]) for name in taken[0]}
+        self.count -= len(columns["x"])
+        return columns
+
+    def columns(self):
+        """Todas as linhas guardadas, chunk a chunk em ordem (coluna, linha); put() delas refaz os mesmos chunks."""
+        if not self.chunks:
+            return {}
+        chunks = [self.chunks[key] for key in sorted(self.chunks)]
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
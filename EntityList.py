@@ -0,0 +1,76 @@
+from Pool import Pool
+
+
+class EntityList:
+    """
+    Entidades vivas de um tipo, em ordem de criação, vindas de um Pool. Cada uma
+    ganha um handle que nunca se repete; kill() só marca e sweep() remove as marcadas.
+    """
+    def __init__(self, cls):
+        self.pool = Pool(cls)
+        self.items = [] # Inclui as mortas neste tick até o próximo sweep()
+        self.dead = 0 # Marcadas e ainda não removidas
+        self.next_handle = 1 # Handle do próximo add(); o salvamento guarda para continuar a numeração
+
+    def __len__(self):
+        return len(self.items) - self.dead
+
+    def __iter__(self):
+        """Em ordem de criação, incluindo as mortas desde o último sweep() (veja .dead)."""
+        return iter(self.items)
+
+    def add(self, *args):
+        """Pega uma entidade do pool (inicializada com args), adiciona no fim e retorna."""
+        entity = self.pool.acquire(*args)
+        entity.handle = self.next_handle
+        self.next_handle += 1
+        entity.dead = False
+        self.items.append(entity)
+        return entity
+
+    def kill(self, entity):
+        """Marca uma entidade para remoção; False se já estava marcada."""
+        if entity.dead:
+            return False
+        entity.dead = True
+        self.dead += 1
+        return True
+
+    def get(self, handle):
+        """A entidade viva com este handle, ou None se ela já saiu."""
+        # Os handles crescem na ordem de criação e sweep() a mantém: busca binária
+        items = self.items
+        low, high = 0, len(items)
+        while low < high:
+            middle = (low + high) // 2
+            if items[middle].handle < handle:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(items) and items[low].handle == handle and not items[low].dead:
+            return items[low]
+        return None
+
+    def sweep(self):
+        """Remove as marcadas numa passada só e devolve ao pool."""
+        if not self.dead:
+            return
+        alive = []
+        for entity in self.items:
+            if entity.dead:
+                self.pool.release(entity)
+            else:
+                alive.append(entity)
+        self.items = alive
+        self.dead = 0
+
+    def clear(self):
+        """Remove todas as entidades e recomeça os handles."""
+        self.pool.release_all(self.items)
+        self.items = []
+        self.dead = 0
+        self.next_handle = 1
+
+    def stats(self):
+        """Contadores do pool."""
+        return self.pool.stats()
@@ -0,0 +1,147 @@
+import numpy as np
+
+
+class FlowField:
+    """
+    Campo de perseguição de uma horda numa grade grossa: cada célula guarda a direção até o
+    alvo mais um empurrão para fora das células lotadas. Com menos de `min_agents` agentes,
+    fora da grade ou perto do alvo, a direção é calculada direto.
+    """
+    def __init__(self, width, height, cell_size=32, margin=64, separation=0.3, exact_radius=48, min_agents=256):
+        self.cell_size = cell_size
+        self.margin = margin
+        self.origin_x = -margin
+        self.origin_y = -margin
+        self.cols = int(np.ceil((width + 2 * margin) / cell_size))
+        self.rows = int(np.ceil((height + 2 * margin) / cell_size))
+        self.separation = separation # Empurrão por agente de diferença entre células vizinhas
+        self.exact_radius = exact_radius
+        self.min_agents = min_agents
+
+        self.center_x = self.origin_x + (np.arange(self.cols) + 0.5) * cell_size
+        self.center_y = self.origin_y + (np.arange(self.rows) + 0.5) * cell_size
+        # Direções unitárias até a célula do alvo, (linhas, colunas), válidas para a _heading_key
+        self.heading_x = np.zeros((self.rows, self.cols))
+        self.heading_y = np.zeros((self.rows, self.cols))
+        self._heading_key = None
+        self.rebuilds = 0 # Vezes que as direções foram refeitas
+        # Tabelas por célula, achatadas (linha * cols + coluna)
+        self.direction_x = np.zeros(self.cells)
+        self.direction_y = np.zeros(self.cells)
+        self.exact = np.zeros(self.cells, dtype=np.bool_)
+        self.push_x = np.zeros(self.cells) # Empurrão de separação do último build
+        self.push_y = np.zeros(self.cells)
+
+    def move_to(self, left, top):
+        """Põe o canto superior esquerdo da área coberta (sem a margem) em (left, top)."""
+        origin_x, origin_y = left - self.margin, top - self.margin
+        if origin_x != self.origin_x:
+            self.origin_x = origin_x
+            self.center_x = origin_x + (np.arange(self.cols) + 0.5) * self.cell_size
+        if origin_y != self.origin_y:
+            self.origin_y = origin_y
+            self.center_y = origin_y + (np.arange(self.rows) + 0.5) * self.cell_size
+
+    @property
+    def cells(self):
+        return self.rows * self.cols
+
+    def locate(self, x, y):
+        """Índice achatado da célula de cada ponto (limitado à grade) e a máscara dos pontos fora dela."""
+        inverse = 1.0 / self.cell_size
+        col = (x - self.origin_x) * inverse
+        row = (y - self.origin_y) * inverse
+        outside = (col < 0) | (col >= self.cols) | (row < 0) | (row >= self.rows)
+        np.clip(col, 0, self.cols - 1, out=col)
+        np.clip(row, 0, self.rows - 1, out=row)
+        return row.astype(np.intp) * self.cols + col.astype(np.intp), outside # Já limitados, truncar é o mesmo que arredondar para baixo
+
+    def update_headings(self, target):
+        """Refaz as direções se a grade andou ou o alvo mudou de célula desde a última vez."""
+        size = self.cell_size
+        col = int((target[0] - self.origin_x) // size)
+        row = int((target[1] - self.origin_y) // size)
+        key = (self.origin_x, self.origin_y, col, row)
+        if key == self._heading_key:
+            return
+        self._heading_key = key
+        self.rebuilds += 1
+        # Mira o centro da célula do alvo, então a tabela vale enquanto ele estiver nela
+        dx = np.broadcast_to(self.origin_x + (col + 0.5) * size - self.center_x, (self.rows, self.cols)).copy()
+        dy = np.broadcast_to((self.origin_y + (row + 0.5) * size - self.center_y)[:, np.newaxis],
+                             (self.rows, self.cols)).copy()
+        dist = np.hypot(dx, dy)
+        # Algum canto da célula dentro do raio de algum ponto da célula do alvo
+        self.exact[:] = (dist < self.exact_radius + size * 1.4143).ravel()
+        dist[dist == 0] = 1.0
+        dx /= dist
+        dy /= dist
+        self.heading_x, self.heading_y = dx, dy
+
+    def build(self, target, cells):
+        """Direções por célula neste tick, para um alvo e as células de todos os agentes."""
+        self.update_headings(target)
+        if not self.separation:
+            self.direction_x[:] = self.heading_x.ravel()
+            self.direction_y[:] = self.heading_y.ravel()
+            return
+        crowd = np.bincount(cells, minlength=self.cells).reshape(self.rows, self.cols).astype(np.float64)
+        # Diferenças centrais por dentro e laterais na borda (como np.gradient, sem o custo dele)
+        grad_x = np.empty_like(crowd)
+        grad_x[:, 1:-1] = (crowd[:, 2:] - crowd[:, :-2]) * 0.5
+        grad_x[:, 0] = crowd[:, 1] - crowd[:, 0]
+        grad_x[:, -1] = crowd[:, -1] - crowd[:, -2]
+        grad_y = np.empty_like(crowd)
+        grad_y[1:-1] = (crowd[2:] - crowd[:-2]) * 0.5
+        grad_y[0] = crowd[1] - crowd[0]
+        grad_y[-1] = crowd[-1] - crowd[-2]
+
+        self.push_x = -grad_x.ravel() * self.separation
+        self.push_y = -grad_y.ravel() * self.separation
+        dx = self.heading_x + self.push_x.reshape(self.rows, self.cols)
+        dy = self.heading_y + self.push_y.reshape(self.rows, self.cols)
+        length = np.hypot(dx, dy)
+        length[length == 0] = 1.0
+        dx /= length
+        dy /= length
+        self.direction_x[:] = dx.ravel()
+        self.direction_y[:] = dy.ravel()
+
+    def steer(self, target, x, y):
+        """Atualiza o campo em volta de `target` e retorna a direção unitária (dx, dy) de cada agente em (x, y)."""
+        if len(x) < self.min_agents:
+            return self.pursue(target, x, y)
+        cells, off_grid = self.locate(x, y)
+        on_grid = ~off_grid
+        self.build(target, cells[on_grid] if off_grid.any() else cells)
+        dir_x = self.direction_x[cells]
+        dir_y = self.direction_y[cells]
+
+        near = self.exact[cells] & on_grid
+        if near.any():
+            # Direção exata, ainda empurrada para fora da aglomeração em volta do alvo
+            near_cells = cells[near]
+            near_x, near_y = self.pursue(target, x[near], y[near])
+            if self.separation:
+                near_x += self.push_x[near_cells]
+                near_y += self.push_y[near_cells]
+                length = np.hypot(near_x, near_y)
+                length[length == 0] = 1.0
+                near_x /= length
+                near_y /= length
+            dir_x[near], dir_y[near] = near_x, near_y
+        if off_grid.any():
+            dir_x[off_grid], dir_y[off_grid] = self.pursue(target, x[off_grid], y[off_grid])
+        return dir_x, dir_y
+
+    @staticmethod
+    def pursue(target, x, y):
+        """Direção unitária de cada (x, y) direto até o alvo (em cima dele, +x)."""
+        tx, ty = target
+        dx = tx - x
+        dy = ty - y
+        dist = np.hypot(dx, dy)
+        on_target = dist == 0
+        dist[on_target] = 1.0
+        dx[on_target] = 1.0
+        return dx / dist, dy / dist
@@ -0,0 +1,46 @@
+import math
+
+
+class FrameBudget:
+    """
+    Limite de entidades que mantém o percentil do tempo de frame dentro de `budget_ms`:
+    cai multiplicando por `decrease` e sobe somando `increase`, entre floor e ceiling.
+    """
+    def __init__(self, budget_ms, ceiling, floor=0, window=30, percentile=90, decrease=0.8, increase=10, headroom=0.75):
+        self.budget_ms = budget_ms
+        self.ceiling = ceiling
+        self.floor = floor
+        self.window = window
+        self.percentile = percentile
+        self.decrease = decrease
+        self.increase = increase
+        self.headroom = headroom
+        self.limit = ceiling
+        self._samples = []
+
+    def reset(self, limit=None):
+        """Esquece os frames medidos e recomeça de `limit` (padrão: o teto)."""
+        self.limit = self.ceiling if limit is None else limit
+        self._samples.clear()
+
+    def record(self, frame_ms, live=None):
+        """Anota o tempo de um frame (e as entidades vivas); retorna o novo limite quando ele muda, senão None."""
+        samples = self._samples
+        samples.append(frame_ms)
+        if len(samples) < self.window:
+            return None
+        samples.sort()
+        slow = samples[min(math.ceil(len(samples) * self.percentile / 100), len(samples)) - 1]
+        samples.clear()
+
+        if slow > self.budget_ms:
+            current = self.limit if live is None else min(self.limit, live)
+            limit = max(int(current * self.decrease), self.floor)
+        elif slow < self.budget_ms * self.headroom:
+            limit = min(self.limit + self.increase, self.ceiling)
+        else:
+            return None
+        if limit == self.limit:
+            return None
+        self.limit = limit
+        return limit
@@ -0,0 +1,215 @@
+import itertools
+import os
+import struct
+from Mundo import Mundo, Comandos, PASSO_FIXO
+
+# --- FORMATO DO ARQUIVO ---
+# Cabeçalho fixo seguido dos registros dos ticks, tudo little-endian:
+#   "CDRP", versão, semente, dt, largura, altura, largura e altura da visão,
+#   broad-phase, campo de fluxo, ticks, tamanho dos registros e SHA-256 do
+#   estado no último tick (zeros se ausente). A versão sobe também quando as
+#   regras da simulação mudam (como a colisão contínua dos projéteis e as
+#   melhorias novas na versão 3, o sorteio das melhorias por peso na 4, as ondas
+#   em lotes na 5, a câmera e os chunks do mundo grande na 6, as várias lâminas
+#   orbitais na 7, o dano orbital de volta a 15 na 8 ou, na 9, o campo de fluxo
+#   do mundo grande cobrindo a horda ativa e o limite de inimigos ao acordar
+#   chunks, ou, na 10, o campo de fluxo só acima de 256 inimigos e separando também
+#   perto do jogador): uma gravação antiga não se repetiria, então é recusada em vez de divergir.
+# Cada registro começa com um byte de flags: as 4 teclas de movimento nos bits
+# baixos, mais REPETE (segue 1 byte: quantos ticks seguintes repetem as mesmas
+# teclas), ESCOLHA (segue 1 byte: índice da melhoria), DISPAROS (seguem 2 bytes
+# de quantidade e um par de doubles por alvo, para reproduzir qualquer posição) e
+# LIMITE (seguem 4 bytes: o novo limite de inimigos vivos do modo adaptativo).
+# Um jogador segurando a mesma tecla custa 2 bytes a cada 256 ticks.
+MAGICO = b"CDRP"
+VERSAO = 10
+CABECALHO = struct.Struct("<4sHqdHHHH??QQ32s")
+
+REPETE = 0x80
+ESCOLHA = 0x10
+DISPAROS = 0x20
+LIMITE = 0x40
+MAX_REPETICOES = 255
+
+_ESCOLHA = struct.Struct("<B")
+_QUANTIDADE = struct.Struct("<H")
+_ALVO = struct.Struct("<dd")
+_LIMITE = struct.Struct("<I")
+
+
+class Gravacao:
+    """
+    Semente e entrada tick a tick de uma partida: com as duas, um Mundo novo
+    repete a partida bit a bit. Ligada em Mundo.gravacao, anota cada passo().
+    """
+    def __init__(self, semente, dt=PASSO_FIXO, largura=None, altura=None, usar_broad_phase=True,
+                 usar_campo_de_fluxo=True, visao=None):
+        self.semente = semente
+        self.dt = dt
+        self.largura = largura
+        self.altura = altura
+        self.visao = visao or (largura, altura) # (largura, altura) da câmera
+        self.usar_broad_phase = usar_broad_phase
+        self.usar_campo_de_fluxo = usar_campo_de_fluxo
+        self.dados = bytearray() # Registros já fechados
+        self.ticks = 0
+        self.resumo = None # SHA-256 do estado no último tick, quando a gravação veio de um arquivo
+
+        # Sequência de ticks só com teclas ainda aberta (vira um registro com REPETE ao fechar)
+        self._teclas = None
+        self._repeticoes = 0
+
+    @classmethod
+    def do_mundo(cls, mundo, dt=PASSO_FIXO):
+        """Gravação vazia para a partida que o Mundo acabou de (re)iniciar."""
+        return cls(mundo.semente, dt, mundo.largura, mundo.altura, mundo.usar_broad_phase,
+                   mundo.usar_campo_de_fluxo, (mundo.camera.width, mundo.camera.height))
+
+    def __len__(self):
+        return self.ticks
+
+    # --- GRAVAÇÃO ---
+
+    def gravar(self, comandos):
+        """Anota os comandos de um tick."""
+        self.ticks += 1
+        teclas = sum(bool(tecla) << bit for bit, tecla in enumerate(comandos.teclas))
+        if comandos.escolha_melhoria is None and not comandos.disparos and comandos.limite_inimigos is None:
+            if teclas == self._teclas and self._repeticoes < MAX_REPETICOES:
+                self._repeticoes += 1
+                return
+            self._fechar_sequencia()
+            self._teclas = teclas
+            return
+
+        self._fechar_sequencia()
+        dados = self.dados
+        flags = teclas
+        if comandos.escolha_melhoria is not None:
+            flags |= ESCOLHA
+        if comandos.disparos:
+            flags |= DISPAROS
+        if comandos.limite_inimigos is not None:
+            flags |= LIMITE
+        dados.append(flags)
+        if comandos.escolha_melhoria is not None:
+            dados += _ESCOLHA.pack(comandos.escolha_melhoria)
+        if comandos.disparos:
+            dados += _QUANTIDADE.pack(len(comandos.disparos))
+            for alvo in comandos.disparos:
+                dados += _ALVO.pack(*alvo)
+        if comandos.limite_inimigos is not None:
+            dados += _LIMITE.pack(comandos.limite_inimigos)
+
+    def _fechar_sequencia(self):
+        if self._teclas is None:
+            return
+        if self._repeticoes:
+            self.dados += bytes((self._teclas | REPETE, self._repeticoes))
+        else:
+            self.dados.append(self._teclas)
+        self._teclas = None
+        self._repeticoes = 0
+
+    # --- REPRODUÇÃO ---
+
+    def __iter__(self):
+        """Os Comandos de cada tick, na ordem em que foram gravados."""
+        self._fechar_sequencia()
+        dados = bytes(self.dados)
+        i = 0
+        while i < len(dados):
+            flags = dados[i]
+            i += 1
+            teclas = [bool(flags & (1 << bit)) for bit in range(4)]
+            if flags & REPETE:
+                comandos = Comandos(*teclas)
+                for _ in range(dados[i] + 1):
+                    yield comandos
+                i += 1
+                continue
+
+            escolha = None
+            if flags & ESCOLHA:
+                escolha, = _ESCOLHA.unpack_from(dados, i)
+                i += _ESCOLHA.size
+            disparos = ()
+            if flags & DISPAROS:
+                quantidade, = _QUANTIDADE.unpack_from(dados, i)
+                i += _QUANTIDADE.size
+                disparos = tuple(_ALVO.unpack_from(dados, i + k * _ALVO.size) for k in range(quantidade))
+                i += quantidade * _ALVO.size
+            limite = None
+            if flags & LIMITE:
+                limite, = _LIMITE.unpack_from(dados, i)
+                i += _LIMITE.size
+            yield Comandos(*teclas, disparos=disparos, escolha_melhoria=escolha, limite_inimigos=limite)
+
+    def mundo(self, perfil=None):
+        """Um Mundo novo, no tick 0 desta partida."""
+        return Mundo(self.largura, self.altura, self.semente, self.usar_broad_phase, perfil,
+                     self.usar_campo_de_fluxo, self.visao)
+
+    def reproduzir(self, mundo=None, ate_tick=None):
+        """
+        Reexecuta a partida até `ate_tick` (ou até o fim da gravação) o mais
+        rápido possível, num Mundo novo ou em `mundo`, reiniciado com a semente
+        gravada. Retorna o Mundo e um iterador com os Comandos dos ticks que faltam.
+        """
+        if mundo is None:
+            mundo = self.mundo()
+        elif (mundo.largura, mundo.altura) != (self.largura, self.altura):
+            raise ValueError(f"a gravação é de um mundo {self.largura}x{self.altura}, não {mundo.largura}x{mundo.altura}")
+        elif (mundo.camera.width, mundo.camera.height) != tuple(self.visao):
+            raise ValueError(f"a gravação é de uma visão {self.visao[0]}x{self.visao[1]}, "
+                             f"não {mundo.camera.width}x{mundo.camera.height}")
+        else:
+            mundo.reiniciar(self.semente)
+            mundo.usar_broad_phase = self.usar_broad_phase
+            mundo.usar_campo_de_fluxo = self.usar_campo_de_fluxo
+
+        restantes = iter(self)
+        for comandos in itertools.islice(restantes, self.ticks if ate_tick is None else ate_tick):
+            mundo.passo(self.dt, comandos)
+        return mundo, restantes
+
+    # --- ARQUIVO ---
+
+    def salvar(self, caminho, mundo=None):
+        """
+        Escreve a gravação e retorna o caminho absoluto. Com o Mundo gravado,
+        guarda também o resumo do estado dele, que reproduzir.py confere no fim.
+        """
+        self._fechar_sequencia()
+        resumo = mundo.resumo_estado() if mundo is not None else bytes(32)
+        with open(caminho, "wb") as f:
+            f.write(CABECALHO.pack(MAGICO, VERSAO, self.semente, self.dt, self.largura, self.altura, *self.visao,
+                                   self.usar_broad_phase, self.usar_campo_de_fluxo, self.ticks, len(self.dados), resumo))
+            f.write(self.dados)
+        return os.path.abspath(caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lê uma gravação salva por salvar(). Levanta ValueError se o arquivo não for uma."""
+        with open(caminho, "rb") as f:
+            cabecalho = f.read(CABECALHO.size)
+            if len(cabecalho) < len(MAGICO) + 2 or not cabecalho.startswith(MAGICO):
+                raise ValueError(f"{caminho} não é uma gravação do Cyber-Duck")
+            versao, = struct.unpack_from("<H", cabecalho, len(MAGICO))
+            if versao != VERSAO:
+                raise ValueError(f"{caminho} é uma gravação da versão {versao}, de regras da simulação "
+                                 f"diferentes; esta é a versão {VERSAO}")
+            if len(cabecalho) < CABECALHO.size:
+                raise ValueError(f"{caminho} está truncado (cabeçalho incompleto)")
+            magico, versao, semente, dt, largura, altura, visao_largura, visao_altura, usar_broad_phase, \
+                usar_campo_de_fluxo, ticks, tamanho, resumo = CABECALHO.unpack(cabecalho)
+            dados = f.read(tamanho)
+        if len(dados) < tamanho:
+            raise ValueError(f"{caminho} está truncado ({len(dados)} de {tamanho} bytes de registros)")
+
+        gravacao = cls(semente, dt, largura, altura, usar_broad_phase, usar_campo_de_fluxo,
+                       (visao_largura, visao_altura))
+        gravacao.dados = bytearray(dados)
+        gravacao.ticks = ticks
+        gravacao.resumo = resumo if any(resumo) else None
+        return gravacao
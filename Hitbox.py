@@ -0,0 +1,128 @@
+import math
+from Sprites import image_size
+
+# Velocidades do jogo são pixels por frame do loop original de 60 FPS; o movimento
+# multiplica por dt * REFERENCE_FPS para valerem o mesmo em qualquer taxa de ticks.
+REFERENCE_FPS = 60
+
+def rotated_size(width, height, angle):
+    """Tamanho inteiro de uma superfície width x height girada `angle` graus, como pygame.transform.rotate."""
+    if angle % 90 == 0:
+        # Aqui o pygame gira sem perdas, em passos de 90 graus
+        return (height, width) if int(angle) // 90 % 2 else (width, height)
+    radians = angle * 0.01745329251994329
+    sin_a = math.sin(radians)
+    cos_a = math.cos(radians)
+    cx, cy = cos_a * width, cos_a * height
+    sx, sy = sin_a * width, sin_a * height
+    new_width = int(max(abs(cx + sy), abs(cx - sy), abs(-cx + sy), abs(-cx - sy)))
+    new_height = int(max(abs(sx + cy), abs(sx - cy), abs(-sx + cy), abs(-sx - cy)))
+    return new_width, new_height
+
+
+def rotated_box(width, height, angle):
+    """(width, height, anchor_x, anchor_y) de um sprite girado `angle` graus, como o Actor do pgzero."""
+    if angle == 0.0:
+        return width, height, width * 0.5, height * 0.5
+    new_width, new_height = rotated_size(width, height, angle)
+    theta = -math.radians(angle)
+    sin_t, cos_t = math.sin(theta), math.cos(theta)
+    return (new_width, new_height,
+            (abs(width * cos_t) + abs(height * sin_t)) * 0.5, (abs(width * sin_t) + abs(height * cos_t)) * 0.5)
+
+
+_upright_boxes = {} # (largura, altura) -> rotated_box no ângulo 0, compartilhado pelas hitboxes sem rotação
+
+
+class Hitbox:
+    """
+    Substituto sem tela de um Actor do pgzero: retângulo centrado no tamanho da imagem,
+    com as mesmas regras de rotação e colliderect; a simulação só mexe nelas.
+    """
+    __slots__ = ("x", "y", "_angle", "_image", "_base_size", "width", "height", "_anchor_x", "_anchor_y")
+
+    def __init__(self, image, pos=(0, 0)):
+        self.x, self.y = pos
+        self._angle = 0.0
+        self.image = image
+
+    @property
+    def image(self):
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        """Troca o sprite mantendo o centro no lugar (como Actor.image)."""
+        if image == getattr(self, "_image", None):
+            return # Mesmo frame: nada a redimensionar
+        self._image = image
+        self._base_size = image_size(image)
+        self._update_size()
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @angle.setter
+    def angle(self, angle):
+        """Gira o sprite; a hitbox vira a caixa dele girado (como Actor.angle)."""
+        self._angle = angle
+        self._update_size()
+
+    def _update_size(self):
+        if self._angle == 0.0:
+            box = _upright_boxes.get(self._base_size)
+            if box is None:
+                box = _upright_boxes[self._base_size] = rotated_box(*self._base_size, 0.0)
+        else:
+            box = rotated_box(*self._base_size, self._angle)
+        self.width, self.height, self._anchor_x, self._anchor_y = box
+
+    @property
+    def pos(self):
+        return self.x, self.y
+
+    @pos.setter
+    def pos(self, pos):
+        self.x, self.y = pos
+
+    @property
+    def left(self):
+        return self.x - self._anchor_x
+
+    @left.setter
+    def left(self, value):
+        self.x = value + self._anchor_x
+
+    @property
+    def top(self):
+        return self.y - self._anchor_y
+
+    @top.setter
+    def top(self, value):
+        self.y = value + self._anchor_y
+
+    @property
+    def right(self):
+        return self.x - self._anchor_x + self.width
+
+    @right.setter
+    def right(self, value):
+        self.x = value - self.width + self._anchor_x
+
+    @property
+    def bottom(self):
+        return self.y - self._anchor_y + self.height
+
+    @bottom.setter
+    def bottom(self, value):
+        self.y = value - self.height + self._anchor_y
+
+    @property
+    def topleft(self):
+        return self.x - self._anchor_x, self.y - self._anchor_y
+
+    def colliderect(self, other):
+        """True se os retângulos se sobrepõem (other com left/top/right/bottom), como Rect.colliderect."""
+        return (self.left < other.right and self.top < other.bottom and
+                self.right > other.left and self.bottom > other.top)
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from pgzero import ptext
+
+# Fração do tamanho da superfície subtraída do ponto de âncora, como no ptext
+ANCHORS = {
+    "topleft": (0, 0), "midtop": (0.5, 0), "topright": (1, 0),
+    "midleft": (0, 0.5), "center": (0.5, 0.5), "midright": (1, 0.5),
+    "bottomleft": (0, 1), "midbottom": (0.5, 1), "bottomright": (1, 1),
+}
+
+
+class TextCache:
+    """Superfícies de texto renderizadas pelo ptext, por (texto, tamanho, cor, contorno); LRU de max_entries."""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, fontsize, color="white", ocolor=None, owidth=None):
+        """Superfície do texto, renderizada só no primeiro pedido desta chave."""
+        key = (text, fontsize, color, ocolor, owidth)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = ptext.getsurf(text, fontsize=fontsize, color=color, ocolor=ocolor, owidth=owidth, cache=False)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def entry(self, text, fontsize, color="white", ocolor=None, owidth=None, **anchor):
+        """Entrada (superfície, destino) de blits, posicionada por uma âncora como center=(x, y)."""
+        surface = self.render(text, fontsize, color, ocolor, owidth)
+        (name, (x, y)), = anchor.items()
+        hx, hy = ANCHORS[name]
+        return surface, (int(round(x - hx * surface.get_width())), int(round(y - hy * surface.get_height())))
+
+    @property
+    def hit_rate(self):
+        """Fração das renderizações atendidas pelo cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate, "entries": len(self.surfaces)}
+
+
+class Hud:
+    """Widgets nomeados, desenhados como entradas (superfície, destino) refeitas só quando o valor muda."""
+    def __init__(self, text_cache=None):
+        self.text_cache = text_cache or TextCache()
+        self.widgets = {} # nome -> (valor, entrada)
+
+        # Contadores
+        self.rebuilt = 0
+        self.reused = 0
+
+    def widget(self, name, value, build):
+        """Entrada do widget; chama build(value) só se o valor mudou."""
+        cached = self.widgets.get(name)
+        if cached is not None and cached[0] == value:
+            self.reused += 1
+            return cached[1]
+        self.rebuilt += 1
+        entry = build(value)
+        self.widgets[name] = (value, entry)
+        return entry
+
+    def text(self, name, text, fontsize, color="white", ocolor=None, owidth=None, **anchor):
+        """Widget de texto; os argumentos são os de TextCache.entry."""
+        value = (text, fontsize, color, ocolor, owidth, tuple(anchor.items()))
+        return self.widget(name, value, lambda _: self.text_cache.entry(text, fontsize, color, ocolor, owidth, **anchor))
+
+    @property
+    def hit_rate(self):
+        """Fração dos desenhos que reaproveitaram a entrada anterior."""
+        total = self.rebuilt + self.reused
+        return self.reused / total if total else 0.0
+
+    def stats(self):
+        """Contadores dos widgets e do cache de texto."""
+        return {
+            "rebuilt": self.rebuilt,
+            "reused": self.reused,
+            "hit_rate": self.hit_rate,
+            "text": self.text_cache.stats(),
+        }
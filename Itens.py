@@ -1,93 +1,166 @@
 import random
 
 class Item:
-    """Classe base para um item ou melhoria que pode ser escolhida ao subir de nível."""
-    def __init__(self, description):
-        self.description = description
+    """
+    Classe base para um item ou melhoria que pode ser escolhida ao subir de nível.
+    Só dados: `description`, `weight` (chance relativa) e `requires` (atributos exigidos do jogador).
+    """
+    description = ""
+    weight = 1.0
+    requires = {}
 
     def apply(self, player):
         """Aplica o efeito do item ao jogador. Deve ser sobrescrito."""
         raise NotImplementedError("O método 'apply' deve ser implementado por subclasses.")
 
+class StatUpgrade(Item):
+    """Melhoria que empilha um modificador num atributo do jogador (veja Player.BASE_STATS)."""
+    stat = None
+    flat = 0
+    percent = 0
+
+    def apply(self, player):
+        player.modify(self.stat, self.flat, self.percent, source=type(self).__name__)
+
 # --- Melhorias de Arma e Atributos ---
 
-class ProjectileDamageUpgrade(Item):
-    def __init__(self):
-        super().__init__("Aumenta o dano dos projéteis em 10.")
+class ProjectileDamageUpgrade(StatUpgrade):
+    description = "Aumenta o dano dos projéteis em 10."
+    stat, flat = "projectile_base_damage", 10
 
-    def apply(self, player):
-        player.increase_projectile_damage(10)
+class ProjectilePierceUpgrade(StatUpgrade):
+    description = "Os projéteis atravessam mais 1 inimigo."
+    stat, flat = "projectile_pierce", 1
 
-class MovementSpeedUpgrade(Item):
-    def __init__(self):
-        super().__init__("Aumenta a velocidade de movimento em 25%.")
+class MultiShotUpgrade(StatUpgrade):
+    description = "Dispara mais 1 projétil por tiro."
+    stat, flat = "projectile_count", 1
 
-    def apply(self, player):
-        player.increase_movement_speed(0.25)
+class MovementSpeedUpgrade(StatUpgrade):
+    description = "Aumenta a velocidade de movimento em 25%."
+    stat, flat = "speed", 0.25
 
-class MaxHealthUpgrade(Item):
-    def __init__(self):
-        super().__init__("Aumenta a vida máxima do jogador em 20.")
+class MaxHealthUpgrade(StatUpgrade):
+    description = "Aumenta a vida máxima do jogador em 20."
+    stat, flat = "max_health", 20
 
     def apply(self, player):
-        player.increase_max_health(20)
+        super().apply(player)
+        player.heal(self.flat) # Também cura o que a vida máxima aumentou
 
 # --- Melhorias Relacionadas à Arma Orbital ---
 
 class OrbitalWeaponUnlock(Item):
-    def __init__(self):
-        super().__init__("Desbloqueia a arma orbital")
+    description = "Desbloqueia a arma orbital"
+    requires = {"orbital_weapon_active": False}
 
     def apply(self, player):
         player.activate_orbital_weapon()
 
-class OrbitalDamageUpgrade(Item):
-    def __init__(self):
-        super().__init__("Aumenta o dano da arma orbital em 8")
+class OrbitalDamageUpgrade(StatUpgrade):
+    description = "Aumenta o dano da arma orbital em 8"
+    requires = {"orbital_weapon_active": True}
+    stat, flat = "orbital_damage", 8
 
-    def apply(self, player):
-        player.increase_orbital_damage(8)
-
-class OrbitalSpeedUpgrade(Item):
-    def __init__(self):
-        super().__init__("Aumenta a velocidade da arma orbital em 50%")
+class OrbitalSpeedUpgrade(StatUpgrade):
+    description = "Aumenta a velocidade da arma orbital em 50%"
+    requires = {"orbital_weapon_active": True}
+    stat, flat = "orbital_rotation_speed", 0.5
 
-    def apply(self, player):
-        player.add_orbital_weapon(0.5)
+class OrbitalBladeUpgrade(StatUpgrade):
+    description = "Adiciona mais 1 lâmina à arma orbital"
+    requires = {"orbital_weapon_active": True}
+    stat, flat = "orbital_blades", 1
 
 # --- Melhorias de Utilidade ---
 class HealthPotion(Item):
-    def __init__(self):
-        super().__init__("Restaura 50% da vida máxima do jogador.")
-        
+    description = "Restaura 50% da vida máxima do jogador."
+
     def apply(self, player):
         heal_amount = player.max_health * 0.50
         player.heal(heal_amount)
 
+# --- Registro das melhorias ---
+
+class UpgradeRegistry:
+    """
+    As melhorias oferecidas ao subir de nível, com as tabelas de alias do sorteio
+    por peso montadas uma vez para cada combinação dos atributos de `requires`.
+    """
+    def __init__(self, upgrades):
+        self.upgrades = [cls() for cls in upgrades]
+        self.by_name = {type(upgrade).__name__: upgrade for upgrade in self.upgrades}
+        self.flags = sorted({flag for upgrade in self.upgrades for flag in upgrade.requires})
+        self._pools = {} # Chave dos atributos -> (itens elegíveis, probabilidades, aliases)
+
+    def __getitem__(self, name):
+        return self.by_name[name]
+
+    def pool(self, player):
+        """Itens elegíveis para o jogador e as tabelas de alias do sorteio."""
+        key = tuple(bool(getattr(player, flag)) for flag in self.flags)
+        try:
+            return self._pools[key]
+        except KeyError:
+            state = dict(zip(self.flags, key))
+            eligible = [upgrade for upgrade in self.upgrades if upgrade.weight > 0 and
+                        all(state[flag] == value for flag, value in upgrade.requires.items())]
+            pool = self._pools[key] = (eligible, *_alias_tables([upgrade.weight for upgrade in eligible]))
+            return pool
+
+    def sample(self, player, k, rng=random):
+        """`k` itens elegíveis diferentes, sorteados pelo peso (todos, embaralhados, se não houver k)."""
+        eligible, probability, alias = self.pool(player)
+        n = len(eligible)
+        if k >= n:
+            chosen = list(eligible)
+            rng.shuffle(chosen)
+            return chosen
+        chosen = []
+        while len(chosen) < k:
+            i = int(rng.random() * n)
+            upgrade = eligible[i if rng.random() < probability[i] else alias[i]]
+            if upgrade not in chosen:
+                chosen.append(upgrade)
+        return chosen
+
+
+def _alias_tables(weights):
+    """Tabelas do método de alias de Vose: o índice i sai com probabilidade probability[i], senão sai alias[i]."""
+    n = len(weights)
+    total = sum(weights)
+    scaled = [weight * n / total for weight in weights]
+    probability = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    return probability, alias # O que sobrar nas listas fica com probabilidade 1 (erro de arredondamento)
+
+
+UPGRADES = UpgradeRegistry([
+    ProjectileDamageUpgrade,
+    ProjectilePierceUpgrade,
+    MultiShotUpgrade,
+    MovementSpeedUpgrade,
+    MaxHealthUpgrade,
+    HealthPotion,
+    OrbitalWeaponUnlock,
+    OrbitalDamageUpgrade,
+    OrbitalSpeedUpgrade,
+    OrbitalBladeUpgrade,
+])
+
 # --- Função para obter melhorias disponíveis ---
 
-def get_upgrade_options(player, num_options=3):
-    """Retorna uma lista de `num_options` escolhas de melhoria válidas para o jogador."""
-    possible_upgrades = [
-        ProjectileDamageUpgrade,
-        MovementSpeedUpgrade,
-        MaxHealthUpgrade,
-        HealthPotion,
-    ]
-
-    # Adiciona opções de arma orbital se estiver desbloqueada.
-    if player.orbital_weapon_active:
-        possible_upgrades.extend([
-            OrbitalDamageUpgrade,
-            OrbitalSpeedUpgrade,
-        ])
-    # Oferece o desbloqueio da arma orbital se ainda não estiver ativa.
-    else:
-        possible_upgrades.append(OrbitalWeaponUnlock)
-
-    # Instancia os objetos de melhoria
-    instantiated_upgrades = [cls() for cls in possible_upgrades]
-
-    # Embaralha e seleciona o número de opções necessárias
-    random.shuffle(instantiated_upgrades)
-    return instantiated_upgrades[:num_options]
\ No newline at end of file
+def get_upgrade_options(player, num_options=3, rng=random):
+    """
+    Retorna uma lista de `num_options` escolhas de melhoria válidas para o jogador.
+    `rng` permite sortear com um random.Random próprio (ex.: o da simulação, com semente).
+    """
+    return UPGRADES.sample(player, num_options, rng)
@@ -0,0 +1,85 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+
+_FLUSH = object()
+_STOP = object()
+
+
+class JsonlWriter:
+    """
+    Acrescenta registros (dicts serializáveis) a um JSONL com gzip, numa thread; write()
+    nunca espera, e registros além de `capacity` na fila são descartados e contados em `dropped`.
+    """
+    def __init__(self, path, capacity=256, compresslevel=6):
+        self.path = path
+        self.capacity = capacity
+        self.compresslevel = compresslevel
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self._queue = queue.Queue(capacity)
+        self._flush_pending = False
+        self._thread = None
+
+    def start(self):
+        """Inicia a thread (o arquivo só é aberto no primeiro registro); retorna self."""
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="JsonlWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def write(self, record):
+        """Enfileira um registro; nunca bloqueia."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Pede à thread que grave no disco (com fsync) o que já está na fila; nunca bloqueia."""
+        try:
+            self._queue.put_nowait(_FLUSH)
+        except queue.Full:
+            self._flush_pending = True # A thread está ocupada e confere isto depois de cada registro
+
+    def _run(self):
+        record = self._queue.get()
+        if record is _STOP:
+            return # Nada foi escrito: não cria o arquivo
+        with open(self.path, "ab") as raw, gzip.GzipFile(fileobj=raw, mode="ab",
+                                                         compresslevel=self.compresslevel) as out:
+            while record is not _STOP:
+                if record is not _FLUSH:
+                    try:
+                        out.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+                        self.written += 1
+                    except (TypeError, ValueError):
+                        self.errors += 1 # Não serializável: pula em vez de derrubar a thread
+                if record is _FLUSH or self._flush_pending:
+                    self._flush_pending = False
+                    out.flush()
+                    os.fsync(raw.fileno())
+                record = self._queue.get()
+
+    def stop(self):
+        """Grava o que ainda está na fila, fecha o arquivo e para a thread."""
+        if self._thread is None:
+            return
+        if self._thread.is_alive(): # Ela morre num erro de disco (o threading imprime a exceção)
+            self._queue.put(_STOP) # Só bloqueia até a thread abrir espaço
+        self._thread.join()
+        self._thread = None
+        atexit.unregister(self.stop)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
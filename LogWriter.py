@@ -0,0 +1,68 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que descarta (e conta) registros com a fila cheia em vez de bloquear."""
+    def __init__(self, records):
+        super().__init__(records)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogWriter:
+    """
+    Tira a escrita do `logging` do loop do jogo: o logger raiz só põe cada registro numa
+    fila limitada e uma thread escreve em `stream`; com a fila cheia, o registro é descartado.
+    """
+    def __init__(self, level=logging.INFO, stream=None, capacity=1024, fmt="%(message)s"):
+        self.level = level
+        self.stream = stream
+        self.capacity = capacity
+        self.fmt = fmt
+        self._handler = None
+        self._listener = None
+
+    @property
+    def dropped(self):
+        return self._handler.dropped if self._handler else 0
+
+    def start(self):
+        """Passa o logger raiz pela fila e inicia a thread; retorna self."""
+        if self._listener is not None:
+            return self
+        output = logging.StreamHandler(self.stream or sys.stdout)
+        output.setFormatter(logging.Formatter(self.fmt))
+        self._handler = _BoundedQueueHandler(queue.Queue(self.capacity))
+        self._listener = logging.handlers.QueueListener(self._handler.queue, output)
+
+        root = logging.getLogger()
+        root.setLevel(self.level)
+        root.addHandler(self._handler)
+        self._listener.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """Escreve o que ainda está na fila, para a thread e solta o logger raiz."""
+        if self._listener is None:
+            return
+        logging.getLogger().removeHandler(self._handler)
+        self._listener.stop()
+        self._listener = None
+        atexit.unregister(self.stop)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
@@ -0,0 +1,490 @@
+import hashlib
+import math
+import random
+import numpy as np
+from Player import Player, ORBITAL_HIT_COOLDOWN
+from Enemy import Wolf, Bat
+from Itens import get_upgrade_options
+from Hitbox import Hitbox
+from SpatialHash import SpatialHash
+from Swarm import EnemySwarm
+from EntityList import EntityList
+from Bullets import BulletRing
+from FlowField import FlowField
+from Camera import Camera
+from ChunkStore import ChunkStore
+from Ondas import DiretorOndas, ELITES, LIMITE_INIMIGOS
+from Profiler import Profiler
+
+# --- NÚCLEO DA SIMULAÇÃO ---
+# Todo o estado e a lógica de uma partida, sem pgzero, tela ou áudio. O main.py
+# só lê o teclado/mouse, chama Mundo.passo() e desenha o resultado; o mesmo
+# Mundo pode ser executado em Python puro, sem limite de ticks por segundo.
+
+LARGURA = 1200
+ALTURA = 800
+ATRASO_PRIMEIRO_SPAWN = 2.0 # Segundos até o primeiro lote de inimigos (os seguintes vêm de Ondas.ONDAS)
+TAMANHO_CELULA_GRADE = 64
+VELOCIDADE_PROJETIL = 8 # Pixels por frame a 60 FPS
+LEQUE_DISPARO = math.radians(8) # Ângulo entre os projéteis de um disparo múltiplo
+
+# --- PASSO FIXO ---
+# A simulação sempre avança em ticks de PASSO_FIXO segundos, qualquer que seja o
+# FPS: um frame lento roda mais ticks (até MAX_PASSOS_POR_FRAME) em vez de deixar
+# o jogo em câmera lenta, e a mesma semente dá o mesmo resultado em qualquer máquina.
+PASSO_FIXO = 1 / 120
+MAX_PASSOS_POR_FRAME = 8 # Acima disso (frames de mais de ~66 ms) o jogo desacelera em vez de travar
+
+# --- MUNDO GRANDE ---
+# Com um mundo maior que a visão (a área da tela), a câmera segue o jogador e só
+# os inimigos perto dela são simulados. A cada INTERVALO_STREAMING ticks, quem
+# ficou a mais de RAIO_ATIVO + TAMANHO_CHUNK pixels da visão é congelado num
+# ChunkStore, e os chunks a menos de RAIO_ATIVO dela voltam ao jogo (sem passar
+# do limite de inimigos vivos, começando pelos mais perto da visão). A folga de
+# um chunk entre as duas distâncias evita congelar e acordar o mesmo inimigo
+# a cada passada. Num mundo do tamanho da visão nada chega a ser congelado.
+TAMANHO_CHUNK = 512
+RAIO_ATIVO = 256
+INTERVALO_STREAMING = 30
+
+
+class EstadoJogo:
+    MENU = 0
+    JOGANDO = 1
+    FIM_DE_JOGO = 2
+    ESCOLHA_MELHORIA = 3
+
+
+class Comandos:
+    """
+    Entrada de um tick: teclas de movimento, cliques de tiro, escolha de melhoria
+    e, vindo do orçamento de frame do main.py, um novo limite de inimigos vivos.
+    """
+    def __init__(self, esquerda=False, direita=False, cima=False, baixo=False, disparos=(), escolha_melhoria=None,
+                 limite_inimigos=None):
+        self.esquerda = esquerda
+        self.direita = direita
+        self.cima = cima
+        self.baixo = baixo
+        self.disparos = disparos # Posições clicadas (alvos) neste tick
+        self.escolha_melhoria = escolha_melhoria # Índice em Mundo.opcoes_melhoria, ou None
+        self.limite_inimigos = limite_inimigos # Novo Mundo.limite_inimigos, ou None para manter
+
+    @property
+    def teclas(self):
+        return self.esquerda, self.direita, self.cima, self.baixo
+
+
+SEM_COMANDOS = Comandos()
+
+
+class GemaExperiencia:
+    """Representa uma gema de experiência deixada por um inimigo."""
+    __slots__ = ("hitbox", "valor_xp", "handle", "dead") # Milhares no chão: sem __dict__ por gema
+
+    def __init__(self, pos): # 'pos' é a posição
+        self.hitbox = Hitbox("gem.png", pos) # "gem.png" é nome do arquivo de imagem
+        self.reset(pos)
+
+    def reset(self, pos):
+        """(Re)inicializa a gema; usado pelo pool ao reaproveitar a instância."""
+        self.hitbox.pos = pos
+        self.valor_xp = 10
+
+
+class Mundo:
+    """
+    Estado completo de uma partida e o passo que o avança no tempo.
+    Sons e outras reações ficam em `eventos` (nomes como "hit" e "game_over"),
+    que o frontend consome depois de cada passo; a melhoria que um passo aplicou
+    fica em `melhoria_aplicada` até o frontend consumi-la.
+    """
+    def __init__(self, largura=LARGURA, altura=ALTURA, semente=None, usar_broad_phase=True, perfil=None,
+                 usar_campo_de_fluxo=True, visao=None):
+        self.largura = largura
+        self.altura = altura
+        # A parte do mundo na tela, (largura, altura); por padrão o mundo inteiro, como na arena clássica.
+        # Inimigos nascem logo fora dela e projéteis que a deixam somem.
+        self.camera = Camera(*(visao or (largura, altura)), largura, altura)
+        self.rng = random.Random() # Toda a aleatoriedade da partida sai daqui (semeado em reiniciar())
+        # Com True, as colisões passam por uma grade uniforme (spatial hash); com False,
+        # usam o teste força-bruta, útil para comparar resultados e tempos.
+        self.usar_broad_phase = usar_broad_phase
+        # Com True, a horda persegue o jogador por um campo de fluxo compartilhado, que também
+        # afasta inimigos amontoados; com False, cada inimigo mira direto no jogador.
+        self.usar_campo_de_fluxo = usar_campo_de_fluxo
+        # Mede cada fase do passo quando ligado; desligado (o padrão), as medições não custam quase nada
+        self.perfil = perfil or Profiler()
+
+        self.inimigos = EnemySwarm() # Os inimigos ativos, em arrays NumPy (uma linha por inimigo)
+        self.congelados = ChunkStore(TAMANHO_CHUNK) # Inimigos longe da câmera, parados até ela chegar perto
+        # Todos os projéteis vivos, em arrays NumPy num buffer circular (uma linha por projétil)
+        self.projeteis = BulletRing("projectile.png", VELOCIDADE_PROJETIL)
+        # Gemas vivas, com instâncias vindas de um pool; removidas por marcação + varredura
+        self.gemas_experiencia = EntityList(GemaExperiencia)
+        self.opcoes_melhoria = []
+        self.ondas = DiretorOndas() # Tabela de ondas: quando e quantos inimigos nascem
+        self.grade_gemas = SpatialHash(TAMANHO_CELULA_GRADE) # Atualizada ao criar/coletar gemas
+        self.eventos = []
+        self.acumulador = 0.0 # Tempo real ainda não simulado (sempre menor que PASSO_FIXO entre frames)
+        # Com uma Gravacao aqui, passo() anota os comandos de cada tick para a partida poder ser reproduzida
+        self.gravacao = None
+
+        self.reiniciar(semente)
+
+    def reiniciar(self, semente=None):
+        """
+        Volta ao início de uma partida, devolvendo as instâncias aos pools.
+        Sem semente, sorteia uma nova; ela fica em `semente` para gravar a partida.
+        """
+        self.semente = semente if semente is not None else random.randrange(2 ** 63)
+        self.rng.seed(self.semente)
+        self.gravacao = None
+        self.jogador = Player((self.largura / 2, self.altura / 2))
+        self.camera.follow(*self.jogador.hitbox.pos)
+
+        self.inimigos.clear()
+        self.congelados.clear()
+        self.projeteis.clear()
+        self.gemas_experiencia.clear()
+        self.opcoes_melhoria.clear()
+        self.melhoria_aplicada = None # O Itens.Item da última escolha aplicada, até o frontend zerar
+        self.grade_gemas.clear()
+        self.eventos.clear()
+
+        self.estado = EstadoJogo.JOGANDO
+        self.tick = 0 # Ticks executados desde o início da partida
+        self.tempo_decorrido = 0
+        self.tempo_ate_spawn = ATRASO_PRIMEIRO_SPAWN
+        # Inimigos vivos no máximo; começa no teto fixo e só muda por Comandos.limite_inimigos,
+        # para a gravação repetir o que o modo adaptativo decidiu
+        self.limite_inimigos = LIMITE_INIMIGOS
+        self.acumulador = 0.0
+
+    # --- PASSO DA SIMULAÇÃO ---
+
+    def avancar(self, dt_real, comandos=SEM_COMANDOS):
+        """
+        Avança o tempo real de um frame em ticks fixos de PASSO_FIXO.
+        O que sobrar fica no acumulador para o próximo frame (veja `alfa`).
+        Disparos, escolha de melhoria e limite de inimigos valem só para o
+        primeiro tick; as teclas, para todos. Retorna (ticks executados, eventos de todos eles).
+        """
+        so_teclas = Comandos(*comandos.teclas)
+        eventos = []
+        passos = self.ticks_do_frame(dt_real)
+        for passo in range(passos):
+            eventos.extend(self.passo(PASSO_FIXO, comandos if passo == 0 else so_teclas))
+        return passos, eventos
+
+    def ticks_do_frame(self, dt_real):
+        """Quantos ticks de PASSO_FIXO cabem no tempo real acumulado; tira esse tempo do acumulador."""
+        self.acumulador = min(self.acumulador + dt_real, PASSO_FIXO * MAX_PASSOS_POR_FRAME)
+        passos = 0
+        while self.acumulador >= PASSO_FIXO:
+            self.acumulador -= PASSO_FIXO
+            passos += 1
+        return passos
+
+    @property
+    def usar_campo_de_fluxo(self):
+        return self.campo_fluxo is not None
+
+    @usar_campo_de_fluxo.setter
+    def usar_campo_de_fluxo(self, ligado):
+        if not ligado:
+            self.campo_fluxo = None
+        elif self.camera.fixed:
+            self.campo_fluxo = FlowField(self.camera.width, self.camera.height)
+        else:
+            # No mundo grande o campo cobre toda a horda ativa, que vai até RAIO_ATIVO + TAMANHO_CHUNK fora da visão
+            self.campo_fluxo = FlowField(self.camera.width, self.camera.height, margin=RAIO_ATIVO + TAMANHO_CHUNK)
+
+    @property
+    def alfa(self):
+        """Fração do próximo tick já decorrida; o desenho interpola as posições por ela."""
+        return self.acumulador / PASSO_FIXO
+
+    def passo(self, dt, comandos=SEM_COMANDOS):
+        """
+        Aplica os comandos do tick e avança a simulação em dt segundos.
+        Retorna a lista de eventos gerados neste passo.
+        """
+        self.eventos.clear()
+        if self.gravacao is not None:
+            self.gravacao.gravar(comandos)
+        self.tick += 1
+
+        if comandos.limite_inimigos is not None:
+            self.limite_inimigos = comandos.limite_inimigos
+        if self.estado == EstadoJogo.ESCOLHA_MELHORIA and comandos.escolha_melhoria is not None:
+            self.escolher_melhoria(comandos.escolha_melhoria)
+
+        if self.estado == EstadoJogo.JOGANDO:
+            for alvo in comandos.disparos:
+                self.disparar(alvo)
+            self.atualizar(dt, comandos.teclas)
+
+        return self.eventos
+
+    def disparar(self, alvo):
+        """Dispara da posição do jogador em direção ao alvo (um leque de projéteis com o disparo múltiplo)."""
+        jogador = self.jogador
+        self.projeteis.fire(jogador.hitbox.pos, alvo, jogador.projectile_base_damage,
+                            jogador.projectile_pierce, jogador.projectile_count, LEQUE_DISPARO)
+        self.eventos.append("shoot")
+
+    def escolher_melhoria(self, indice):
+        """Aplica a melhoria escolhida e retoma o jogo."""
+        item_escolhido = self.opcoes_melhoria[indice]
+        item_escolhido.apply(self.jogador) # Aplica o efeito do item
+        self.opcoes_melhoria.clear()
+        self.estado = EstadoJogo.JOGANDO
+        self.melhoria_aplicada = item_escolhido
+        return item_escolhido
+
+    def atualizar(self, dt, teclas):
+        """Loop principal de atualização lógica para o estado 'JOGANDO'."""
+        self.tempo_decorrido += dt
+        self.mover(dt, teclas)
+        self.resolver_colisoes()
+
+    def mover(self, dt, teclas):
+        """
+        Fase de movimento: lotes de inimigos, jogador, horda e projéteis.
+        Nada colide aqui. Cada teste de colisão só depende das posições finais do
+        tick, então mover tudo antes de testar não altera nenhum resultado.
+        """
+        perfil = self.perfil
+        with perfil.section("gerar_inimigos"):
+            self.tempo_ate_spawn -= dt
+            while self.tempo_ate_spawn <= 0:
+                self.gerar_lote()
+
+        with perfil.section("Player.update"):
+            self.jogador.update(dt, self.largura, self.altura, teclas)
+            self.camera.follow(*self.jogador.hitbox.pos)
+        if self.tick % INTERVALO_STREAMING == 0:
+            with perfil.section("transmitir_chunks"):
+                self.transmitir_chunks()
+        with perfil.section("inimigos.update"):
+            # Move a horda ativa inteira de uma vez
+            if self.campo_fluxo is not None:
+                self.campo_fluxo.move_to(self.camera.left, self.camera.top)
+            self.inimigos.update(dt, self.jogador.hitbox.pos, self.campo_fluxo)
+        with perfil.section("projeteis.update"):
+            self.projeteis.update(dt)
+
+    def transmitir_chunks(self):
+        """
+        Congela os inimigos longe da câmera e acorda os dos chunks que ela alcançou
+        (veja RAIO_ATIVO), só até o limite de inimigos vivos.
+        """
+        esquerda, topo, direita, base = self.camera.rect
+        inimigos = self.inimigos
+        n = inimigos.count
+        if n:
+            folga = RAIO_ATIVO + TAMANHO_CHUNK
+            x, y = inimigos.x[:n], inimigos.y[:n]
+            longe = (x < esquerda - folga) | (x > direita + folga) | (y < topo - folga) | (y > base + folga)
+            if longe.any():
+                self.congelados.put(inimigos.extract(longe))
+        acordados = self.congelados.take(esquerda - RAIO_ATIVO, topo - RAIO_ATIVO, direita + RAIO_ATIVO, base + RAIO_ATIVO,
+                                         self.limite_inimigos - len(inimigos))
+        if acordados is not None:
+            inimigos.insert(acordados)
+
+    def resolver_colisoes(self):
+        """
+        Fase de colisão: contato com o jogador, arma orbital, projéteis e gemas.
+        Quem sai do jogo é só marcado (kill) e ignorado pelos testes seguintes;
+        as listas são compactadas uma única vez no fim, em varrer().
+        """
+        perfil = self.perfil
+        with perfil.section("colidir_inimigos"):
+            jogador_morreu = self.colidir_inimigos()
+        if not jogador_morreu:
+            with perfil.section("colidir_projeteis"):
+                self.colidir_projeteis()
+            with perfil.section("colidir_gemas"):
+                self.colidir_gemas()
+        with perfil.section("varrer"):
+            self.varrer()
+
+    def colidir_inimigos(self):
+        """Contato dos inimigos com o jogador e com a arma orbital. Retorna True se o jogador morreu."""
+        jogador = self.jogador
+        inimigos = self.inimigos
+        for indice in np.flatnonzero(inimigos.overlapping(jogador.hitbox)).tolist():
+            inimigos.kill(indice)
+            if self.causar_dano_jogador(float(inimigos.damage[indice])):
+                return True
+        if jogador.orbital_weapon_active:
+            self.colidir_orbital()
+        return False
+
+    def colidir_orbital(self):
+        """
+        Lâminas da arma orbital, testadas numa passada só (veja EnemySwarm.in_ring); cada
+        inimigo atingido fica ORBITAL_HIT_COOLDOWN segundos sem poder ser atingido de novo.
+        """
+        jogador = self.jogador
+        inimigos = self.inimigos
+        n = inimigos.count
+        atingidos = inimigos.in_ring(jogador.hitbox.pos, jogador.orbital_distance, jogador.orbital_blade_radius,
+                                     jogador.orbital_angle, int(jogador.orbital_blades))
+        atingidos &= ~inimigos.dead[:n] & (inimigos.orbital_ready[:n] <= self.tempo_decorrido)
+        indices = np.flatnonzero(atingidos)
+        if not len(indices):
+            return
+        inimigos.orbital_ready[indices] = self.tempo_decorrido + ORBITAL_HIT_COOLDOWN
+        for indice in indices.tolist():
+            if inimigos.take_damage(indice, jogador.orbital_damage): # True se o inimigo morreu
+                self.abater_inimigo(indice)
+            self.eventos.append("hit")
+
+    def colidir_projeteis(self):
+        """
+        Projéteis que saíram da tela ou atingiram inimigos, com teste contínuo ao longo
+        do caminho do tick (veja BulletRing.contacts).
+        """
+        projeteis = self.projeteis
+        inimigos = self.inimigos
+        projeteis.cull(*self.camera.rect)
+        n = inimigos.count
+        if not projeteis or not n:
+            return
+
+        esquerdas, topos, direitas, bases = inimigos.bounds()
+        linhas, indices = projeteis.contacts(esquerdas, topos, direitas, bases,
+                                             inimigos.x[:n] - inimigos.prev_x[:n], inimigos.y[:n] - inimigos.prev_y[:n],
+                                             self.usar_broad_phase)
+        for linha, indice in zip(linhas.tolist(), indices.tolist()):
+            # Inimigos já marcados neste tick (pela arma orbital ou por outro projétil) não contam
+            if inimigos.dead[indice] or not projeteis.strike(linha, int(inimigos.handle[indice])):
+                continue
+            if inimigos.take_damage(indice, projeteis.damage[linha]): # True se o inimigo morreu
+                self.abater_inimigo(indice)
+            self.eventos.append("hit")
+
+    def colidir_gemas(self):
+        """Coleta as gemas que o jogador está tocando, na ordem em que caíram."""
+        jogador = self.jogador
+        if self.usar_broad_phase:
+            gemas_proximas = sorted(self.grade_gemas.query(jogador.hitbox), key=lambda gema: gema.handle)
+        else:
+            gemas_proximas = self.gemas_experiencia
+        for gema_atual in gemas_proximas: # 'gema_atual' é uma instância de GemaExperiencia
+            if jogador.hitbox.colliderect(gema_atual.hitbox):
+                self.coletar_gema(gema_atual)
+
+    def varrer(self):
+        """Compacta inimigos, projéteis e gemas, removendo de uma vez tudo que foi marcado no tick."""
+        self.inimigos.sweep()
+        self.projeteis.sweep()
+        self.gemas_experiencia.sweep()
+
+    def causar_dano_jogador(self, dano):
+        """Aplica o dano de contato de um inimigo. Retorna True se o jogador morreu."""
+        self.jogador.take_damage(dano)
+        self.eventos.append("hit")
+        if self.jogador.health <= 0:
+            self.estado = EstadoJogo.FIM_DE_JOGO
+            self.eventos.append("game_over")
+            return True
+        return False
+
+    def abater_inimigo(self, indice):
+        """
+        Marca o inimigo derrotado, deixa uma gema na posição dele e conta o abate.
+        Um inimigo já marcado neste tick (atingido por duas coisas) não conta de novo.
+        """
+        inimigos = self.inimigos
+        if not inimigos.kill(indice):
+            return
+        self.soltar_gema(inimigos.pos(indice)).valor_xp = inimigos.enemy_types[inimigos.type_id[indice]].XP_VALUE
+        self.jogador.enemies_killed += 1
+
+    def soltar_gema(self, pos):
+        """Coloca uma gema de experiência no chão e a retorna."""
+        gema = self.gemas_experiencia.add(pos)
+        self.grade_gemas.insert(gema, gema.hitbox)
+        return gema
+
+    def coletar_gema(self, gema_atual):
+        """Coleta uma gema e abre a escolha de melhoria se o jogador subir de nível."""
+        if not self.gemas_experiencia.kill(gema_atual):
+            return
+        self.grade_gemas.remove(gema_atual, gema_atual.hitbox)
+        self.eventos.append("collect")
+        if self.jogador.process_gem_collection(gema_atual.valor_xp): # True se subiu de nível
+            self.eventos.append("level_up")
+            # Obtém 2 opções de melhoria aleatórias do sistema de itens
+            self.opcoes_melhoria[:] = get_upgrade_options(self.jogador, num_options=2, rng=self.rng)
+            self.estado = EstadoJogo.ESCOLHA_MELHORIA
+
+    def gerar_lote(self):
+        """
+        Gera o lote da onda atual e agenda o próximo. Perto do limite de vivos,
+        parte do lote vem como elites ou fica de fora (veja DiretorOndas.repartir).
+        """
+        onda = self.ondas.onda(self.tempo_decorrido)
+        comuns, elites = self.ondas.repartir(onda.tamanho, len(self.inimigos), self.limite_inimigos)
+        for _ in range(comuns):
+            self.gerar_inimigo(onda.chance_lobo)
+        for _ in range(elites):
+            self.gerar_inimigo(onda.chance_lobo, elite=True)
+        self.tempo_ate_spawn += onda.intervalo
+
+    def gerar_inimigo(self, chance_lobo=0.7, elite=False):
+        """Gera um novo inimigo (ou elite) em uma posição aleatória logo fora da visão da câmera."""
+        rng = self.rng
+        camera = self.camera
+        esquerda, topo = int(camera.left), int(camera.top)
+        lado_tela = rng.choice(['top', 'bottom', 'left', 'right'])
+        if lado_tela == 'top': posicao_spawn = (esquerda + rng.randint(0, camera.width), topo - 30)
+        elif lado_tela == 'bottom': posicao_spawn = (esquerda + rng.randint(0, camera.width), topo + camera.height + 30)
+        elif lado_tela == 'left': posicao_spawn = (esquerda - 30, topo + rng.randint(0, camera.height))
+        else: posicao_spawn = (esquerda + camera.width + 30, topo + rng.randint(0, camera.height)) # right
+
+        # Adiciona variedade na geração de inimigos
+        tipo = Wolf if rng.random() < chance_lobo else Bat
+        self.inimigos.spawn(ELITES[tipo] if elite else tipo, posicao_spawn, rng)
+
+    def resumo_estado(self):
+        """
+        SHA-256 do estado da partida: tempo, gerador aleatório, jogador, inimigos
+        (ativos e congelados), projéteis e gemas. Dois Mundos só têm o mesmo resumo se forem idênticos
+        bit a bit, o que permite conferir uma reprodução.
+        """
+        resumo = hashlib.sha256()
+        jogador = self.jogador
+        orbital = [lamina.pos for lamina in jogador.orbital_hitboxes]
+        resumo.update(repr((
+            self.tick, self.estado, self.tempo_decorrido, self.tempo_ate_spawn, self.limite_inimigos, self.rng.getstate(),
+            jogador.hitbox.pos, jogador.health, jogador.max_health, jogador.speed, jogador.level,
+            jogador.experience, jogador.xp_to_next_level, jogador.projectile_base_damage,
+            jogador.enemies_killed, jogador.gems_collected_for_heal, orbital, jogador.orbital_angle,
+            jogador.orbital_damage, jogador.orbital_rotation_speed, jogador.orbital_blades,
+            [type(opcao).__name__ for opcao in self.opcoes_melhoria],
+            [g.hitbox.pos for g in self.gemas_experiencia],
+        )).encode())
+        inimigos = self.inimigos
+        for campo in (inimigos.x, inimigos.y, inimigos.speed, inimigos.health, inimigos.type_id, inimigos.orbital_ready):
+            resumo.update(campo[:inimigos.count].tobytes())
+        congelados = self.congelados.columns()
+        if congelados:
+            for campo in ("x", "y", "speed", "health", "type_id", "handle", "orbital_ready"):
+                resumo.update(congelados[campo].tobytes())
+        projeteis = self.projeteis.columns()
+        for campo in ("x", "y", "vx", "vy", "damage", "pierce", "hit_ids"):
+            resumo.update(projeteis[campo].tobytes())
+        return resumo.digest()
+
+    def estatisticas_pools(self):
+        """Contadores de cada pool (inimigos, projéteis e gemas)."""
+        return {
+            "inimigos": self.inimigos.stats(),
+            "projeteis": self.projeteis.stats(),
+            "gemas": self.gemas_experiencia.stats(),
+        }
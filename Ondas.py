@@ -0,0 +1,61 @@
+import bisect
+from collections import namedtuple
+from Enemy import Wolf, Bat, EliteWolf, EliteBat
+
+# --- ONDAS ---
+# Cada linha vale de `inicio` (segundos de partida) até a próxima: a cada
+# `intervalo` segundos nasce um lote de `tamanho` inimigos, cada um Lobo com
+# chance `chance_lobo` (senão Morcego). A última linha vale até o fim.
+Onda = namedtuple("Onda", "inicio intervalo tamanho chance_lobo")
+
+ONDAS = (
+    Onda(0, 2.5, 1, 0.7),
+    Onda(15, 2.0, 1, 0.7),
+    Onda(30, 2.0, 2, 0.7),
+    Onda(45, 1.5, 2, 0.7),
+    Onda(60, 1.5, 3, 0.65),
+    Onda(90, 1.5, 4, 0.6),
+    Onda(120, 1.25, 5, 0.6),
+    Onda(180, 1.25, 7, 0.55),
+    Onda(240, 1.0, 8, 0.5),
+    Onda(300, 1.0, 10, 0.5),
+)
+
+LIMITE_INIMIGOS = 500 # Teto fixo de inimigos vivos; o modo adaptativo do main.py pode baixá-lo
+# Com True, um lote que não cabe no limite troca grupos de inimigos por elites
+# (Enemy.EliteWolf/EliteBat, que valem MERGED inimigos cada); com False, o que
+# não cabe simplesmente não nasce.
+FUNDIR_ELITES = True
+ELITES = {Wolf: EliteWolf, Bat: EliteBat}
+
+
+class DiretorOndas:
+    """
+    Decide quando e quantos inimigos nascem, trocando grupos por elites para não
+    passar do limite de vivos. Não guarda estado da partida (ele fica no Mundo).
+    """
+    def __init__(self, ondas=ONDAS, fundir_elites=FUNDIR_ELITES):
+        self.ondas = ondas
+        self.inicios = [onda.inicio for onda in ondas]
+        self.fundir_elites = fundir_elites
+        self.fator_elite = min(elite.MERGED for elite in ELITES.values())
+
+    def onda(self, tempo):
+        """A onda em vigor `tempo` segundos depois do início da partida."""
+        return self.ondas[max(bisect.bisect_right(self.inicios, tempo) - 1, 0)]
+
+    def repartir(self, tamanho, vivos, limite):
+        """
+        Quantos (comuns, elites) nascem de um lote de `tamanho` com `vivos`
+        inimigos no jogo. Funde só os grupos necessários para o lote caber;
+        sem vagas (ou sem fundir elites), o que não cabe fica de fora.
+        """
+        livres = max(limite - vivos, 0)
+        if tamanho <= livres:
+            return tamanho, 0
+        if not self.fundir_elites:
+            return livres, 0
+        fator = self.fator_elite
+        # Cada elite libera fator - 1 vagas em relação aos comuns que substitui
+        elites = min(tamanho // fator, -(-(tamanho - livres) // (fator - 1)), livres)
+        return min(tamanho - elites * fator, livres - elites), elites
@@ -1,29 +1,71 @@
+import logging
 import math
-from pgzero.actor import Actor
-from pgzero.keyboard import keyboard
+from Hitbox import Hitbox, REFERENCE_FPS
+from Stats import Stats
+from Sprites import image_size
+
+log = logging.getLogger(__name__)
+
+# Stats driven by upgrades, with their starting values and the name used in the log
+BASE_STATS = {
+    "speed": (3, "Movement Speed"),
+    "max_health": (100, "Max Health"),
+    "projectile_base_damage": (25, "Projectile Damage"),
+    "projectile_pierce": (0, "Projectile Pierce"), # Extra enemies each projectile passes through
+    "projectile_count": (1, "Projectiles per Shot"), # Projectiles per shot, fanned out around the aim
+    "orbital_rotation_speed": (2.5, "Orbital Rotation Speed"),
+    "orbital_damage": (15, "Orbital Damage"), # Per hit; an enemy is hit at most once per ORBITAL_HIT_COOLDOWN
+    "orbital_blades": (1, "Orbital Blades"), # Blades evenly spaced around the orbit
+}
+
+ORBITAL_IMAGE = "orbital_blade.png"
+ORBITAL_HIT_COOLDOWN = 0.5 # Seconds of game time before the blades can hit the same enemy again
+
+
+def _stat(name):
+    """Player attribute read from the stat pipeline; assigning it sets the base value and drops its modifiers."""
+    return property(lambda self: self.stats[name], lambda self, value: self.stats.set_base(name, value))
+
 
 class Player:
-    """Represents the player character, handling movement, stats, and animations."""
+    """
+    Represents the player character, handling movement, stats, and animations.
+    The stats in BASE_STATS live in `stats` and are changed by pushing
+    modifiers (see modify()); they still read like plain attributes.
+    """
+    speed = _stat("speed")
+    max_health = _stat("max_health")
+    projectile_base_damage = _stat("projectile_base_damage")
+    projectile_pierce = _stat("projectile_pierce")
+    projectile_count = _stat("projectile_count")
+    orbital_rotation_speed = _stat("orbital_rotation_speed")
+    orbital_damage = _stat("orbital_damage")
+    orbital_blades = _stat("orbital_blades")
+    # Blades collide as circles of this radius (see EnemySwarm.in_ring)
+    orbital_blade_radius = max(image_size(ORBITAL_IMAGE)) / 2
+
+    # Animation frames, shared by every Player
+    IDLE_FRAMES = ("duck-idle1.png", "duck-idle2.png")
+    WALK_LEFT_FRAMES = ("duck-walk-left1.png", "duck-walk-left2.png")
+    WALK_RIGHT_FRAMES = ("duck-walk-right1.png", "duck-walk-right2.png")
+
     def __init__(self, pos):
-        self.actor = Actor("duck-idle1.png", pos=pos)
-        
-        self.speed = 3
-        self.max_health = 100
+        self.hitbox = Hitbox(self.IDLE_FRAMES[0], pos)
+        self.previous_pos = self.hitbox.pos # Position before the last update, for render interpolation
+
+        self.stats = Stats(**{name: value for name, (value, _) in BASE_STATS.items()})
         self.health = self.max_health
         self.level = 1
         self.experience = 0
         self.xp_to_next_level = 50
-        self.projectile_base_damage = 25
         self.enemies_killed = 0
+        self.damage_taken = 0 # Health actually lost, summed over the run
 
         # Gem-based healing attributes
         self.gems_collected_for_heal = 0
         self.gems_needed_for_hp_point = 20
 
         # Animation attributes
-        self.idle_frames = ["duck-idle1.png", "duck-idle2.png"]
-        self.walk_left_frames = ["duck-walk-left1.png", "duck-walk-left2.png"]
-        self.walk_right_frames = ["duck-walk-right1.png", "duck-walk-right2.png"]
         self.animation_timer = 0.0
         self.animation_speed = 0.2
         self.current_frame = 0
@@ -32,64 +74,62 @@ class Player:
 
         # Orbital Weapon attributes
         self.orbital_weapon_active = False
-        self.orbital_actor = None
+        self.orbital_hitboxes = [] # One per blade, for drawing; collisions use the ring itself
+        self.orbital_previous_positions = []
         self.orbital_distance = 45
-        self.orbital_angle = 0
-        self.orbital_rotation_speed = 2.5
-        self.orbital_damage = 15
+        self.orbital_angle = 0 # Angle of the first blade, in radians
 
-    def update(self, dt, screen_width, screen_height):
-        """Update player state each frame."""
-        self.handle_input()
+    def update(self, dt, screen_width, screen_height, keys=(False, False, False, False)):
+        """Update player state each tick. `keys` is the (left, right, up, down) movement input."""
+        self.previous_pos = self.hitbox.pos
+        self.orbital_previous_positions = [blade.pos for blade in self.orbital_hitboxes]
+        self.handle_input(*keys, dt=dt)
         self.check_boundaries(screen_width, screen_height)
         self.animate(dt)
         if self.orbital_weapon_active:
             self.update_orbital_weapon(dt)
 
-    def draw(self):
-        """Draw the player on the screen."""
-        self.actor.draw()
-
-    def handle_input(self):
-        """Process keyboard inputs for movement."""
+    def handle_input(self, left, right, up, down, dt=1 / REFERENCE_FPS):
+        """Process the movement keys held during a tick of dt seconds."""
         dx, dy = 0, 0
-        if keyboard.left or keyboard.a:
+        if left:
             dx -= 1
             self.face_right = False
-        if keyboard.right or keyboard.d:
+        if right:
             dx += 1
             self.face_right = True
-        if keyboard.up or keyboard.w:
+        if up:
             dy -= 1
-        if keyboard.down or keyboard.s:
+        if down:
             dy += 1
         
         if dx != 0 and dy != 0:
             dx *= 0.707
             dy *= 0.707
             
-        self.actor.x += dx * self.speed
-        self.actor.y += dy * self.speed
+        scale = dt * REFERENCE_FPS
+        self.hitbox.x += dx * self.speed * scale
+        self.hitbox.y += dy * self.speed * scale
         self.is_moving = dx != 0 or dy != 0
 
     def animate(self, dt):
         self.animation_timer += dt
         
-        active_frames = self.idle_frames
+        active_frames = self.IDLE_FRAMES
         if self.is_moving:
-            active_frames = self.walk_right_frames if self.face_right else self.walk_left_frames
+            active_frames = self.WALK_RIGHT_FRAMES if self.face_right else self.WALK_LEFT_FRAMES
 
         if self.animation_timer >= self.animation_speed:
             self.animation_timer = 0
             self.current_frame = (self.current_frame + 1) % len(active_frames)
-            self.actor.image = active_frames[self.current_frame]
+            self.hitbox.image = active_frames[self.current_frame]
 
     def check_boundaries(self, screen_width, screen_height):
         """Prevent the player from moving off-screen."""
-        self.actor.left = max(self.actor.left, 0)
-        self.actor.right = min(self.actor.right, screen_width)
-        self.actor.top = max(self.actor.top, 0)
-        self.actor.bottom = min(self.actor.bottom, screen_height)
+        self.hitbox.left = max(self.hitbox.left, 0)
+        self.hitbox.right = min(self.hitbox.right, screen_width)
+        self.hitbox.top = max(self.hitbox.top, 0)
+        self.hitbox.bottom = min(self.hitbox.bottom, screen_height)
 
     def add_experience(self, amount):
         """Adds experience and checks for level up."""
@@ -99,7 +139,7 @@ class Player:
             self.experience -= self.xp_to_next_level
             self.level += 1
             self.xp_to_next_level = int(self.xp_to_next_level * 1.5)
-            print(f"LEVEL UP! New Level: {self.level}")
+            log.info("LEVEL UP! New Level: %s", self.level)
             leveled_up = True
         return leveled_up
 
@@ -115,69 +155,43 @@ class Player:
     def take_damage(self, amount):
         """Reduces player health."""
         if self.health > 0:
-            self.health = max(0, self.health - amount)
+            health = max(0, self.health - amount)
+            self.damage_taken += self.health - health
+            self.health = health
 
     def heal(self, amount):
         """Increases player health."""
         self.health = min(self.max_health, self.health + amount)
-        print(f"Player healed by {amount}. Current health: {self.health}")
+        log.debug("Player healed by %s. Current health: %s", amount, self.health)
 
     # --- Orbital Weapon Methods ---
     def activate_orbital_weapon(self):
         """Activates the orbital weapon if it's not already active."""
         if not self.orbital_weapon_active:
             self.orbital_weapon_active = True
-            self.orbital_actor = Actor("orbital_blade.png")
-            self.update_orbital_weapon(0) # Set initial position
-            print("Orbital Blade Unlocked!")
-
-    def add_orbital_weapon(self, rotation_speed_increase=0):
-        """Activates the orbital weapon if it's not already active, or increases its speed."""
-        if not self.orbital_weapon_active:
-            self.orbital_weapon_active = True
-            # Create the first orbital blade
-            self.orbital_actor = Actor("orbital_blade.png")
             self.update_orbital_weapon(0) # Set initial position
-            print("Orbital Blade Unlocked!")
-        else:
-            # If already active, just increase speed
-            self.increase_orbital_rotation_speed(rotation_speed_increase)
-
+            log.info("Orbital Blade Unlocked!")
 
     def update_orbital_weapon(self, dt):
-        """Updates the position and angle of the orbital weapon."""
-        if not self.orbital_actor: return
+        """Turns the orbit and places every blade, evenly spaced from orbital_angle."""
+        if not self.orbital_weapon_active: return
         self.orbital_angle = (self.orbital_angle + self.orbital_rotation_speed * dt) % (2 * math.pi)
-        offset_x = math.cos(self.orbital_angle) * self.orbital_distance
-        offset_y = math.sin(self.orbital_angle) * self.orbital_distance
-        self.orbital_actor.pos = (self.actor.x + offset_x, self.actor.y + offset_y)
-        self.orbital_actor.angle = math.degrees(-self.orbital_angle)
-
-    def draw_orbital_weapon(self):
-        """Draws the orbital weapon if active."""
-        if self.orbital_actor:
-            self.orbital_actor.draw()
+        count = int(self.orbital_blades)
+        while len(self.orbital_hitboxes) < count: # A blade from an upgrade joins the ring here
+            self.orbital_hitboxes.append(Hitbox(ORBITAL_IMAGE))
+        del self.orbital_hitboxes[count:]
+        for k, blade in enumerate(self.orbital_hitboxes):
+            angle = self.orbital_angle + 2 * math.pi * k / count
+            blade.pos = (self.hitbox.x + math.cos(angle) * self.orbital_distance,
+                         self.hitbox.y + math.sin(angle) * self.orbital_distance)
+            blade.angle = math.degrees(-angle)
+        # New blades start at rest, with no previous position to interpolate from
+        self.orbital_previous_positions[count:] = []
+        self.orbital_previous_positions += [blade.pos for blade in self.orbital_hitboxes[len(self.orbital_previous_positions):]]
 
     # --- Upgrade Methods (called by Items) ---
-    def increase_projectile_damage(self, amount):
-        self.projectile_base_damage += amount
-        print(f"Projectile Damage increased to: {self.projectile_base_damage}")
-
-    def increase_movement_speed(self, amount):
-        self.speed += amount
-        print(f"Movement Speed increased to: {self.speed}")
-
-    def increase_max_health(self, amount):
-        self.max_health += amount
-        self.heal(amount) # Also heal for the increased amount
-        print(f"Max Health increased to: {self.max_health}. Current Health: {self.health}")
-
-    def increase_orbital_damage(self, amount):
-        if self.orbital_weapon_active:
-            self.orbital_damage += amount
-            print(f"Orbital Damage increased to: {self.orbital_damage}")
-
-    def increase_orbital_rotation_speed(self, amount):
-        if self.orbital_weapon_active:
-            self.orbital_rotation_speed += amount
-            print(f"Orbital Rotation Speed increased to: {self.orbital_rotation_speed}")
\ No newline at end of file
+    def modify(self, stat, flat=0, percent=0, source=None):
+        """Push a modifier onto one of the BASE_STATS and return the stat's new value."""
+        value = self.stats.add(stat, flat, percent, source)
+        log.info("%s increased to: %s", BASE_STATS[stat][1], value)
+        return value
@@ -0,0 +1,50 @@
+class Pool:
+    """Lista de instâncias liberadas, reaproveitadas com reset(*args) antes de criar novas."""
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+
+        # Contadores
+        self.acquired = 0 # Chamadas de acquire()
+        self.reused = 0 # Atendidas por uma instância liberada
+        self.live = 0 # Instâncias em uso agora
+        self.peak_live = 0
+
+    def acquire(self, *args):
+        """Uma instância inicializada com args, reaproveitada se houver uma liberada."""
+        self.acquired += 1
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+        else:
+            obj = self.cls(*args)
+        self.live += 1
+        if self.live > self.peak_live:
+            self.peak_live = self.live
+        return obj
+
+    def release(self, obj):
+        """Devolve uma instância para um acquire() futuro."""
+        self.free.append(obj)
+        self.live -= 1
+
+    def release_all(self, objs):
+        """Devolve todas as instâncias de objs."""
+        for obj in objs:
+            self.release(obj)
+
+    @property
+    def hit_rate(self):
+        """Fração dos acquire() que reaproveitaram uma instância."""
+        return self.reused / self.acquired if self.acquired else 0.0
+
+    def stats(self):
+        """Cópia dos contadores, para relatórios e sobreposições."""
+        return {
+            "acquired": self.acquired,
+            "reused": self.reused,
+            "hit_rate": self.hit_rate,
+            "live": self.live,
+            "peak_live": self.peak_live,
+        }
@@ -0,0 +1,64 @@
+import threading
+import time
+
+
+class Preloader:
+    """
+    Roda as tarefas (chave, carregar) em ordem numa thread, enquanto o menu é desenhado;
+    get(chave) só espera se aquela tarefa ainda não terminou.
+    """
+    def __init__(self, jobs, clock=time.perf_counter):
+        self.jobs = list(jobs)
+        self.clock = clock
+        self.results = {}
+        self.errors = {}
+        self.timings = {} # chave -> segundos que a tarefa levou
+        self.started = None
+        self.finished = None
+        self._done = {key: threading.Event() for key, _ in self.jobs}
+        self._thread = threading.Thread(target=self._run, name="Preloader", daemon=True)
+
+    def start(self):
+        """Começa a carregar em segundo plano; retorna self."""
+        self.started = self.clock()
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for key, load in self.jobs:
+            start = self.clock()
+            try:
+                self.results[key] = load()
+            except Exception as error: # get() levanta de novo, na thread principal
+                self.errors[key] = error
+            self.timings[key] = self.clock() - start
+            self._done[key].set()
+        self.finished = self.clock()
+
+    @property
+    def done(self):
+        """True quando todas as tarefas já rodaram."""
+        return self.finished is not None
+
+    @property
+    def progress(self):
+        """(tarefas terminadas, total de tarefas)."""
+        return len(self.timings), len(self.jobs)
+
+    @property
+    def elapsed(self):
+        """Segundos de start() até a última tarefa (ou até agora, enquanto carrega)."""
+        if self.started is None:
+            return 0.0
+        return (self.finished if self.finished is not None else self.clock()) - self.started
+
+    def get(self, key):
+        """O resultado da tarefa `key`, esperando por ela se ainda estiver carregando."""
+        self._done[key].wait()
+        if key in self.errors:
+            raise self.errors[key]
+        return self.results[key]
+
+    def wait(self):
+        """Espera todas as tarefas terminarem."""
+        self._thread.join()
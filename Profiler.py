@@ -0,0 +1,163 @@
+import gc
+import json
+import os
+import time
+from collections import deque
+
+
+class _NullSection:
+    """O que section() devolve com o perfilador desligado: entrar e sair não fazem nada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        profiler._sections.append((self.name, self.start, profiler.clock() - self.start))
+        return False
+
+
+class Profiler:
+    """
+    Tempos por frame de seções nomeadas (`with perfil.section("nome"):`), coletas do GC e
+    contagens de entidades, dos últimos `history_seconds`; desligado, quase não custa nada.
+    """
+    def __init__(self, history_seconds=10.0, window=120, clock=time.perf_counter):
+        self.history_seconds = history_seconds
+        self.window = window # Frames usados nos percentis
+        self.clock = clock
+        self.enabled = False
+        self.frames = deque() # (start, duration, sections, counters, gc_events)
+        self.origin = clock()
+
+        self._frame_start = None
+        self._sections = None
+        self._gc_events = []
+        self._gc_start = None
+
+    # --- LIGAR E DESLIGAR ---
+
+    def enable(self):
+        if not self.enabled:
+            self.enabled = True
+            gc.callbacks.append(self._on_gc)
+
+    def disable(self):
+        if self.enabled:
+            self.enabled = False
+            gc.callbacks.remove(self._on_gc)
+            self._frame_start = self._sections = None
+
+    def toggle(self):
+        """Liga ou desliga o perfilador; retorna o novo estado."""
+        self.disable() if self.enabled else self.enable()
+        return self.enabled
+
+    # --- MEDIÇÃO ---
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = self.clock()
+        self._sections = []
+        self._gc_events = []
+
+    def section(self, name):
+        """Context manager que mede o bloco como `name` dentro do frame atual."""
+        if self._sections is None:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def end_frame(self, **counters):
+        """Fecha o frame, guardando as seções, as coletas do GC e os contadores dados (ex.: inimigos=120)."""
+        if self._sections is None:
+            return
+        end = self.clock()
+        self.frames.append((self._frame_start, end - self._frame_start, self._sections, counters, self._gc_events))
+        self._frame_start = self._sections = None
+        while self.frames and end - self.frames[0][0] > self.history_seconds:
+            self.frames.popleft()
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = self.clock()
+        elif self._gc_start is not None:
+            self._gc_events.append((info["generation"], self._gc_start, self.clock() - self._gc_start))
+            self._gc_start = None
+
+    # --- RELATÓRIOS ---
+
+    def percentiles(self):
+        """{nome: (p50, p95)} em ms nos últimos `window` frames; "frame" é o frame inteiro."""
+        recent = list(self.frames)[-self.window:]
+        samples = {"frame": [duration for _, duration, _, _, _ in recent]}
+        for _, _, sections, _, _ in recent:
+            per_frame = {}
+            for name, _, duration in sections:
+                per_frame[name] = per_frame.get(name, 0.0) + duration
+            for name, duration in per_frame.items():
+                samples.setdefault(name, []).append(duration)
+        result = {}
+        for name, values in samples.items():
+            if values:
+                values.sort()
+                result[name] = (_quantile(values, 0.50) * 1000, _quantile(values, 0.95) * 1000)
+        return result
+
+    def gc_counts(self):
+        """Coletas por geração no histórico guardado."""
+        counts = [0, 0, 0]
+        for _, _, _, _, gc_events in self.frames:
+            for generation, _, _ in gc_events:
+                counts[generation] += 1
+        return counts
+
+    def last_counters(self):
+        return self.frames[-1][3] if self.frames else {}
+
+    def chrome_trace(self):
+        """Os frames guardados como trace do Chrome (tempos em microssegundos)."""
+        events = []
+        ts = lambda t: round((t - self.origin) * 1e6, 1)
+        dur = lambda seconds: round(seconds * 1e6, 1)
+        for start, duration, sections, counters, gc_events in self.frames:
+            events.append({"name": "frame", "ph": "X", "ts": ts(start), "dur": dur(duration), "pid": 1, "tid": 1})
+            for name, section_start, section_duration in sections:
+                events.append({"name": name, "ph": "X", "ts": ts(section_start), "dur": dur(section_duration), "pid": 1, "tid": 1})
+            for generation, gc_start, gc_duration in gc_events:
+                events.append({"name": f"gc gen{generation}", "ph": "X", "ts": ts(gc_start), "dur": dur(gc_duration),
+                               "pid": 1, "tid": 1, "cat": "gc"})
+            if counters:
+                events.append({"name": "entities", "ph": "C", "ts": ts(start), "pid": 1, "args": counters})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path=None):
+        """Grava chrome_trace() num JSON e retorna o caminho."""
+        path = path or f"perfil-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return os.path.abspath(path)
+
+
+def _quantile(sorted_values, q):
+    """Quantil (posto mais próximo) de uma lista já ordenada."""
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
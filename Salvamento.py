@@ -0,0 +1,301 @@
+import os
+import struct
+import numpy as np
+import Itens
+from Mundo import Mundo
+from Bullets import HIT_MEMORY
+
+# --- FORMATO DO ARQUIVO ---
+# "CDSV" e a versão, seguidos destas seções, tudo little-endian:
+#   valores: pares (nome, valor) do Mundo e do jogador, cada valor com o tipo
+#     (int, float, bool, texto ou None), para números voltarem exatamente iguais;
+#   gerador aleatório: as 625 palavras de estado do Mersenne Twister;
+#   tabelas de inimigos, projéteis, gemas e inimigos congelados (os dos chunks
+#     longe da câmera): número de linhas e, para cada coluna, nome, dtype NumPy e
+#     os bytes crus do array, lidos com um frombuffer por coluna.
+# Valores e colunas têm nome: um campo que um arquivo antigo não tem fica com o
+# padrão de um Mundo novo e um que não existe mais é ignorado; uma tabela que falta
+# no fim do arquivo (como a dos congelados, nos estados antigos) fica vazia. Se o formato em si
+# mudar, VERSAO sobe e o leitor da versão anterior continua em _LEITORES.
+MAGICO = b"CDSV"
+VERSAO = 1
+
+_CABECALHO = struct.Struct("<4sH")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_RNG = struct.Struct("<B625I?d")
+
+# Atributos do Player guardados como valores (posição e sprite vão à parte; as lâminas da arma
+# orbital são recolocadas pelo ângulo). Os atributos do Stats entram pelo valor final, que ao
+# carregar vira a base, sem modificadores.
+CAMPOS_JOGADOR = (
+    "speed", "max_health", "health", "level", "experience", "xp_to_next_level",
+    "projectile_base_damage", "projectile_pierce", "projectile_count", "enemies_killed", "damage_taken", "gems_collected_for_heal", "gems_needed_for_hp_point",
+    "animation_timer", "animation_speed", "current_frame", "is_moving", "face_right",
+    "orbital_weapon_active", "orbital_distance", "orbital_angle", "orbital_rotation_speed", "orbital_damage",
+    "orbital_blades",
+)
+CAMPOS_MUNDO = ("semente", "estado", "tick", "tempo_decorrido", "tempo_ate_spawn", "limite_inimigos", "acumulador")
+# Colunas da tabela de projéteis e o campo do BulletRing de cada uma (as caixas são refeitas pelo ângulo)
+COLUNAS_PROJETEIS = {
+    "x": "x", "y": "y", "anterior_x": "prev_x", "anterior_y": "prev_y", "vx": "vx", "vy": "vy",
+    "angulo": "angle", "dano": "damage", "perfuracoes": "pierce", "acertos": "hit_count",
+}
+
+
+class _Escritor:
+    def __init__(self):
+        self.dados = bytearray()
+
+    def empacotar(self, formato, *valores):
+        self.dados += formato.pack(*valores)
+
+    def texto(self, texto):
+        codificado = texto.encode()
+        self.empacotar(_U16, len(codificado))
+        self.dados += codificado
+
+    def valores(self, valores):
+        self.empacotar(_U16, len(valores))
+        for nome, valor in valores.items():
+            self.texto(nome)
+            if valor is None:
+                self.dados += b"n"
+            elif isinstance(valor, (bool, np.bool_)):
+                self.dados += b"b"
+                self.empacotar(_U8, bool(valor))
+            elif isinstance(valor, (int, np.integer)):
+                self.dados += b"i"
+                self.empacotar(_INT, int(valor))
+            elif isinstance(valor, (float, np.floating)):
+                self.dados += b"f"
+                self.empacotar(_FLOAT, float(valor))
+            else:
+                self.dados += b"s"
+                self.texto(str(valor))
+
+    def tabela(self, linhas, colunas):
+        self.empacotar(_U32, linhas)
+        self.empacotar(_U16, len(colunas))
+        for nome, array in colunas.items():
+            array = np.ascontiguousarray(array)
+            self.texto(nome)
+            self.texto(array.dtype.str)
+            self.dados += array.tobytes()
+
+
+class _Leitor:
+    def __init__(self, dados, inicio=0):
+        self.dados = memoryview(dados)
+        self.i = inicio
+
+    def desempacotar(self, formato):
+        valores = formato.unpack_from(self.dados, self.i)
+        self.i += formato.size
+        return valores
+
+    def bytes(self, tamanho):
+        if self.i + tamanho > len(self.dados):
+            raise ValueError("estado salvo truncado")
+        pedaco = self.dados[self.i:self.i + tamanho]
+        self.i += tamanho
+        return pedaco
+
+    def restante(self):
+        return len(self.dados) - self.i
+
+    def texto(self):
+        tamanho, = self.desempacotar(_U16)
+        return bytes(self.bytes(tamanho)).decode()
+
+    def valores(self):
+        quantidade, = self.desempacotar(_U16)
+        valores = {}
+        for _ in range(quantidade):
+            nome = self.texto()
+            tipo = bytes(self.bytes(1))
+            if tipo == b"n":
+                valores[nome] = None
+            elif tipo == b"b":
+                valores[nome] = bool(self.desempacotar(_U8)[0])
+            elif tipo == b"i":
+                valores[nome], = self.desempacotar(_INT)
+            elif tipo == b"f":
+                valores[nome], = self.desempacotar(_FLOAT)
+            else:
+                valores[nome] = self.texto()
+        return valores
+
+    def tabela(self):
+        linhas, = self.desempacotar(_U32)
+        quantidade, = self.desempacotar(_U16)
+        colunas = {}
+        for _ in range(quantidade):
+            nome = self.texto()
+            dtype = np.dtype(self.texto())
+            colunas[nome] = np.frombuffer(self.bytes(linhas * dtype.itemsize), dtype=dtype)
+        return linhas, colunas
+
+
+# --- SALVAR ---
+
+def estado_em_bytes(mundo):
+    """O estado completo do Mundo no formato descrito acima."""
+    escritor = _Escritor()
+    escritor.empacotar(_CABECALHO, MAGICO, VERSAO)
+
+    jogador = mundo.jogador
+    valores = {nome: getattr(mundo, nome) for nome in CAMPOS_MUNDO}
+    valores.update(largura=mundo.largura, altura=mundo.altura, usar_broad_phase=mundo.usar_broad_phase,
+                   visao_largura=mundo.camera.width, visao_altura=mundo.camera.height,
+                   usar_campo_de_fluxo=mundo.usar_campo_de_fluxo,
+                   tipos_inimigos=",".join(cls.__name__ for cls in mundo.inimigos.enemy_types),
+                   opcoes_melhoria=",".join(type(opcao).__name__ for opcao in mundo.opcoes_melhoria),
+                   proximo_handle_inimigos=mundo.inimigos.next_handle,
+                   proximo_handle_gemas=mundo.gemas_experiencia.next_handle)
+    valores.update({f"jogador.{nome}": getattr(jogador, nome) for nome in CAMPOS_JOGADOR})
+    valores.update({"jogador.x": jogador.hitbox.x, "jogador.y": jogador.hitbox.y,
+                    "jogador.anterior_x": jogador.previous_pos[0], "jogador.anterior_y": jogador.previous_pos[1],
+                    "jogador.imagem": jogador.hitbox.image})
+    escritor.valores(valores)
+
+    versao_rng, palavras, gauss = mundo.rng.getstate()
+    escritor.empacotar(_RNG, versao_rng, *palavras, gauss is not None, gauss or 0.0)
+
+    escritor.tabela(mundo.inimigos.count, mundo.inimigos.columns())
+
+    projeteis = mundo.projeteis.columns()
+    colunas = {nome: projeteis[campo] for nome, campo in COLUNAS_PROJETEIS.items()}
+    # Os inimigos atingidos por último (handles), uma coluna por posição da memória
+    colunas.update({f"atingidos_{k}": projeteis["hit_ids"][:, k] for k in range(projeteis["hit_ids"].shape[1])})
+    escritor.tabela(len(mundo.projeteis), colunas)
+
+    gemas = [g for g in mundo.gemas_experiencia if not g.dead]
+    escritor.tabela(len(gemas), {
+        "x": np.array([g.hitbox.x for g in gemas], np.float64),
+        "y": np.array([g.hitbox.y for g in gemas], np.float64),
+        "valor_xp": np.array([g.valor_xp for g in gemas], np.int64),
+        "handle": np.array([g.handle for g in gemas], np.int64),
+    })
+
+    escritor.tabela(len(mundo.congelados), mundo.congelados.columns())
+    return bytes(escritor.dados)
+
+
+def salvar_estado(mundo, caminho):
+    """Grava o estado do Mundo num arquivo e retorna o caminho absoluto."""
+    with open(caminho, "wb") as f:
+        f.write(estado_em_bytes(mundo))
+    return os.path.abspath(caminho)
+
+
+# --- CARREGAR ---
+
+def estado_de_bytes(dados, mundo=None, perfil=None):
+    """
+    Restaura um estado salvo por estado_em_bytes() num Mundo novo, ou em
+    `mundo`, reiniciado antes. Levanta ValueError se os dados não forem um
+    estado salvo ou vierem de uma versão desconhecida.
+    """
+    if len(dados) < _CABECALHO.size or bytes(dados[:4]) != MAGICO:
+        raise ValueError("os dados não são um estado salvo do Cyber-Duck")
+    _, versao = _CABECALHO.unpack_from(dados)
+    leitor = _LEITORES.get(versao)
+    if leitor is None:
+        raise ValueError(f"estado salvo na versão {versao}; esta lê até a versão {VERSAO}")
+    return leitor(_Leitor(dados, _CABECALHO.size), mundo, perfil)
+
+
+def carregar_estado(caminho, mundo=None, perfil=None):
+    """Lê um arquivo salvo por salvar_estado(); veja estado_de_bytes()."""
+    with open(caminho, "rb") as f:
+        return estado_de_bytes(f.read(), mundo, perfil)
+
+
+def _ler_v1(leitor, mundo, perfil):
+    valores = leitor.valores()
+    largura, altura = valores["largura"], valores["altura"]
+    usar_campo_de_fluxo = valores.get("usar_campo_de_fluxo", False) # Estados mais antigos que o campo de fluxo
+    visao = valores.get("visao_largura", largura), valores.get("visao_altura", altura) # Idem, que a câmera
+    if mundo is None:
+        mundo = Mundo(largura, altura, valores["semente"], valores["usar_broad_phase"], perfil, usar_campo_de_fluxo,
+                      visao)
+    elif (mundo.largura, mundo.altura) != (largura, altura):
+        raise ValueError(f"o estado é de um mundo {largura}x{altura}, não {mundo.largura}x{mundo.altura}")
+    elif (mundo.camera.width, mundo.camera.height) != visao:
+        raise ValueError(f"o estado é de uma visão {visao[0]}x{visao[1]}, "
+                         f"não {mundo.camera.width}x{mundo.camera.height}")
+    else:
+        mundo.reiniciar(valores["semente"])
+        mundo.usar_broad_phase = valores["usar_broad_phase"]
+        mundo.usar_campo_de_fluxo = usar_campo_de_fluxo
+
+    for nome in CAMPOS_MUNDO:
+        if nome in valores:
+            setattr(mundo, nome, valores[nome])
+    nomes_melhorias = valores.get("opcoes_melhoria", "")
+    mundo.opcoes_melhoria[:] = [Itens.UPGRADES[nome] for nome in nomes_melhorias.split(",") if nome]
+
+    jogador = mundo.jogador
+    for nome in CAMPOS_JOGADOR:
+        if f"jogador.{nome}" in valores:
+            setattr(jogador, nome, valores[f"jogador.{nome}"])
+    jogador.hitbox.image = valores.get("jogador.imagem", jogador.hitbox.image)
+    jogador.hitbox.pos = valores["jogador.x"], valores["jogador.y"]
+    jogador.previous_pos = valores.get("jogador.anterior_x", valores["jogador.x"]), \
+        valores.get("jogador.anterior_y", valores["jogador.y"])
+    mundo.camera.follow(*jogador.hitbox.pos)
+    # As lâminas saem do ângulo e da posição do jogador (dt 0 não gira); os "orbital.*" de estados antigos são ignorados
+    jogador.update_orbital_weapon(0)
+
+    versao_rng, *palavras, tem_gauss, gauss = leitor.desempacotar(_RNG)
+    mundo.rng.setstate((versao_rng, tuple(palavras), gauss if tem_gauss else None))
+
+    # Inimigos: carregados junto com os congelados, no fim
+    ativos, inimigos = leitor.tabela()
+
+    linhas, colunas = leitor.tabela()
+    projeteis = {campo: colunas[nome] for nome, campo in COLUNAS_PROJETEIS.items() if nome in colunas}
+    projeteis.setdefault("prev_x", projeteis.get("x"))
+    projeteis.setdefault("prev_y", projeteis.get("y"))
+    projeteis["hit_ids"] = np.zeros((linhas, HIT_MEMORY), np.int64)
+    for k in range(HIT_MEMORY):
+        if f"atingidos_{k}" in colunas:
+            projeteis["hit_ids"][:, k] = colunas[f"atingidos_{k}"]
+    mundo.projeteis.load_columns({campo: coluna for campo, coluna in projeteis.items() if coluna is not None})
+
+    linhas, colunas = leitor.tabela()
+    coluna = lambda nome, padrao: colunas[nome].tolist() if nome in colunas else [padrao] * linhas
+    # Sem a coluna de handles (estados antigos), as gemas ficam com os da ordem em que foram soltas
+    handles = coluna("handle", None)
+    for x, y, valor_xp, handle in zip(coluna("x", 0.0), coluna("y", 0.0), coluna("valor_xp", 10), handles):
+        gema = mundo.soltar_gema((x, y))
+        gema.valor_xp = valor_xp
+        if handle is not None:
+            gema.handle = handle
+
+    # Ativos e congelados vão direto para os arrays do enxame, com os tipos remapeados pelo nome, e os
+    # congelados voltam para os chunks. Os próximos handles seguem de onde a partida parou (nos estados
+    # antigos, sem o contador, do maior carregado), para os inimigos e gemas criados depois terem os mesmos
+    # handles da partida original
+    congelados = leitor.tabela()[1] if leitor.restante() else {}
+    if congelados:
+        inimigos = {nome: np.concatenate((coluna, congelados[nome])) for nome, coluna in inimigos.items()
+                    if nome in congelados}
+    if "type_id" in inimigos:
+        tipos_atuais = [cls.__name__ for cls in mundo.inimigos.enemy_types]
+        remapear = np.array([tipos_atuais.index(nome) for nome in valores["tipos_inimigos"].split(",")], np.int8)
+        inimigos["type_id"] = remapear[inimigos["type_id"]]
+    mundo.inimigos.load_columns(inimigos, valores.get("proximo_handle_inimigos"))
+    if congelados:
+        mundo.congelados.put(mundo.inimigos.extract(np.arange(mundo.inimigos.count) >= ativos))
+    if "proximo_handle_gemas" in valores:
+        mundo.gemas_experiencia.next_handle = valores["proximo_handle_gemas"]
+    return mundo
+
+
+# Um leitor por versão do formato; os antigos ficam para os arquivos antigos continuarem abrindo
+_LEITORES = {1: _ler_v1}
@@ -0,0 +1,53 @@
+from collections import defaultdict
+
+
+class SpatialHash:
+    """Grade uniforme para a broad phase: cada item fica nas células que o retângulo dele cobre."""
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+
+    def clear(self):
+        """Esvazia a grade (para reconstruí-la a cada tick)."""
+        self.cells.clear()
+
+    def _cell_keys(self, left, top, right, bottom):
+        """As chaves (coluna, linha) das células que os limites cobrem."""
+        size = self.cell_size
+        first_col = int(left // size)
+        last_col = int(right // size)
+        first_row = int(top // size)
+        last_row = int(bottom // size)
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                yield col, row
+
+    def insert(self, item, rect):
+        """Adiciona um item com o retângulo dado (qualquer coisa com left/right/top/bottom)."""
+        self.insert_bounds(item, rect.left, rect.top, rect.right, rect.bottom)
+
+    def insert_bounds(self, item, left, top, right, bottom):
+        """Adiciona um item com os limites dados, para quem guarda coordenadas soltas."""
+        cells = self.cells
+        for key in self._cell_keys(left, top, right, bottom):
+            cells[key].append(item)
+
+    def remove(self, item, rect):
+        """Remove um item inserido com o mesmo retângulo."""
+        for key in self._cell_keys(rect.left, rect.top, rect.right, rect.bottom):
+            bucket = self.cells.get(key)
+            if bucket is None:
+                continue
+            bucket.remove(item)
+            if not bucket:
+                del self.cells[key]
+
+    def query(self, rect):
+        """Itens com alguma célula em comum com o retângulo (candidatos; o teste exato fica com quem chama)."""
+        found = set()
+        cells = self.cells
+        for key in self._cell_keys(rect.left, rect.top, rect.right, rect.bottom):
+            bucket = cells.get(key)
+            if bucket:
+                found.update(bucket)
+        return found
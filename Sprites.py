@@ -0,0 +1,18 @@
+import os
+import struct
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+_size_cache = {}
+
+
+def image_size(name):
+    """(largura, altura) de uma imagem de images/, lidas do cabeçalho PNG (sem carregar o pygame)."""
+    size = _size_cache.get(name)
+    if size is None:
+        with open(os.path.join(IMAGES_DIR, name), "rb") as f:
+            header = f.read(24)
+        # Assinatura PNG (8 bytes), tamanho e tipo do bloco IHDR (8 bytes), depois largura e altura
+        size = struct.unpack(">II", header[16:24])
+        _size_cache[name] = size
+    return size
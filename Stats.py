@@ -0,0 +1,50 @@
+class Stats:
+    """
+    Atributos numéricos: valor base mais uma pilha de modificadores (somas em
+    ordem, depois a soma dos percentuais), calculados na primeira leitura e
+    guardados em cache até um modificador mexer neles.
+    """
+    def __init__(self, **base):
+        self.base = dict(base)
+        self.modifiers = [] # (atributo, soma, percentual, origem), na ordem em que entraram
+        self._cache = {}
+
+    def __getitem__(self, stat):
+        try:
+            return self._cache[stat]
+        except KeyError:
+            value = self._cache[stat] = self._compute(stat)
+            return value
+
+    def __contains__(self, stat):
+        return stat in self.base
+
+    def _compute(self, stat):
+        value = self.base[stat]
+        percent = 0
+        for name, flat, scale, _ in self.modifiers:
+            if name == stat:
+                value += flat
+                percent += scale
+        return value * (1 + percent) if percent else value
+
+    def add(self, stat, flat=0, percent=0, source=None):
+        """Empilha um modificador em `stat` e retorna o novo valor; `source` identifica a origem (veja remove())."""
+        if stat not in self.base:
+            raise KeyError(f"atributo desconhecido {stat!r}")
+        self.modifiers.append((stat, flat, percent, source))
+        self._cache.pop(stat, None)
+        return self[stat]
+
+    def remove(self, source):
+        """Remove todos os modificadores empilhados por `source`."""
+        touched = {stat for stat, _, _, origin in self.modifiers if origin == source}
+        self.modifiers = [modifier for modifier in self.modifiers if modifier[3] != source]
+        for stat in touched:
+            self._cache.pop(stat, None)
+
+    def set_base(self, stat, value):
+        """Troca a base do atributo por `value` e descarta os modificadores dele."""
+        self.base[stat] = value
+        self.modifiers = [modifier for modifier in self.modifiers if modifier[0] != stat]
+        self._cache.pop(stat, None)
@@ -0,0 +1,316 @@
+import math
+import random
+import numpy as np
+from Enemy import ENEMY_TYPES
+from Sprites import image_size
+from Hitbox import REFERENCE_FPS
+
+
+class EnemySwarm:
+    """
+    Todos os inimigos vivos, uma linha por inimigo nos arrays NumPy abaixo, em ordem
+    de spawn; kill() só marca e sweep() compacta. O `handle` de um inimigo nunca muda.
+    """
+    # Arrays por inimigo e seus dtypes
+    FIELDS = (
+        ("x", np.float64),
+        ("y", np.float64),
+        ("prev_x", np.float64), # Posição antes do último update, para a interpolação do desenho
+        ("prev_y", np.float64),
+        ("speed", np.float64),
+        ("health", np.float64),
+        ("damage", np.float64),
+        ("type_id", np.int8),
+        ("facing_right", np.bool_),
+        ("handle", np.int64),
+        ("dead", np.bool_),
+        ("orbital_ready", np.float64), # Tempo de jogo a partir do qual a arma orbital pode acertá-lo de novo
+    )
+
+    def __init__(self, capacity=256, enemy_types=ENEMY_TYPES):
+        self.enemy_types = enemy_types
+        self.count = 0
+        self.next_handle = 1 # Handle do próximo spawn; o salvamento guarda para continuar a numeração
+
+        # Tabelas por tipo, indexadas pelo id do tipo
+        self.type_frames = [(cls.RIGHT_FRAMES, cls.LEFT_FRAMES) for cls in enemy_types]
+        self.type_frame_count = np.array([len(cls.RIGHT_FRAMES) for cls in enemy_types], dtype=np.int8)
+        self.type_animation_speed = np.array([cls.ANIMATION_SPEED for cls in enemy_types])
+        sizes = np.array([image_size(cls.RIGHT_FRAMES[0]) for cls in enemy_types], dtype=np.float64)
+        self.type_half_width = sizes[:, 0] / 2
+        self.type_half_height = sizes[:, 1] / 2
+        self.type_radius = (self.type_half_width + self.type_half_height) / 2 # Para os testes de círculo (in_ring)
+
+        # Cada nome de frame uma vez, e a tabela [tipo, facing_right, frame] -> índice do nome
+        self.frame_names = []
+        self.frame_table = np.zeros((len(enemy_types), 2, max(self.type_frame_count)), dtype=np.intp)
+        for type_id, (right_frames, left_frames) in enumerate(self.type_frames):
+            for facing_right, frames in ((0, left_frames), (1, right_frames)):
+                for frame, name in enumerate(frames):
+                    if name not in self.frame_names:
+                        self.frame_names.append(name)
+                    self.frame_table[type_id, facing_right, frame] = self.frame_names.index(name)
+
+        # Contadores como os do Pool: um spawn "reaproveita" quando cabe nos arrays já alocados
+        self.acquired = 0
+        self.reused = 0
+        self.peak_live = 0
+
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Re)aloca os arrays, mantendo as linhas em uso."""
+        n = self.count
+        for name, dtype in self.FIELDS:
+            array = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:n] = old[:n]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Remove todos os inimigos (os arrays mantêm a capacidade)."""
+        self.count = 0
+        self.next_handle = 1
+
+    def spawn(self, enemy_cls, pos, rng=random):
+        """Adiciona um inimigo do tipo dado (Wolf, Bat, ...) e retorna a linha dele."""
+        self.acquired += 1
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        else:
+            self.reused += 1
+        i = self.count
+        self.count += 1
+        if self.count > self.peak_live:
+            self.peak_live = self.count
+        self.x[i], self.y[i] = pos
+        self.prev_x[i], self.prev_y[i] = pos
+        self.speed[i] = rng.uniform(*enemy_cls.SPEED_RANGE)
+        self.health[i] = enemy_cls.MAX_HEALTH
+        self.damage[i] = enemy_cls.DAMAGE
+        self.type_id[i] = self.enemy_types.index(enemy_cls)
+        self.facing_right[i] = True
+        self.handle[i] = self.next_handle
+        self.next_handle += 1
+        self.dead[i] = False
+        self.orbital_ready[i] = 0.0
+        return i
+
+    def update(self, dt, player_pos, flow_field=None):
+        """Move todos os inimigos um passo na direção do jogador (pelo FlowField, se houver um)."""
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        px, py = player_pos
+
+        if flow_field is not None:
+            dx, dy = flow_field.steer(player_pos, x, y)
+            step = self.speed[:n] * (dt * REFERENCE_FPS)
+        else:
+            # Um passo de `speed`, escalado por dt, pelo vetor normalizado até o jogador
+            dx = px - x
+            dy = py - y
+            dist = np.hypot(dx, dy)
+            on_player = dist == 0
+            dist[on_player] = 1.0
+            dx[on_player] = 1.0 # atan2(0, 0) é 0: em cima do jogador, o passo vai para +x
+            step = self.speed[:n] * (dt * REFERENCE_FPS) / dist
+        # Vira para o jogador antes de andar (só os morcegos têm frames para a esquerda)
+        self.facing_right[:n] = px >= x
+        x += dx * step
+        y += dy * step
+
+    def bounds(self, alpha=None):
+        """Arrays (esquerda, topo, direita, base) das hitboxes; com alpha, interpoladas desde a posição anterior."""
+        n = self.count
+        type_id = self.type_id[:n]
+        half_w = self.type_half_width[type_id]
+        half_h = self.type_half_height[type_id]
+        x, y = self.x[:n], self.y[:n]
+        if alpha is not None:
+            prev_x, prev_y = self.prev_x[:n], self.prev_y[:n]
+            x = prev_x + (x - prev_x) * alpha
+            y = prev_y + (y - prev_y) * alpha
+        return x - half_w, y - half_h, x + half_w, y + half_h
+
+    def visible(self, view, bounds):
+        """Linhas dos inimigos cuja caixa em `bounds` (de bounds()) toca a visão (esquerda, topo, direita, base)."""
+        left, top, right, bottom = view
+        e_left, e_top, e_right, e_bottom = bounds
+        return np.flatnonzero((e_right > left) & (e_bottom > top) & (e_left < right) & (e_top < bottom))
+
+    def overlapping(self, rect):
+        """Máscara dos inimigos cuja hitbox toca o retângulo, como Actor.colliderect."""
+        left, top, right, bottom = self.bounds()
+        return (left < rect.right) & (top < rect.bottom) & (right > rect.left) & (bottom > rect.top)
+
+    def in_ring(self, center, radius, reach, angle, count):
+        """
+        Máscara dos inimigos tocados por alguma das `count` lâminas (círculos de raio `reach`)
+        espaçadas no círculo de `radius` em volta de `center`, a primeira em `angle` radianos.
+        """
+        n = self.count
+        touched = np.zeros(n, dtype=np.bool_)
+        if n == 0 or count < 1:
+            return touched
+        cx, cy = center
+        dx = self.x[:n] - cx
+        dy = self.y[:n] - cy
+        distance = np.hypot(dx, dy)
+        touch = reach + self.type_radius[self.type_id[:n]]
+        near = np.flatnonzero(np.abs(distance - radius) < touch)
+        if not len(near):
+            return touched
+        spacing = 2 * math.pi / count
+        offset = (np.arctan2(dy[near], dx[near]) - angle) % spacing
+        offset = np.minimum(offset, spacing - offset) # Ângulo até a lâmina mais próxima
+        d = distance[near]
+        # Lei dos cossenos: distância ao quadrado até o centro dessa lâmina
+        gap = radius * radius + d * d - 2 * radius * d * np.cos(offset)
+        touched[near] = gap < touch[near] ** 2
+        return touched
+
+    def collides(self, i, rect):
+        """Teste exato da hitbox de um inimigo, como Actor.colliderect."""
+        type_id = self.type_id[i]
+        half_w = self.type_half_width[type_id]
+        half_h = self.type_half_height[type_id]
+        x, y = self.x[i], self.y[i]
+        return (x - half_w < rect.right and y - half_h < rect.bottom and
+                x + half_w > rect.left and y + half_h > rect.top)
+
+    def take_damage(self, i, amount):
+        """Tira vida do inimigo i; retorna True se ele morreu."""
+        self.health[i] -= amount
+        return self.health[i] <= 0
+
+    def pos(self, i):
+        """Posição do inimigo i como tupla (x, y)."""
+        return float(self.x[i]), float(self.y[i])
+
+    def kill(self, i):
+        """Marca o inimigo i para remoção; False se já estava marcado."""
+        if self.dead[i]:
+            return False
+        self.dead[i] = True
+        return True
+
+    def index_of(self, handle):
+        """Linha atual do inimigo vivo com este handle, ou None."""
+        # Os handles crescem na ordem de spawn e sweep() a mantém: a coluna está ordenada
+        n = self.count
+        i = int(np.searchsorted(self.handle[:n], handle))
+        if i < n and self.handle[i] == handle and not self.dead[i]:
+            return i
+        return None
+
+    def sweep(self):
+        """Remove as linhas marcadas numa compactação só, mantendo a ordem de spawn."""
+        n = self.count
+        keep = ~self.dead[:n]
+        kept = int(keep.sum())
+        if kept == n:
+            return
+        for name, _ in self.FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.count = kept
+
+    def extract(self, mask):
+        """Tira as linhas onde `mask` é True e as retorna em colunas (cópias); o resto é compactado."""
+        n = self.count
+        taken = {name: getattr(self, name)[:n][mask] for name, _ in self.FIELDS}
+        keep = ~mask
+        kept = int(keep.sum())
+        for name, _ in self.FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.count = kept
+        return taken
+
+    def insert(self, columns):
+        """Devolve linhas tiradas por extract(), na ordem dos handles e paradas (posição anterior = atual)."""
+        added = len(columns["handle"])
+        if not added:
+            return
+        n = self.count
+        total = n + added
+        if total > self.capacity:
+            self._allocate(max(total, self.capacity * 2))
+        for name, _ in self.FIELDS:
+            getattr(self, name)[n:total] = columns[name]
+        self.prev_x[n:total] = self.x[n:total]
+        self.prev_y[n:total] = self.y[n:total]
+        order = np.argsort(self.handle[:total], kind="stable")
+        for name, _ in self.FIELDS:
+            array = getattr(self, name)
+            array[:total] = array[:total][order]
+        self.count = total
+        self.peak_live = max(self.peak_live, total)
+
+    def columns(self):
+        """Os arrays cortados nas linhas em uso (views, não cópias), por nome de campo."""
+        n = self.count
+        return {name: getattr(self, name)[:n] for name, _ in self.FIELDS}
+
+    def load_columns(self, columns, next_handle=None):
+        """
+        Troca todos os inimigos pelas linhas de `columns` (como as de columns()). Os próximos
+        handles começam em `next_handle` ou, sem ele, depois do maior handle carregado.
+        """
+        n = len(next(iter(columns.values()))) if columns else 0
+        self.count = 0
+        if n > self.capacity:
+            self._allocate(n)
+        for name, dtype in self.FIELDS:
+            array = getattr(self, name)
+            array[:n] = columns[name] if name in columns else 0
+        if "handle" not in columns:
+            self.handle[:n] = np.arange(1, n + 1)
+        self.count = n
+        self.peak_live = max(self.peak_live, n)
+        if next_handle is None:
+            next_handle = int(self.handle[:n].max()) + 1 if n else 1
+        self.next_handle = next_handle
+
+    @property
+    def hit_rate(self):
+        """Fração dos spawns que couberam nas linhas já alocadas."""
+        return self.reused / self.acquired if self.acquired else 0.0
+
+    def stats(self):
+        """Cópia dos contadores, com as chaves de Pool.stats()."""
+        return {
+            "acquired": self.acquired,
+            "reused": self.reused,
+            "hit_rate": self.hit_rate,
+            "live": self.count,
+            "peak_live": self.peak_live,
+        }
+
+    def frames(self, time, rows):
+        """Frame de animação dos inimigos em `rows` no tempo `time`, com a fase de cada um tirada do handle."""
+        type_id = self.type_id[rows]
+        duration = self.type_animation_speed[type_id]
+        count = self.type_frame_count[type_id]
+        # Frações áureas dos handles espalham as fases pelo ciclo
+        phase = (self.handle[rows] * 0.6180339887498949) % 1.0 * duration * count
+        return ((time + phase) // duration).astype(np.intp) % count
+
+    def image(self, i, time):
+        """Nome do frame com que o inimigo i é desenhado no tempo `time`."""
+        right_frames, left_frames = self.type_frames[self.type_id[i]]
+        frames = right_frames if self.facing_right[i] else left_frames
+        return frames[int(self.frames(time, [i])[0])]
+
+    def frame_ids(self, time, rows):
+        """Índice em `frame_names` do frame atual dos inimigos em `rows`."""
+        return self.frame_table[self.type_id[rows], self.facing_right[rows].astype(np.intp), self.frames(time, rows)]
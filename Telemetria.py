@@ -0,0 +1,147 @@
+import bisect
+import time
+import uuid
+
+# --- TELEMETRIA ---
+# Faixas do histograma de tempo de frame, em ms: a faixa 0 conta os frames abaixo
+# do primeiro limite, a faixa i os entre LIMITES_FRAME_MS[i-1] e LIMITES_FRAME_MS[i],
+# e a última os acima do maior.
+LIMITES_FRAME_MS = (4, 8, 12, 16.7, 25, 33.3, 50, 100)
+# Contagens de entidades resumidas (média e máximo) em cada minuto
+ENTIDADES = ("inimigos", "congelados", "projeteis", "gemas")
+
+
+def _contagens(mundo):
+    return len(mundo.inimigos), len(mundo.congelados), len(mundo.projeteis), len(mundo.gemas_experiencia)
+
+
+class Telemetria:
+    """
+    Estatísticas das partidas (abates, níveis, melhorias, dano, entidades e tempos de frame),
+    somadas em memória a cada frame e gravadas pelo `escritor` a cada minuto e no fim da partida.
+    """
+    def __init__(self, escritor, limites_frame_ms=LIMITES_FRAME_MS, relogio=time.time):
+        self.escritor = escritor
+        self.limites = limites_frame_ms
+        self.relogio = relogio
+        self.partida = None # Id da partida em andamento, ou None
+
+    def iniciar(self, mundo, origem="nova"):
+        """
+        Começa a acompanhar a partida do Mundo (uma nova, um estado carregado ou
+        o resto de uma reprodução, conforme `origem`); uma partida ainda aberta
+        é encerrada antes. Abates e dano contam a partir daqui.
+        """
+        if self.escritor is None:
+            return
+        if self.partida is not None:
+            self.encerrar(mundo, "reiniciada")
+        jogador = mundo.jogador
+        self.partida = uuid.uuid4().hex
+        self.origem = origem
+        self.inicio = mundo.tempo_decorrido
+        self.abates_inicio = jogador.enemies_killed
+        self.dano_inicio = jogador.damage_taken
+        self.nivel = jogador.level
+        self.niveis = [[round(mundo.tempo_decorrido, 2), jogador.level]]
+        self.melhorias = []
+        self.frames = [0] * (len(self.limites) + 1)
+        self.frames_ms = 0.0
+        self.frame_max_ms = 0.0
+        self._novo_minuto(mundo, int(mundo.tempo_decorrido // 60))
+        self.escritor.write({
+            "tipo": "partida_inicio", "partida": self.partida, "ts": self.relogio(), "origem": origem,
+            "semente": mundo.semente, "mundo": [mundo.largura, mundo.altura], "tempo": round(mundo.tempo_decorrido, 3),
+            "limites_frame_ms": list(self.limites),
+        })
+
+    def _novo_minuto(self, mundo, minuto):
+        jogador = mundo.jogador
+        self.minuto = minuto
+        self.minuto_abates = jogador.enemies_killed
+        self.minuto_dano = jogador.damage_taken
+        self.minuto_frames = [0] * (len(self.limites) + 1)
+        self.minuto_ms = 0.0
+        self.minuto_max_ms = 0.0
+        self.soma_entidades = [0] * len(ENTIDADES)
+        self.max_entidades = [0] * len(ENTIDADES)
+
+    def observar(self, mundo, frame_ms):
+        """Soma um frame de jogo que levou `frame_ms`; fecha o minuto quando o tempo de jogo passa dele."""
+        if self.partida is None:
+            return
+        minuto = int(mundo.tempo_decorrido // 60)
+        if minuto != self.minuto:
+            self._fechar_minuto(mundo)
+            self._novo_minuto(mundo, minuto)
+
+        faixa = bisect.bisect_right(self.limites, frame_ms)
+        self.minuto_frames[faixa] += 1
+        self.minuto_ms += frame_ms
+        if frame_ms > self.minuto_max_ms:
+            self.minuto_max_ms = frame_ms
+        for i, quantidade in enumerate(_contagens(mundo)):
+            self.soma_entidades[i] += quantidade
+            if quantidade > self.max_entidades[i]:
+                self.max_entidades[i] = quantidade
+        self._anotar_nivel(mundo)
+
+    def _anotar_nivel(self, mundo):
+        nivel = mundo.jogador.level
+        if nivel != self.nivel:
+            self.nivel = nivel
+            self.niveis.append([round(mundo.tempo_decorrido, 2), nivel])
+
+    def melhoria(self, mundo, item):
+        """Anota a melhoria que o Mundo aplicou (um Itens.Item) e quando."""
+        if self.partida is not None:
+            self._anotar_nivel(mundo) # A escolha vem na pausa do nível novo, antes do próximo observar()
+            self.melhorias.append([round(mundo.tempo_decorrido, 2), type(item).__name__])
+
+    def _fechar_minuto(self, mundo):
+        """Entrega o registro do minuto atual (se teve frames) e soma os frames dele aos da partida."""
+        quadros = sum(self.minuto_frames)
+        if not quadros:
+            return
+        jogador = mundo.jogador
+        for faixa, quantidade in enumerate(self.minuto_frames):
+            self.frames[faixa] += quantidade
+        self.frames_ms += self.minuto_ms
+        self.frame_max_ms = max(self.frame_max_ms, self.minuto_max_ms)
+        self.escritor.write({
+            "tipo": "minuto", "partida": self.partida, "ts": self.relogio(), "minuto": self.minuto,
+            "tempo": round(mundo.tempo_decorrido, 3), "nivel": jogador.level,
+            "abates": jogador.enemies_killed - self.minuto_abates,
+            "dano_recebido": round(jogador.damage_taken - self.minuto_dano, 3),
+            "frames": quadros, "frame_ms": {
+                "media": round(self.minuto_ms / quadros, 3), "max": round(self.minuto_max_ms, 3),
+                "histograma": self.minuto_frames,
+            },
+            "entidades": {nome: {"media": round(soma / quadros, 1), "max": maximo}
+                          for nome, soma, maximo in zip(ENTIDADES, self.soma_entidades, self.max_entidades)},
+        })
+
+    def encerrar(self, mundo, motivo):
+        """
+        Fecha o minuto em andamento, entrega o resumo da partida (`motivo`: fim
+        de jogo, saída, ...) e pede ao escritor que grave tudo no disco.
+        """
+        if self.partida is None:
+            return
+        self._fechar_minuto(mundo)
+        jogador = mundo.jogador
+        quadros = sum(self.frames)
+        self.escritor.write({
+            "tipo": "partida", "partida": self.partida, "ts": self.relogio(), "motivo": motivo, "origem": self.origem,
+            "semente": mundo.semente, "tempo": round(mundo.tempo_decorrido, 3),
+            "duracao": round(mundo.tempo_decorrido - self.inicio, 3), "nivel": jogador.level,
+            "abates": jogador.enemies_killed - self.abates_inicio,
+            "dano_recebido": round(jogador.damage_taken - self.dano_inicio, 3),
+            "niveis": self.niveis, "melhorias": self.melhorias, "frames": quadros, "frame_ms": {
+                "media": round(self.frames_ms / quadros, 3) if quadros else None, "max": round(self.frame_max_ms, 3),
+                "histograma": self.frames,
+            },
+            "registros_descartados": self.escritor.dropped,
+        })
+        self.escritor.flush()
+        self.partida = None
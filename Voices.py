@@ -0,0 +1,81 @@
+import time
+import pygame
+
+
+class SoundRule:
+    """Limite de um som: até max_per_frame vozes por frame, com min_interval segundos entre elas."""
+    def __init__(self, max_per_frame=1, min_interval=0.0, priority=False):
+        self.max_per_frame = max_per_frame
+        self.min_interval = min_interval
+        self.priority = priority # Sons prioritários têm canal reservado e nunca são descartados
+
+
+# Regras dos eventos de som do Mundo (nome do evento == nome do arquivo)
+SOUND_RULES = {
+    "game_over": SoundRule(priority=True),
+    "level_up": SoundRule(priority=True),
+    "hit": SoundRule(max_per_frame=1, min_interval=0.05),
+    "collect": SoundRule(max_per_frame=1, min_interval=0.04),
+    "shoot": SoundRule(max_per_frame=2, min_interval=0.03),
+}
+DEFAULT_RULE = SoundRule()
+
+
+class VoiceManager:
+    """Junta os sons pedidos num frame e toca em flush() só o que a SoundRule de cada um permite."""
+    def __init__(self, load, rules=SOUND_RULES, channels=16, clock=time.perf_counter):
+        self.load = load # nome -> pygame.mixer.Sound
+        self.rules = rules
+        self.clock = clock
+        self.pending = {} # nome -> pedidos neste frame, na ordem do primeiro pedido
+        self.last_played = {}
+
+        priority = [name for name, rule in rules.items() if rule.priority]
+        pygame.mixer.set_num_channels(max(channels, len(priority) + 1))
+        pygame.mixer.set_reserved(len(priority)) # find_channel() nunca devolve estes
+        self.reserved = {name: pygame.mixer.Channel(i) for i, name in enumerate(priority)}
+
+        # Contadores, por nome de som
+        self.requested = {}
+        self.played = {}
+        self.suppressed = {}
+
+    def queue(self, name):
+        """Pede um som para o próximo flush()."""
+        self.pending[name] = self.pending.get(name, 0) + 1
+        self.requested[name] = self.requested.get(name, 0) + 1
+
+    def flush(self):
+        """Toca o que os pedidos do frame permitem e descarta o resto (sem canal livre, o som não toca)."""
+        if not self.pending:
+            return
+        now = self.clock()
+        for name, count in self.pending.items():
+            rule = self.rules.get(name, DEFAULT_RULE)
+            played = 0
+            if rule.priority:
+                self.reserved[name].play(self.load(name))
+                played = 1
+            elif now - self.last_played.get(name, float("-inf")) >= rule.min_interval:
+                sound = self.load(name)
+                for _ in range(min(count, rule.max_per_frame)):
+                    channel = pygame.mixer.find_channel()
+                    if channel is None:
+                        break
+                    channel.play(sound)
+                    played += 1
+            if played:
+                self.last_played[name] = now
+            self.played[name] = self.played.get(name, 0) + played
+            self.suppressed[name] = self.suppressed.get(name, 0) + count - played
+        self.pending.clear()
+
+    def clear(self):
+        """Esquece os pedidos do frame sem tocá-los."""
+        self.pending.clear()
+
+    def stats(self):
+        """{nome: {"requested", "played", "suppressed"}} de cada som já pedido."""
+        return {name: {"requested": requested, "played": self.played.get(name, 0),
+                       "suppressed": self.suppressed.get(name, 0)}
+                for name, requested in self.requested.items()}
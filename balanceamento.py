@@ -0,0 +1,216 @@
+"""
+Varredura de balanceamento do Cyber-Duck por Monte Carlo.
+
+Joga milhares de partidas headless com semente fixa, controladas por um bot
+(foge dos inimigos próximos, busca as gemas e atira no mais perto), variando
+a política de escolha de melhorias, e resume por política o tempo de
+sobrevivência, os abates e a distribuição de níveis. As partidas rodam em paralelo num
+ProcessPoolExecutor (uma por tarefa, sem estado compartilhado, então escala
+com o número de núcleos) e cada resultado é gravado numa linha do arquivo JSONL
+assim que termina: rodar de novo com o mesmo arquivo pula o que já foi feito
+com as mesmas regras (cada linha leva o hash delas, veja versao_regras()).
+
+Uso:
+    python balanceamento.py --partidas 500                     # todas as políticas
+    python balanceamento.py --politicas dano orbital --partidas 2000 --processos 8
+    python balanceamento.py --resumo balanceamento.jsonl       # só o relatório
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from Enemy import ENEMY_TYPES
+from Gravacao import VERSAO
+from Mundo import EstadoJogo, Comandos
+from Ondas import ONDAS, LIMITE_INIMIGOS, FUNDIR_ELITES
+from Itens import (ProjectileDamageUpgrade, ProjectilePierceUpgrade, MultiShotUpgrade, MovementSpeedUpgrade,
+                   MaxHealthUpgrade, HealthPotion, OrbitalWeaponUnlock, OrbitalDamageUpgrade, OrbitalSpeedUpgrade,
+                   OrbitalBladeUpgrade, UPGRADES)
+from Player import BASE_STATS
+from simular import simular
+
+# Preferência de cada política, da melhoria mais desejada para a menos; opções
+# fora da lista (ou a política "aleatoria") são escolhidas ao acaso.
+POLITICAS = {
+    "aleatoria": (),
+    "dano": (ProjectileDamageUpgrade, OrbitalDamageUpgrade, OrbitalWeaponUnlock),
+    "projeteis": (MultiShotUpgrade, ProjectilePierceUpgrade, ProjectileDamageUpgrade),
+    "orbital": (OrbitalWeaponUnlock, OrbitalBladeUpgrade, OrbitalDamageUpgrade, OrbitalSpeedUpgrade),
+    "vida": (MaxHealthUpgrade, HealthPotion),
+    "velocidade": (MovementSpeedUpgrade, MaxHealthUpgrade),
+}
+
+RAIO_FUGA = 220 # Inimigos mais perto que isso empurram o bot para longe
+ATRACAO_GEMA = 1.5 # Força com que a gema mais próxima puxa o bot (sem ela ninguém sobe de nível)
+INTERVALO_TIRO = 24 # Ticks entre disparos (5 por segundo a 120 Hz, como um jogador clicando)
+
+
+def versao_regras():
+    """Hash curto das regras de jogo: atributos base, inimigos, ondas, melhorias e a versão da simulação."""
+    regras = (VERSAO, sorted(BASE_STATS.items()), ONDAS, LIMITE_INIMIGOS, FUNDIR_ELITES,
+              [(tipo.__name__, tipo.SPEED_RANGE, tipo.DAMAGE, tipo.MAX_HEALTH, tipo.XP_VALUE, tipo.MERGED)
+               for tipo in ENEMY_TYPES],
+              [(type(melhoria).__name__, melhoria.weight, getattr(melhoria, "stat", None), getattr(melhoria, "flat", 0),
+                getattr(melhoria, "percent", 0)) for melhoria in UPGRADES.upgrades])
+    return hashlib.sha256(repr(regras).encode()).hexdigest()[:12]
+
+
+def escolher_melhoria(opcoes, preferencias, rng):
+    """Índice da opção preferida pela política, ou um índice ao acaso se nenhuma estiver na lista."""
+    for classe in preferencias:
+        for indice, opcao in enumerate(opcoes):
+            if isinstance(opcao, classe):
+                return indice
+    return rng.randrange(len(opcoes))
+
+
+def criar_bot(politica, semente):
+    """Bot que foge dos inimigos próximos, vai atrás das gemas, atira no inimigo mais perto e escolhe melhorias pela política."""
+    preferencias = POLITICAS[politica]
+    rng = random.Random(semente)
+
+    def bot(mundo, tick):
+        if mundo.estado == EstadoJogo.ESCOLHA_MELHORIA:
+            return Comandos(escolha_melhoria=escolher_melhoria(mundo.opcoes_melhoria, preferencias, rng))
+
+        x, y = mundo.jogador.hitbox.pos
+        # Puxão para o centro da tela, para não ficar preso num canto
+        fuga_x = (mundo.largura / 2 - x) / mundo.largura
+        fuga_y = (mundo.altura / 2 - y) / mundo.altura
+        gemas = [gema.hitbox.pos for gema in mundo.gemas_experiencia if not gema.dead]
+        if gemas:
+            gx, gy = min(gemas, key=lambda pos: (pos[0] - x) ** 2 + (pos[1] - y) ** 2)
+            distancia = max(((gx - x) ** 2 + (gy - y) ** 2) ** 0.5, 1.0)
+            fuga_x += ATRACAO_GEMA * (gx - x) / distancia
+            fuga_y += ATRACAO_GEMA * (gy - y) / distancia
+        disparos = ()
+        inimigos = mundo.inimigos
+        n = len(inimigos)
+        if n:
+            dx = x - inimigos.x[:n]
+            dy = y - inimigos.y[:n]
+            dist2 = dx * dx + dy * dy
+            perto = dist2 < RAIO_FUGA * RAIO_FUGA
+            if perto.any():
+                # Cada inimigo próximo empurra com força proporcional a 1/distância
+                peso = RAIO_FUGA / np.maximum(dist2[perto], 1.0)
+                fuga_x += float((dx[perto] * peso).sum())
+                fuga_y += float((dy[perto] * peso).sum())
+            if tick % INTERVALO_TIRO == 0:
+                disparos = (inimigos.pos(int(np.argmin(dist2))),)
+
+        limiar = 0.1
+        return Comandos(esquerda=fuga_x < -limiar, direita=fuga_x > limiar,
+                        cima=fuga_y < -limiar, baixo=fuga_y > limiar, disparos=disparos)
+
+    return bot
+
+
+def jogar(politica, semente, segundos):
+    """Uma partida completa; roda dentro de um processo do pool e devolve um dict serializável."""
+    mundo, ticks = simular(segundos, semente=semente, bot=criar_bot(politica, semente))
+    jogador = mundo.jogador
+    return {
+        "politica": politica,
+        "semente": semente,
+        "segundos_max": segundos,
+        "regras": versao_regras(),
+        "sobrevivencia_s": round(mundo.tempo_decorrido, 3),
+        "vivo": mundo.estado != EstadoJogo.FIM_DE_JOGO,
+        "abates": jogador.enemies_killed,
+        "nivel": jogador.level,
+        "ticks": ticks,
+    }
+
+
+def carregar(caminho):
+    """Resultados já gravados no arquivo (linhas incompletas de uma interrupção são ignoradas)."""
+    resultados = []
+    if os.path.exists(caminho):
+        with open(caminho) as f:
+            for linha in f:
+                try:
+                    resultados.append(json.loads(linha))
+                except json.JSONDecodeError:
+                    pass
+    return resultados
+
+
+def varrer(politicas, sementes, segundos, caminho, processos=None):
+    """Joga cada (política, semente) que ainda não está no arquivo com estas regras, gravando cada resultado ao terminar."""
+    regras = versao_regras()
+    # Linhas de antes de uma mudança de balanceamento (ou sem o hash) não contam como feitas
+    feitos = {(r["politica"], r["semente"]) for r in carregar(caminho)
+              if r["segundos_max"] == segundos and r.get("regras") == regras}
+    tarefas = [(p, s) for p in politicas for s in sementes if (p, s) not in feitos]
+    if not tarefas:
+        print(f"Nada a fazer: {len(feitos)} partidas já estão em {caminho}")
+        return
+
+    print(f"{len(tarefas)} partidas a jogar ({len(feitos)} já feitas) em {processos or os.cpu_count()} processos")
+    inicio = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=processos)
+    try:
+        with open(caminho, "a") as saida:
+            futuros = [executor.submit(jogar, politica, semente, segundos) for politica, semente in tarefas]
+            for concluidas, futuro in enumerate(as_completed(futuros), 1):
+                saida.write(json.dumps(futuro.result()) + "\n")
+                saida.flush()
+                if concluidas % 50 == 0 or concluidas == len(tarefas):
+                    decorrido = time.perf_counter() - inicio
+                    print(f"  {concluidas}/{len(tarefas)} partidas em {decorrido:.1f}s ({concluidas / decorrido:.1f} partidas/s)")
+    finally:
+        # Num Ctrl+C, descarta as partidas que nem começaram em vez de esperar por todas
+        executor.shutdown(cancel_futures=True)
+
+
+def resumir(resultados):
+    """Imprime, por política, sobrevivência (média e percentis), abates e distribuição de níveis."""
+    por_politica = {}
+    for r in resultados:
+        por_politica.setdefault(r["politica"], []).append(r)
+
+    for politica, partidas in sorted(por_politica.items()):
+        sobrevivencia = np.array([r["sobrevivencia_s"] for r in partidas])
+        abates = np.array([r["abates"] for r in partidas])
+        vivos = sum(r["vivo"] for r in partidas)
+        niveis = Counter(r["nivel"] for r in partidas)
+        p10, p50, p90 = np.percentile(sobrevivencia, (10, 50, 90))
+        print(f"{politica} ({len(partidas)} partidas, {vivos} vivas no fim)")
+        print(f"  sobrevivência: média {sobrevivencia.mean():.1f}s | p10 {p10:.1f}s | p50 {p50:.1f}s | p90 {p90:.1f}s")
+        print(f"  abates: média {abates.mean():.1f} | máx {abates.max()}")
+        print("  níveis: " + ", ".join(f"{nivel}: {quantidade}" for nivel, quantidade in sorted(niveis.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura de balanceamento do Cyber-Duck por Monte Carlo.")
+    parser.add_argument("--politicas", nargs="+", choices=sorted(POLITICAS), default=sorted(POLITICAS))
+    parser.add_argument("--partidas", type=int, default=200, help="partidas por política (sementes 0..N-1)")
+    parser.add_argument("--semente-inicial", type=int, default=0)
+    parser.add_argument("--segundos", type=float, default=600.0, help="duração máxima de cada partida")
+    parser.add_argument("--processos", type=int, default=None, help="processos em paralelo (padrão: núcleos da CPU)")
+    parser.add_argument("--saida", default="balanceamento.jsonl", help="arquivo JSONL de resultados (retomável)")
+    parser.add_argument("--resumo", metavar="ARQUIVO", help="só resume um arquivo de resultados existente")
+    args = parser.parse_args()
+
+    if args.resumo:
+        resumir(carregar(args.resumo))
+        return
+
+    sementes = range(args.semente_inicial, args.semente_inicial + args.partidas)
+    varrer(args.politicas, sementes, args.segundos, args.saida, args.processos)
+    regras = versao_regras()
+    resultados = [r for r in carregar(args.saida)
+                  if r["politica"] in args.politicas and r["semente"] in sementes and r["segundos_max"] == args.segundos
+                  and r.get("regras") == regras]
+    resumir(resultados)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+Benchmark de cenários de estresse do Cyber-Duck.
+
+Cada cenário monta um Mundo com semente fixa contendo N inimigos (70% lobos,
+30% morcegos), M projéteis em voo, K gemas no chão e a arma orbital ligada ou
+não, e mede por frame, separadamente, o tempo de atualização (movimento), de
+colisão e de desenho. As contagens são repostas entre frames (fora da medição)
+para que a carga fique constante. O resultado vai para um JSON que pode ser
+comparado entre commits.
+
+Uso:
+    python benchmark.py                          # varredura padrão
+    python benchmark.py --inimigos 100 10000 --projeteis 1000 --gemas 1000
+    python benchmark.py --comparar antes.json depois.json
+    python benchmark.py --inimigos 1000 100000 --mundo 24000x16000  # N inimigos espalhados num mundo grande
+    python benchmark.py --memoria 10000            # bytes por inimigo, projétil e gema (tracemalloc)
+    python benchmark.py --perseguicao 100 1000 10000  # perseguição direta, por campo de fluxo e por pares
+"""
+import argparse
+import gc
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from types import ModuleType
+
+import numpy as np
+from Enemy import Wolf, Bat
+from Mundo import Mundo, LARGURA, ALTURA
+from Swarm import EnemySwarm
+from FlowField import FlowField
+from simular import tamanho_mundo
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+ESCALAS = (10, 100, 1000, 10000)
+BASE = 100 # Valor dos outros eixos quando um eixo é varrido
+MARGEM_SPAWN = 200 # Inimigos também nascem um pouco fora da tela
+
+
+def carregar_frontend():
+    """
+    Carrega o main.py como o runner do pgzero faria, com drivers SDL "dummy"
+    (sem janela nem áudio), para medir o desenho real do jogo.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from pgzero.runner import prepare_mod
+    from pgzero.game import PGZeroGame
+
+    caminho = os.path.join(DIRETORIO, "main.py")
+    with open(caminho) as f:
+        codigo = compile(f.read(), caminho, "exec", dont_inherit=True)
+    mod = ModuleType("main")
+    mod.__file__ = caminho
+    sys.modules["main"] = mod
+    sys._pgzrun = True # Faz o pgzrun.go() do main.py retornar sem abrir o loop do jogo
+    prepare_mod(mod)
+    exec(codigo, mod.__dict__)
+    logging.getLogger().setLevel(logging.WARNING) # O main.py liga o log em INFO; o relatório fica só com os resultados
+    PGZeroGame(mod).reinit_screen()
+    mod.aguardar_recursos() # A folha de sprites vem da thread de carga do main.py
+    return mod
+
+
+class Cenario:
+    """Um ponto da varredura: quantidades de entidades e arma orbital ligada ou não."""
+    def __init__(self, inimigos, projeteis, gemas, orbital):
+        self.inimigos = inimigos
+        self.projeteis = projeteis
+        self.gemas = gemas
+        self.orbital = orbital
+
+    def chave(self):
+        return (self.inimigos, self.projeteis, self.gemas, self.orbital)
+
+    def __str__(self):
+        return f"N={self.inimigos} M={self.projeteis} K={self.gemas} orbital={'on' if self.orbital else 'off'}"
+
+
+def montar_mundo(cenario, semente, usar_broad_phase, mundo_grande=None):
+    """
+    Cria o Mundo do cenário; o jogador não morre para a carga não acabar no meio.
+    Com `mundo_grande` (largura, altura), a arena tem esse tamanho e a câmera, o da tela.
+    """
+    mundo = Mundo(*(mundo_grande or (LARGURA, ALTURA)), semente=semente, usar_broad_phase=usar_broad_phase,
+                  visao=(LARGURA, ALTURA))
+    jogador = mundo.jogador
+    jogador.max_health = jogador.health = float("inf")
+    if cenario.orbital:
+        jogador.activate_orbital_weapon()
+    return mundo
+
+
+def repor_entidades(mundo, cenario, rng):
+    """
+    Completa inimigos, projéteis e gemas até as quantidades do cenário. Os
+    inimigos se espalham pelo mundo todo (no mundo grande, os longe da câmera
+    contam mesmo congelados); projéteis e gemas ficam na tela.
+    """
+    while len(mundo.inimigos) + len(mundo.congelados) < cenario.inimigos:
+        pos = (rng.uniform(-MARGEM_SPAWN, mundo.largura + MARGEM_SPAWN), rng.uniform(-MARGEM_SPAWN, mundo.altura + MARGEM_SPAWN))
+        mundo.inimigos.spawn(Wolf if rng.random() < 0.7 else Bat, pos, rng)
+    esquerda, topo, direita, base = mundo.camera.rect
+    while len(mundo.projeteis) < cenario.projeteis:
+        origem = (rng.uniform(esquerda, direita), rng.uniform(topo, base))
+        alvo = (rng.uniform(esquerda, direita), rng.uniform(topo, base))
+        mundo.projeteis.fire(origem, alvo, mundo.jogador.projectile_base_damage)
+    while len(mundo.gemas_experiencia) < cenario.gemas:
+        mundo.soltar_gema((rng.uniform(esquerda, direita), rng.uniform(topo, base)))
+
+
+def resumo(amostras):
+    """Média, p95 e p99 (em ms) de uma lista de tempos em segundos."""
+    ms = np.asarray(amostras) * 1000
+    return {
+        "media_ms": round(float(ms.mean()), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+    }
+
+
+def medir(cenario, frames, semente, usar_broad_phase, frontend=None, dt=1 / 60, mundo_grande=None):
+    """Roda o cenário por `frames` frames e devolve os tempos de cada fase."""
+    rng = random.Random(semente)
+    tempos = {"update": [], "colisao": [], "desenho": []}
+    relogio = time.perf_counter
+
+    mundo = montar_mundo(cenario, semente, usar_broad_phase, mundo_grande)
+    for _ in range(frames):
+        repor_entidades(mundo, cenario, rng)
+
+        inicio = relogio()
+        mundo.tempo_decorrido += dt
+        mundo.mover(dt, (False, False, False, False))
+        meio = relogio()
+        mundo.resolver_colisoes()
+        fim = relogio()
+        tempos["update"].append(meio - inicio)
+        tempos["colisao"].append(fim - meio)
+
+        if frontend is not None:
+            frontend.mundo = mundo
+            inicio = relogio()
+            frontend.desenhar_jogando()
+            tempos["desenho"].append(relogio() - inicio)
+
+    resultado = {
+        "inimigos": cenario.inimigos,
+        "projeteis": cenario.projeteis,
+        "gemas": cenario.gemas,
+        "orbital": cenario.orbital,
+    }
+    for fase, amostras in tempos.items():
+        if amostras:
+            resultado[fase] = resumo(amostras)
+    return resultado
+
+
+def bytes_alocados(criar):
+    """Bytes que continuam alocados (segundo o tracemalloc) depois de chamar `criar`."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        criado = criar() # Mantido vivo até a segunda leitura
+        gc.collect()
+        depois = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return depois - antes
+
+
+def medir_memoria(quantidade, semente):
+    """
+    Bytes por entidade de cada representação, medidos pelo tracemalloc num Mundo vazio.
+    "inimigos (colunas)" é o tamanho exato de uma linha do EnemySwarm, sem a folga dos arrays.
+    """
+    rng = random.Random(semente)
+    posicoes = [(rng.uniform(0, LARGURA), rng.uniform(0, ALTURA)) for _ in range(quantidade)]
+    tipos = [Wolf if rng.random() < 0.7 else Bat for _ in range(quantidade)]
+
+    def criar_mundo():
+        return Mundo(LARGURA, ALTURA, semente=semente)
+
+    def inimigos(mundo):
+        for tipo, pos in zip(tipos, posicoes):
+            mundo.inimigos.spawn(tipo, pos, rng)
+
+    def projeteis(mundo):
+        alvo = (LARGURA / 2, ALTURA / 2)
+        for pos in posicoes:
+            mundo.projeteis.fire(pos, alvo, mundo.jogador.projectile_base_damage)
+
+    def gemas(mundo):
+        for pos in posicoes:
+            mundo.soltar_gema(pos)
+
+    resultado = {}
+    for nome, povoar in (("inimigos", inimigos), ("projeteis", projeteis), ("gemas", gemas)):
+        mundo = criar_mundo()
+        resultado[nome] = bytes_alocados(lambda: povoar(mundo)) / quantidade
+    resultado["inimigos (colunas)"] = sum(np.dtype(dtype).itemsize for _, dtype in EnemySwarm.FIELDS)
+    return {nome: round(valor, 1) for nome, valor in resultado.items()}
+
+
+def separacao_por_inimigo(alvo, x, y, raio=32.0, forca=0.3, bloco=512):
+    """
+    Referência sem campo de fluxo para a perseguição com separação: cada inimigo
+    mira o alvo e é empurrado por todo vizinho a menos de `raio`, comparando
+    todos os pares (em blocos de `bloco` linhas, para limitar a memória).
+    """
+    dx, dy = FlowField.pursue(alvo, x, y)
+    for inicio in range(0, len(x), bloco):
+        fim = inicio + bloco
+        ox = x[inicio:fim, np.newaxis] - x
+        oy = y[inicio:fim, np.newaxis] - y
+        perto = (ox * ox + oy * oy < raio * raio).astype(np.float64)
+        dx[inicio:fim] += forca * (perto * np.sign(ox)).sum(axis=1)
+        dy[inicio:fim] += forca * (perto * np.sign(oy)).sum(axis=1)
+    comprimento = np.hypot(dx, dy)
+    comprimento[comprimento == 0] = 1.0
+    return dx / comprimento, dy / comprimento
+
+
+def medir_perseguicao(quantidades, ticks, semente, max_pares=4000):
+    """
+    Custo por tick de guiar N inimigos até o jogador: direto, pelo campo de fluxo e pela
+    separação por inimigo (quadrática, só até `max_pares`), com o quanto a horda se espalhou.
+    """
+    alvo = (LARGURA / 2, ALTURA / 2)
+    resultados = []
+    for quantidade in quantidades:
+        rng = np.random.default_rng(semente)
+        inicio_x = rng.uniform(-MARGEM_SPAWN, LARGURA + MARGEM_SPAWN, quantidade)
+        inicio_y = rng.uniform(-MARGEM_SPAWN, ALTURA + MARGEM_SPAWN, quantidade)
+        campo = FlowField(LARGURA, ALTURA, min_agents=0)
+        metodos = {"direto": FlowField.pursue, "campo": campo.steer}
+        if quantidade <= max_pares:
+            metodos["separacao_por_inimigo"] = separacao_por_inimigo
+        resultado = {"inimigos": quantidade}
+        for nome, guiar in metodos.items():
+            x, y = inicio_x.copy(), inicio_y.copy()
+            tempos = []
+            for _ in range(ticks):
+                inicio = time.perf_counter()
+                dx, dy = guiar(alvo, x, y)
+                tempos.append(time.perf_counter() - inicio)
+                x += dx * 1.5
+                y += dy * 1.5
+            celulas = np.floor_divide(x, 16).astype(np.int64) * 100003 + np.floor_divide(y, 16).astype(np.int64)
+            resultado[nome] = dict(resumo(tempos), celula_mais_cheia=int(np.unique(celulas, return_counts=True)[1].max()))
+        resultados.append(resultado)
+    return resultados
+
+
+def cenarios_padrao(escalas, orbitais):
+    """Varre cada eixo (N, M, K) pelas escalas, com os outros dois no valor BASE."""
+    vistos = set()
+    for orbital in orbitais:
+        for eixo in range(3):
+            for escala in escalas:
+                valores = [BASE, BASE, BASE]
+                valores[eixo] = escala
+                cenario = Cenario(*valores, orbital)
+                if cenario.chave() not in vistos:
+                    vistos.add(cenario.chave())
+                    yield cenario
+
+
+def commit_atual():
+    """Hash curto do commit em que o benchmark roda, se estiver num repositório git."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=DIRETORIO,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(caminho_antes, caminho_depois):
+    """Mostra, para cada cenário presente nos dois arquivos, a razão depois/antes das médias."""
+    with open(caminho_antes) as f:
+        antes = json.load(f)
+    with open(caminho_depois) as f:
+        depois = json.load(f)
+    chave = lambda r: (r["inimigos"], r["projeteis"], r["gemas"], r["orbital"])
+    indice_antes = {chave(r): r for r in antes["cenarios"]}
+    print(f"{antes['meta'].get('commit')} -> {depois['meta'].get('commit')} (razão das médias; < 1 é mais rápido)")
+    memoria_antes = antes.get("memoria", {}).get("bytes_por_entidade", {})
+    for nome, bytes_depois in depois.get("memoria", {}).get("bytes_por_entidade", {}).items():
+        if memoria_antes.get(nome):
+            print(f"Memória de {nome}: {memoria_antes[nome]:.0f} -> {bytes_depois:.0f} bytes por entidade "
+                  f"({bytes_depois / memoria_antes[nome]:.2f}x)")
+    for r in depois["cenarios"]:
+        anterior = indice_antes.get(chave(r))
+        if anterior is None:
+            continue
+        partes = []
+        for fase in ("update", "colisao", "desenho"):
+            if fase in r and fase in anterior and anterior[fase]["media_ms"] > 0:
+                partes.append(f"{fase} {r[fase]['media_ms'] / anterior[fase]['media_ms']:.2f}x")
+        print(f"N={r['inimigos']} M={r['projeteis']} K={r['gemas']} orbital={'on' if r['orbital'] else 'off'}: " + ", ".join(partes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de cenários de estresse do Cyber-Duck.")
+    parser.add_argument("--inimigos", type=int, nargs="+", help="valores de N (com --projeteis/--gemas, faz o produto cartesiano)")
+    parser.add_argument("--projeteis", type=int, nargs="+", help="valores de M")
+    parser.add_argument("--gemas", type=int, nargs="+", help="valores de K")
+    parser.add_argument("--orbital", choices=("on", "off", "ambos"), default="ambos")
+    parser.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS), help="escalas da varredura padrão")
+    parser.add_argument("--frames", type=int, default=120, help="frames medidos por cenário")
+    parser.add_argument("--semente", type=int, default=1234)
+    parser.add_argument("--forca-bruta", action="store_true", help="desliga a broad-phase das colisões")
+    parser.add_argument("--mundo", type=tamanho_mundo, metavar="LARGURAxALTURA",
+                        help="arena maior que a tela, com câmera e chunks (padrão: a arena do tamanho da tela)")
+    parser.add_argument("--sem-desenho", action="store_true", help="não mede o desenho (não carrega pygame)")
+    parser.add_argument("--saida", help="arquivo JSON de resultados (padrão: benchmark-<commit>.json)")
+    parser.add_argument("--memoria", type=int, metavar="QUANTIDADE",
+                        help="em vez dos tempos, mede os bytes por entidade com QUANTIDADE de cada tipo")
+    parser.add_argument("--perseguicao", type=int, nargs="+", metavar="N",
+                        help="em vez dos cenários, mede a perseguição de N inimigos: direta, por campo de fluxo e "
+                             "por separação entre pares")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"), help="compara dois arquivos de resultados")
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+
+    if args.memoria:
+        memoria = medir_memoria(args.memoria, args.semente)
+        for nome, bytes_por_entidade in memoria.items():
+            print(f"{nome}: {bytes_por_entidade:.1f} bytes por entidade ({args.memoria} entidades)")
+        salvar_resultados(args, [], {"quantidade": args.memoria, "bytes_por_entidade": memoria})
+        return
+
+    if args.perseguicao:
+        perseguicao = medir_perseguicao(args.perseguicao, args.frames, args.semente)
+        for r in perseguicao:
+            print(f"N={r['inimigos']}: " + " | ".join(
+                f"{nome} {r[nome]['media_ms']:.3f} ms, célula mais cheia {r[nome]['celula_mais_cheia']}"
+                for nome in ("direto", "campo", "separacao_por_inimigo") if nome in r))
+        salvar_resultados(args, [], perseguicao=perseguicao)
+        return
+
+    orbitais = {"on": (True,), "off": (False,), "ambos": (False, True)}[args.orbital]
+    if args.inimigos or args.projeteis or args.gemas:
+        cenarios = [Cenario(n, m, k, o) for n, m, k, o in itertools.product(
+            args.inimigos or [BASE], args.projeteis or [BASE], args.gemas or [BASE], orbitais)]
+    else:
+        cenarios = list(cenarios_padrao(args.escalas, orbitais))
+
+    frontend = None if args.sem_desenho else carregar_frontend()
+
+    resultados = []
+    for cenario in cenarios:
+        resultado = medir(cenario, args.frames, args.semente, not args.forca_bruta, frontend, mundo_grande=args.mundo)
+        resultados.append(resultado)
+        fases = " | ".join(f"{fase} {resultado[fase]['media_ms']:.2f}/{resultado[fase]['p95_ms']:.2f}/{resultado[fase]['p99_ms']:.2f}"
+                           for fase in ("update", "colisao", "desenho") if fase in resultado)
+        print(f"{cenario}: {fases} ms (média/p95/p99)")
+    salvar_resultados(args, resultados)
+
+
+def salvar_resultados(args, resultados, memoria=None, perseguicao=None):
+    """Grava os cenários medidos (e as medidas de memória ou de perseguição, se houver) num JSON, com os dados da máquina."""
+    saida = {
+        "meta": {
+            "commit": commit_atual(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "frames": args.frames,
+            "semente": args.semente,
+            "broad_phase": not args.forca_bruta,
+            "mundo": "x".join(map(str, args.mundo or (LARGURA, ALTURA))),
+        },
+        "cenarios": resultados,
+    }
+    if memoria is not None:
+        saida["memoria"] = memoria
+    if perseguicao is not None:
+        saida["perseguicao"] = perseguicao
+    caminho_saida = args.saida or f"benchmark-{saida['meta']['commit'] or 'local'}.json"
+    with open(caminho_saida, "w") as f:
+        json.dump(saida, f, indent=2)
+    print(f"Resultados salvos em {caminho_saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,31 @@
 import pgzrun
-import math
-import random
+import argparse
+import atexit
+import io
+import logging
+import os
+import time
 from pygame.rect import Rect
-from Player import Player # Nome importado, mantido
-from Enemy import Wolf, Bat # Nomes importados, mantidos
-from Itens import get_upgrade_options # Nome importado, mantido
+from pgzero import loaders
+from Mundo import Mundo, EstadoJogo, Comandos, SEM_COMANDOS, PASSO_FIXO # Núcleo da simulação, sem pgzero
+from Ondas import LIMITE_INIMIGOS
+from Gravacao import Gravacao
+from Salvamento import salvar_estado, carregar_estado
+from Atlas import SpriteAtlas
+from Preloader import Preloader
+from Hud import Hud
+from Profiler import Profiler
+from FrameBudget import FrameBudget
+from Voices import VoiceManager
+from LogWriter import LogWriter
+from JsonlWriter import JsonlWriter
+from Telemetria import Telemetria
+import pygame
+
+# Início do relatório de inicialização (veja relatar_primeiro_frame). O relógio só começa depois dos
+# imports; o que eles e o interpretador custaram aparece como o tempo de CPU do processo até aqui
+inicio_programa = time.perf_counter()
+cpu_imports = time.process_time()
 
 # --- CONFIGURAÇÃO DA JANELA DO JOGO ---
 WIDTH = 1200
@@ -12,17 +33,9 @@ HEIGHT =  800
 TITLE = "Cyber-Duck" # Título do jogo, mantido
 
 
-class EstadoJogo:
-    MENU = 0
-    JOGANDO = 1
-    FIM_DE_JOGO = 2
-    ESCOLHA_MELHORIA = 3
-
-
 # --- CONFIGURAÇÃO INICIAL ---
 estado_jogo = EstadoJogo.MENU
 som_ligado = True
-tempo_decorrido = 0
 
 # --- CONFIGURAÇÃO DA INTERFACE DO USUÁRIO (UI) ---
 NUM_CORACOES_VIDA = 5
@@ -37,248 +50,627 @@ COR_TEXTO_BOTAO = (255, 255, 255)
 botao_jogar = Rect(WIDTH / 2 - 100, HEIGHT / 2, 200, 50)
 botao_som = Rect(WIDTH / 2 - 100, HEIGHT / 2 + 70, 200, 50)
 botao_sair = Rect(WIDTH / 2 - 100, HEIGHT / 2 + 140, 200, 50)
-
-# --- OBJETOS DO JOGO ---
-inimigos = []
-projeteis = []
-gemas_experiencia = []
-opcoes_melhoria = [] # Anteriormente level_up_options
 botoes_opcao = []
 
-
-# --- CONFIGURAÇÃO DO JOGADOR ---
-jogador = Player((WIDTH / 2, HEIGHT / 2)) # 'Player' é o nome da classe importada
+# --- DETECÇÃO DE COLISÃO (BROAD-PHASE) ---
+# Com True, as colisões passam por uma grade uniforme (spatial hash); com False,
+# volta ao teste força-bruta original, útil para comparar resultados e tempos.
+USAR_BROAD_PHASE = True
+
+# --- PERSEGUIÇÃO ---
+# Com True, a horda segue um campo de fluxo compartilhado que também espalha os
+# inimigos amontoados; com False, cada um mira direto no jogador (como antes).
+USAR_CAMPO_DE_FLUXO = True
+
+# --- REGISTRO (LOG) ---
+# Mensagens do jogo passam pelo `logging`: o frame só as enfileira e uma thread
+# do LogWriter escreve no stdout, então um terminal ou pipe lento não trava o jogo.
+# `python main.py --log DEBUG` mostra também os detalhes (curas, etc.); WARNING, só problemas.
+NIVEL_LOG = "INFO"
+log = logging.getLogger("main")
+
+# --- MUNDO ---
+# Tamanho da arena em pixels. Do tamanho da janela, é a arena clássica; maior (por
+# exemplo (WIDTH * 8, HEIGHT * 8)), a câmera segue o pato e só os inimigos perto da
+# tela são simulados: os outros ficam congelados em chunks até ela voltar (veja
+# Mundo.transmitir_chunks). No mundo grande o chão ganha uma grade, para o
+# movimento da câmera aparecer.
+TAMANHO_MUNDO = (WIDTH, HEIGHT)
+ESPACAMENTO_GRADE = 100
+COR_GRADE = (30, 30, 55)
+
+# --- SIMULAÇÃO ---
+# Toda a lógica do jogo vive no Mundo; este arquivo só traduz teclado/mouse em
+# Comandos, avança o Mundo a cada frame e desenha o estado dele.
+# F3 liga/desliga o perfilador de frames (tempos por fase, GC e entidades na tela);
+# F4 salva os últimos segundos medidos como um trace do Chrome (chrome://tracing).
+perfil = Profiler()
+mundo = Mundo(*TAMANHO_MUNDO, usar_broad_phase=USAR_BROAD_PHASE, perfil=perfil, usar_campo_de_fluxo=USAR_CAMPO_DE_FLUXO,
+              visao=(WIDTH, HEIGHT))
+# --- ORÇAMENTO DE FRAME ---
+# Com um valor em ms, o modo adaptativo mede cada frame (update + desenho); se o
+# p90 passar do orçamento, baixa o limite de inimigos vivos do Mundo (os lotes
+# passam a vir como elites, veja Ondas.py) e, com folga, deixa o limite voltar a
+# subir até Ondas.LIMITE_INIMIGOS. O limite vai ao Mundo pelos Comandos e entra na
+# gravação, então a reprodução continua idêntica. None desliga o modo adaptativo;
+# em máquinas fracas, um orçamento menor deixa margem para o resto do sistema.
+ORCAMENTO_FRAME_MS = 12.0
+LIMITE_MINIMO_INIMIGOS = 40 # O modo adaptativo nunca baixa o limite além disso
+orcamento = FrameBudget(ORCAMENTO_FRAME_MS, LIMITE_INIMIGOS, LIMITE_MINIMO_INIMIGOS) if ORCAMENTO_FRAME_MS else None
+limite_pendente = None # Limite decidido pelo orçamento, entregue ao Mundo no próximo update
+inicio_frame = None
+
+# --- TELEMETRIA ---
+# Cada partida jogada (não as reproduções) deixa em ARQUIVO_TELEMETRIA um registro
+# por minuto de jogo (abates, dano, entidades, histograma do tempo de frame) e um
+# resumo no fim (níveis, melhorias escolhidas, ...), em JSONL comprimido; veja
+# Telemetria.py. O frame só soma contadores: os registros são gravados por uma
+# thread, e um disco lento faz registros serem descartados, nunca o jogo travar.
+# Leia com `zcat telemetria.jsonl.gz`. None desliga.
+ARQUIVO_TELEMETRIA = "telemetria.jsonl.gz"
+telemetria = Telemetria(JsonlWriter(ARQUIVO_TELEMETRIA) if ARQUIVO_TELEMETRIA else None)
+
+# --- CARREGAMENTO ---
+# O menu só precisa de fontes e retângulos. A folha de sprites (imagens
+# decodificadas, giradas e empacotadas), os sons (já decodificados) e os bytes da
+# música são carregados por uma thread enquanto ele aparece, na ordem em que o
+# jogo vai precisar deles; o que for pedido antes de ficar pronto espera só por
+# aquele arquivo. Só a conversão da folha para o formato da tela fica na thread
+# principal, porque o pgzero recria a tela ao abrir a janela. Os tempos vão para
+# o log (INFO): do início do main.py ao primeiro frame do menu, do clique em Jogar
+# ao primeiro frame da partida e quanto a carga levou em segundo plano.
+DIRETORIO = loaders.root # A pasta do jogo, de onde o pgzero carrega sounds/ e music/ (o __file__ aqui é o do pgzero)
+ARQUIVO_MUSICA = os.path.join(DIRETORIO, "music", "background_music.mp3")
+
+def ler_arquivo(caminho):
+    """Conteúdo de um arquivo em memória, para o mixer abrir sem ir ao disco."""
+    with open(caminho, "rb") as f:
+        return io.BytesIO(f.read())
+
+def trabalhos_de_carga():
+    """Os (chave, função) que o carregador executa, na ordem em que o jogo precisa deles."""
+    trabalhos = [("atlas", lambda: SpriteAtlas(convert=False))]
+    diretorio_sons = os.path.join(DIRETORIO, "sounds")
+    for arquivo in sorted(os.listdir(diretorio_sons)):
+        nome, extensao = os.path.splitext(arquivo)
+        if extensao in (".ogg", ".wav"):
+            caminho = os.path.join(diretorio_sons, arquivo)
+            trabalhos.append((("som", nome), lambda caminho=caminho: pygame.mixer.Sound(caminho)))
+    trabalhos.append(("musica", lambda: ler_arquivo(ARQUIVO_MUSICA)))
+    return trabalhos
+
+recursos = Preloader(trabalhos_de_carga()).start()
+carga_relatada = False
+musica_carregada = False
+# (o que está sendo medido, instante de início) até o próximo frame desenhado, ou None
+primeiro_frame = ("menu", inicio_programa)
+
+# --- DESENHO ---
+# Todos os sprites ficam numa única folha já convertida para o formato da tela;
+# cada camada (jogador, gemas, inimigos, projéteis) vai para a tela num só blits().
+atlas = None # Vem do carregador (veja aguardar_recursos)
+areas_inimigos = []
+# Textos, corações e barra de XP são widgets em cache: só são refeitos quando o valor mostrado muda
+hud = Hud()
+# Mundo congelado + sobreposição escura, capturados uma vez quando a pausa de subir de nível começa
+fundo_pausa = None
+# Sobreposição do perfilador: widgets próprios, para não misturar com as estatísticas do HUD do jogo
+hud_perfil = Hud()
+INTERVALO_PERFIL = 0.25 # Segundos entre atualizações dos números da sobreposição
+linhas_perfil = []
+proxima_leitura_perfil = 0.0
+# Canto superior esquerdo da tela no mundo, no último desenho (a câmera no pato interpolado);
+# o desenho subtrai isto de cada posição e os cliques somam, para virarem alvos no mundo
+deslocamento = (0, 0)
+
+# --- SONS ---
+# Sons pedidos num frame tocam juntos no fim dele, sem repetições (veja Voices.py)
+vozes = VoiceManager(lambda nome: recursos.get(("som", nome)))
+
+disparos_pendentes = [] # Cliques de tiro recebidos desde o último update
+escolha_pendente = None # Índice da melhoria clicada, aplicada no próximo update
+
+# --- GRAVAÇÃO E REPRODUÇÃO ---
+# Toda partida é gravada (semente + comandos de cada tick, poucos bytes por segundo):
+# F5 salva a gravação da partida atual e o fim de jogo salva a última em ARQUIVO_ULTIMA_PARTIDA.
+# Com `python main.py --reproduzir ARQUIVO --tick N`, o jogo avança a gravação sem tela até o
+# tick N, abre a janela ali e toca o resto dela; quando acaba, o controle volta para o jogador.
+ARQUIVO_ULTIMA_PARTIDA = "ultima-partida.rep"
+# F6 salva o estado do mundo inteiro (`estado-<data>.sav`); `python main.py --carregar ARQUIVO`
+# continua a partida dali. Uma partida carregada não é gravada: a gravação começa no tick 0.
+reproducao = None # Iterador com os Comandos gravados que ainda faltam tocar, ou None
+gravacao_reproduzida = None # Passa a receber os comandos do jogador quando a reprodução acaba
 
 
 # --- FUNÇÃO PARA REINICIAR O JOGO ---
-def reiniciar_jogo():
-    """Reinicia todas as variáveis do jogo para o estado inicial."""
-    global jogador, inimigos, projeteis, gemas_experiencia, tempo_decorrido, estado_jogo
-
-    jogador = Player((WIDTH / 2, HEIGHT / 2))
-
-    # Limpa todas as listas de objetos do jogo
-    inimigos.clear()
-    projeteis.clear()
-    gemas_experiencia.clear()
-    opcoes_melhoria.clear()
+def reiniciar_jogo(semente=None):
+    """Reinicia todas as variáveis do jogo para o estado inicial e começa a gravar a nova partida."""
+    global escolha_pendente, fundo_pausa, limite_pendente, primeiro_frame
+
+    primeiro_frame = ("partida", time.perf_counter())
+    aguardar_recursos()
+    mundo.reiniciar(semente)
+    mundo.gravacao = Gravacao.do_mundo(mundo)
+    sincronizar_orcamento()
+    limite_pendente = None
+    disparos_pendentes.clear()
     botoes_opcao.clear()
-
-    tempo_decorrido = 0
-
-    clock.schedule_unique(gerar_inimigo, 2.0) # 'gerar_inimigo' é a função traduzida
+    escolha_pendente = None
+    fundo_pausa = None
 
     if som_ligado:
         try:
-            music.play("background_music") 
+            tocar_musica()
             music.set_volume(0.5)  # Ajusta o volume da música de fundo
         except Exception as e:
-            print(f"Erro ao tocar música de fundo: {e}")
+            log.warning("Erro ao tocar música de fundo: %s", e)
     else:
         music.set_volume(0)
-        
-        
+
+def tocar_musica():
+    """Toca a música de fundo em loop, aberta dos bytes que o carregador já leu (só na primeira vez)."""
+    global musica_carregada
+    if not musica_carregada:
+        pygame.mixer.music.load(recursos.get("musica"), "mp3")
+        musica_carregada = True
+    pygame.mixer.music.play(-1)
+
+def aguardar_recursos():
+    """Instala a folha de sprites do carregador, esperando por ela se ainda não ficou pronta."""
+    global atlas
+    if atlas is None:
+        atlas = recursos.get("atlas")
+        atlas.convert()
+        areas_inimigos[:] = [atlas.area(nome) for nome in mundo.inimigos.frame_names]
+
+def relatar_carga():
+    """Registra quanto a carga em segundo plano levou, no total e por tipo de arquivo."""
+    global carga_relatada
+    carga_relatada = True
+    tempos = recursos.timings
+    sons = [segundos for chave, segundos in tempos.items() if isinstance(chave, tuple)]
+    log.info("Recursos carregados em segundo plano em %.1f ms: folha de sprites %.1f ms, %s sons %.1f ms, música %.1f ms",
+             recursos.elapsed * 1000, tempos.get("atlas", 0) * 1000, len(sons), sum(sons) * 1000,
+             tempos.get("musica", 0) * 1000)
+
+def relatar_primeiro_frame():
+    """Registra o tempo até o frame que acabou de ser desenhado (o primeiro do menu ou da partida)."""
+    global primeiro_frame
+    medida, inicio = primeiro_frame
+    primeiro_frame = None
+    carregados, total = recursos.progress
+    log.info("Primeiro frame (%s) em %.1f ms; recursos carregados: %s de %s", medida,
+             (time.perf_counter() - inicio) * 1000, carregados, total)
+    if medida == "menu":
+        log.info("Imports antes do menu: %.1f ms de CPU", cpu_imports * 1000)
+
+
 def desenhar_menu():
     """Desenha a tela do menu principal."""
     screen.fill((10, 10, 30)) # 'screen' é um objeto global do Pygame Zero
-    screen.draw.text("Cyber-Duck", center=(WIDTH / 2, HEIGHT / 2 - 150), fontsize=80, color="cyan")
-    screen.draw.text("Data Survival", center=(WIDTH / 2, HEIGHT / 2 - 90), fontsize=50, color="yellow")
-
     screen.draw.filled_rect(botao_jogar, (0, 100, 150))
-    screen.draw.text("Jogar", center=botao_jogar.center, fontsize=40, color="white")
-
-    texto_som = "Sons: LIGADO" if som_ligado else "Sons: DESLIGADO"
     screen.draw.filled_rect(botao_som, (0, 100, 150))
-    screen.draw.text(texto_som, center=botao_som.center, fontsize=40, color="white")
-
     screen.draw.filled_rect(botao_sair, (150, 0, 0))
-    screen.draw.text("Sair", center=botao_sair.center, fontsize=40, color="white")
+
+    texto_som = "Sons: LIGADO" if som_ligado else "Sons: DESLIGADO"
+    screen.surface.blits([
+        hud.text("menu_titulo", "Cyber-Duck", 80, "cyan", center=(WIDTH / 2, HEIGHT / 2 - 150)),
+        hud.text("menu_subtitulo", "Data Survival", 50, "yellow", center=(WIDTH / 2, HEIGHT / 2 - 90)),
+        hud.text("menu_jogar", "Jogar", 40, center=botao_jogar.center),
+        hud.text("menu_som", texto_som, 40, center=botao_som.center),
+        hud.text("menu_sair", "Sair", 40, center=botao_sair.center),
+    ], doreturn=False)
+    if not recursos.done:
+        carregados, total = recursos.progress
+        screen.surface.blit(*hud.text("menu_carregando", f"Carregando... {carregados}/{total}", 24, "gray",
+                                      midbottom=(WIDTH / 2, HEIGHT - 20)))
+
+def entrada_hitbox(hitbox, pos=None):
+    """Entrada (folha, posição na tela, área) do blits() para o sprite de uma hitbox do Mundo, centrado em pos."""
+    x, y = pos or hitbox.pos
+    return atlas.entry(hitbox.image, (x - deslocamento[0], y - deslocamento[1]), hitbox.angle)
+
+def interpolar(anterior, atual, alfa):
+    """Ponto a uma fração alfa do caminho entre a posição do tick anterior e a atual."""
+    return anterior[0] + (atual[0] - anterior[0]) * alfa, anterior[1] + (atual[1] - anterior[1]) * alfa
+
+def entradas_inimigos(alfa):
+    """
+    Entradas do blits() dos inimigos visíveis, montadas a partir dos arrays do EnemySwarm.
+    Quem ainda está fora da tela (acabou de surgir) não é desenhado nem animado; o quadro
+    da animação de cada um sai do tempo da partida, o relógio de animação compartilhado.
+    """
+    inimigos = mundo.inimigos
+    limites = inimigos.bounds(alfa)
+    dx, dy = deslocamento
+    visiveis = inimigos.visible((dx, dy, dx + WIDTH, dy + HEIGHT), limites)
+    left, top = limites[0][visiveis] - dx, limites[1][visiveis] - dy
+    folha = atlas.sheet
+    quadros = inimigos.frame_ids(mundo.tempo_decorrido, visiveis)
+    return [(folha, pos, areas_inimigos[k]) for pos, k in zip(zip(left.tolist(), top.tolist()), quadros.tolist())]
+
+def entradas_projeteis(alfa):
+    """Entradas do blits() de todos os projéteis, montadas a partir dos arrays do BulletRing."""
+    projeteis = mundo.projeteis
+    linhas = projeteis.rows()
+    x, y = projeteis.centers(linhas, alfa)
+    return atlas.rotated_entries(projeteis.image, x - deslocamento[0], y - deslocamento[1], projeteis.angle[linhas])
+
+def gemas_visiveis():
+    """As gemas a desenhar: todas na arena clássica; no mundo grande, as das células da grade na tela."""
+    if mundo.camera.fixed:
+        return mundo.gemas_experiencia
+    tela = Rect(deslocamento[0], deslocamento[1], WIDTH, HEIGHT)
+    return sorted(mundo.grade_gemas.query(tela), key=lambda gema: gema.handle) # Ordem fixa, sem piscar
+
+def desenhar_grade():
+    """Linhas do chão do mundo grande, presas ao mundo, para a tela mostrar o movimento da câmera."""
+    dx, dy = deslocamento
+    for x in range(int(dx // ESPACAMENTO_GRADE + 1) * ESPACAMENTO_GRADE, int(dx) + WIDTH + 1, ESPACAMENTO_GRADE):
+        screen.draw.line((x - dx, 0), (x - dx, HEIGHT), COR_GRADE)
+    for y in range(int(dy // ESPACAMENTO_GRADE + 1) * ESPACAMENTO_GRADE, int(dy) + HEIGHT + 1, ESPACAMENTO_GRADE):
+        screen.draw.line((0, y - dy), (WIDTH, y - dy), COR_GRADE)
 
 def desenhar_jogando():
-    """Desenha todos os elementos para o estado principal de jogo."""
+    """
+    Desenha todos os elementos para o estado principal de jogo,
+    interpolados por mundo.alfa e deslocados pela câmera.
+    """
+    global deslocamento
+    jogador = mundo.jogador
+    alfa = mundo.alfa
+    pos_jogador = interpolar(jogador.previous_pos, jogador.hitbox.pos, alfa)
+    deslocamento = mundo.camera.view_at(*pos_jogador)
     screen.fill((20, 20, 40))
-
-    jogador.draw()
-    if jogador.orbital_weapon_active: # Assumindo que 'orbital_weapon_active' é um atributo da classe Player
-        jogador.draw_orbital_weapon() # Assumindo que 'draw_orbital_weapon' é um método da classe Player
-        
-    for gema in gemas_experiencia: gema.draw()
-    for inimigo_obj in inimigos: inimigo_obj.draw() # Renomeado 'enemy' para 'inimigo_obj' para evitar conflito com módulo Enemy
-    for projetil_obj in projeteis: projetil_obj.draw() # Renomeado 'projectile' para 'projetil_obj'
-
-    # --- ELEMENTOS DA UI ---
-    # Barra de Experiência
+    if not mundo.camera.fixed:
+        desenhar_grade()
+
+    superficie = screen.surface
+    with perfil.section("camada_jogador"):
+        camada_jogador = [entrada_hitbox(jogador.hitbox, pos_jogador)]
+        camada_jogador += [entrada_hitbox(lamina, interpolar(anterior, lamina.pos, alfa))
+                           for lamina, anterior in zip(jogador.orbital_hitboxes, jogador.orbital_previous_positions)]
+        superficie.blits(camada_jogador, doreturn=False)
+    with perfil.section("camada_gemas"):
+        superficie.blits([entrada_hitbox(gema.hitbox) for gema in gemas_visiveis()], doreturn=False)
+    with perfil.section("camada_inimigos"):
+        superficie.blits(entradas_inimigos(alfa), doreturn=False)
+    with perfil.section("camada_projeteis"):
+        superficie.blits(entradas_projeteis(alfa), doreturn=False)
+    with perfil.section("camada_hud"):
+        desenhar_hud()
+
+def desenhar_hud():
+    """Barra de XP, nível, tempo e corações, a partir dos widgets em cache."""
+    jogador = mundo.jogador
     largura_barra_xp = (jogador.experience / jogador.xp_to_next_level) * WIDTH if jogador.xp_to_next_level > 0 else 0
-    screen.draw.filled_rect(Rect((0, HEIGHT - 20), (WIDTH, 20)), (10, 10, 30))
-    screen.draw.filled_rect(Rect((0, HEIGHT - 20), (largura_barra_xp, 20)), (100, 200, 255))
-    screen.draw.text(f"Nível: {jogador.level}", (10, HEIGHT - 22), fontsize=20, color="white")
-
-    # Tempo Decorrido
-    minutos, segundos = divmod(int(tempo_decorrido), 60)
-    screen.draw.text(f"Tempo: {minutos:02d}:{segundos:02d}", topright=(WIDTH - 10, 10), fontsize=30, color="white")
-
-    # Vida do Jogador
+    minutos, segundos = divmod(int(mundo.tempo_decorrido), 60)
     vida_por_coracao = jogador.max_health / NUM_CORACOES_VIDA
+    coracoes_cheios = sum(jogador.health > i * vida_por_coracao for i in range(NUM_CORACOES_VIDA))
+
+    screen.surface.blits([
+        hud.widget("barra_xp", int(largura_barra_xp), construir_barra_xp), # Barra de Experiência
+        hud.text("nivel", f"Nível: {jogador.level}", 20, topleft=(10, HEIGHT - 22)),
+        hud.text("tempo", f"Tempo: {minutos:02d}:{segundos:02d}", 30, topright=(WIDTH - 10, 10)), # Tempo Decorrido
+        hud.widget("coracoes", coracoes_cheios, construir_coracoes), # Vida do Jogador
+    ], doreturn=False)
+
+def construir_barra_xp(largura_preenchida):
+    """Superfície da barra de experiência com `largura_preenchida` pixels cheios."""
+    barra = pygame.Surface((WIDTH, 20))
+    barra.fill((10, 10, 30))
+    barra.fill((100, 200, 255), Rect(0, 0, largura_preenchida, 20))
+    return barra, (0, HEIGHT - 20)
+
+def construir_coracoes(cheios):
+    """Superfície com a fileira de corações, os `cheios` primeiros cheios e o resto vazios."""
+    passo = WIDTH_IMAGEM_CORACAO + ESPACAMENTO_CORACAO
+    area_cheio, area_vazio = atlas.area("heart_full.png"), atlas.area("heart_empty.png") # Nomes dos arquivos de imagem mantidos
+    fileira = pygame.Surface((passo * (NUM_CORACOES_VIDA - 1) + area_cheio.width, area_cheio.height), pygame.SRCALPHA)
     for i in range(NUM_CORACOES_VIDA):
-        pos_x_coracao = 10 + i * (WIDTH_IMAGEM_CORACAO + ESPACAMENTO_CORACAO)
-        nome_imagem = "heart_full.png" if jogador.health > i * vida_por_coracao else "heart_empty.png" # Nomes dos arquivos de imagem mantidos
-        screen.blit(nome_imagem, (pos_x_coracao, 10))
+        fileira.blit(atlas.sheet, (i * passo, 0), area_cheio if i < cheios else area_vazio)
+    return fileira, (10, 10)
 
 def desenhar_fim_de_jogo():
     """Desenha a tela de fim de jogo."""
+    jogador = mundo.jogador
     screen.fill((30, 10, 10))
-    screen.draw.text("FIM DE JOGO", center=(WIDTH / 2, HEIGHT / 2 - 100), fontsize=90, color="red")
-    
-    minutos, segundos = divmod(int(tempo_decorrido), 60)
-    screen.draw.text(f"Tempo Sobrevivido: {minutos:02d}:{segundos:02d}", center=(WIDTH / 2, HEIGHT / 2), fontsize=40, color="white")
-    screen.draw.text(f"Inimigos Derrotados: {jogador.enemies_killed}", center=(WIDTH / 2, HEIGHT / 2 + 50), fontsize=40, color="white")
-    screen.draw.text(f"Nível Final: {jogador.level}", center=(WIDTH / 2, HEIGHT / 2 + 100), fontsize=40, color="white")
-    screen.draw.text("Clique para voltar ao menu", center=(WIDTH / 2, HEIGHT - 50), fontsize=30, color="yellow")
+    minutos, segundos = divmod(int(mundo.tempo_decorrido), 60)
+    screen.surface.blits([
+        hud.text("fim_titulo", "FIM DE JOGO", 90, "red", center=(WIDTH / 2, HEIGHT / 2 - 100)),
+        hud.text("fim_tempo", f"Tempo Sobrevivido: {minutos:02d}:{segundos:02d}", 40, center=(WIDTH / 2, HEIGHT / 2)),
+        hud.text("fim_abates", f"Inimigos Derrotados: {jogador.enemies_killed}", 40, center=(WIDTH / 2, HEIGHT / 2 + 50)),
+        hud.text("fim_nivel", f"Nível Final: {jogador.level}", 40, center=(WIDTH / 2, HEIGHT / 2 + 100)),
+        hud.text("fim_voltar", "Clique para voltar ao menu", 30, "yellow", center=(WIDTH / 2, HEIGHT - 50)),
+    ], doreturn=False)
 
 def desenhar_escolha_melhoria():
     """Desenha a tela de escolha de melhoria ao subir de nível."""
-    desenhar_jogando() # Desenha o estado de jogo pausado ao fundo
-    # Sobreposição escura
-    sobreposicao_escura = Rect(0, 0, WIDTH, HEIGHT)
-    screen.draw.filled_rect(sobreposicao_escura, (0, 0, 0, 150))
-    
-    screen.draw.text(f"SUBIU DE NÍVEL! (Nível {jogador.level})", center=(WIDTH / 2, HEIGHT / 4 - 30), fontsize=60, color="yellow", ocolor="black", owidth=1.5)
-    screen.draw.text("Escolha uma Melhoria:", center=(WIDTH / 2, HEIGHT / 4 + 30), fontsize=40, color="white")
+    global fundo_pausa
+    if fundo_pausa is None:
+        fundo_pausa = capturar_fundo_pausa()
+    screen.blit(fundo_pausa, (0, 0)) # Nada se move durante a pausa: só os botões são desenhados por cima
 
-    
-    for i, opcao in enumerate(opcoes_melhoria):
+    textos = []
+    for i, opcao in enumerate(mundo.opcoes_melhoria):
         rect_botao = botoes_opcao[i]
         cor_botao_atual = COR_BOTAO_CURSOR # Usa a cor de cursor/hover para os botões de escolha
         screen.draw.filled_rect(rect_botao, cor_botao_atual)
-        screen.draw.text(opcao.description, center=rect_botao.center, fontsize=30, color=COR_TEXTO_BOTAO) # 'opcao.description' vem do módulo Itens
+        textos.append(hud.text(f"escolha_opcao_{i}", opcao.description, 30, COR_TEXTO_BOTAO, center=rect_botao.center)) # 'opcao.description' vem do módulo Itens
+    screen.surface.blits(textos, doreturn=False)
+
+def capturar_fundo_pausa():
+    """Desenha o jogo pausado, a sobreposição escura e os títulos uma vez e devolve uma cópia da tela."""
+    desenhar_jogando()
+    # Sobreposição escura (translúcida: um Rect desenhado direto na tela ignoraria o alfa)
+    sobreposicao_escura = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    sobreposicao_escura.fill((0, 0, 0, 150))
+    screen.blit(sobreposicao_escura, (0, 0))
+
+    screen.surface.blits([
+        hud.text("escolha_titulo", f"SUBIU DE NÍVEL! (Nível {mundo.jogador.level})", 60, "yellow", "black", 1.5, center=(WIDTH / 2, HEIGHT / 4 - 30)),
+        hud.text("escolha_subtitulo", "Escolha uma Melhoria:", 40, center=(WIDTH / 2, HEIGHT / 4 + 30)),
+    ], doreturn=False)
+    return screen.surface.copy()
 
 def draw(): # Hook do Pygame Zero, nome mantido
     """Hook principal de desenho do PgZero."""
     screen.clear()
     if estado_jogo == EstadoJogo.MENU:
-        desenhar_menu()
+        with perfil.section("desenhar_menu"):
+            desenhar_menu()
     elif estado_jogo == EstadoJogo.JOGANDO:
-        desenhar_jogando()
+        with perfil.section("desenhar_jogando"):
+            desenhar_jogando()
     elif estado_jogo == EstadoJogo.FIM_DE_JOGO:
         # O som de fim de jogo é tocado apenas uma vez na transição de estado
-        desenhar_fim_de_jogo()
+        with perfil.section("desenhar_fim_de_jogo"):
+            desenhar_fim_de_jogo()
     elif estado_jogo == EstadoJogo.ESCOLHA_MELHORIA:
-        # Desenha o jogo pausado ao fundo, depois a UI de escolha por cima
-        desenhar_jogando() 
-        desenhar_escolha_melhoria()
-
-# --- FUNÇÕES DE ATUALIZAÇÃO ---
+        with perfil.section("desenhar_escolha_melhoria"):
+            desenhar_escolha_melhoria() # Fundo congelado + botões de escolha
 
-def atualizar_jogando(dt):
-    """Loop principal de atualização lógica para o estado 'JOGANDO'."""
-    global tempo_decorrido, estado_jogo
-
-    tempo_decorrido += dt
-    jogador.update(dt, WIDTH, HEIGHT)
-
-    # --- Lidar com Inimigos ---
-    for inimigo_atual in inimigos[:]: # 'inimigo_atual' é uma instância de Enemy.Wolf ou Enemy.Bat
-        inimigo_atual.update(dt, jogador.actor.pos)
-        
-        # Colisão com jogador
-        if inimigo_atual.actor.colliderect(jogador.actor):
-            jogador.take_damage(inimigo_atual.damage_output)
-            if som_ligado: sounds.hit.play() 
-            inimigos.remove(inimigo_atual)
-            if jogador.health <= 0:
-                estado_jogo = EstadoJogo.FIM_DE_JOGO
-                if som_ligado: sounds.game_over.play()
-                music.stop()
-                return
-            continue
-
-        # Colisão com arma orbital
-        if jogador.orbital_weapon_active and jogador.orbital_actor.colliderect(inimigo_atual.actor):
-            if inimigo_atual.take_damage(jogador.orbital_damage): # True se o inimigo morreu
-                if inimigo_atual in inimigos: inimigos.remove(inimigo_atual)
-                gemas_experiencia.append(GemaExperiencia(inimigo_atual.actor.pos))
-                jogador.enemies_killed += 1
-            if som_ligado: sounds.hit.play()
-
-    # --- Lidar com Projéteis ---
-    for projetil_atual in projeteis[:]: # 'projetil_atual' é uma instância de Projetil
-        projetil_atual.update()
-        if not projetil_atual.actor.colliderect(Rect(0, 0, WIDTH, HEIGHT)):
-            projeteis.remove(projetil_atual)
-            continue
-        
-        for inimigo_atual in inimigos[:]:
-            if inimigo_atual.actor.colliderect(projetil_atual.actor):
-                if projetil_atual in projeteis: projeteis.remove(projetil_atual)
-                if inimigo_atual.take_damage(projetil_atual.dano): # True se o inimigo morreu
-                    if inimigo_atual in inimigos: inimigos.remove(inimigo_atual)
-                    gemas_experiencia.append(GemaExperiencia(inimigo_atual.actor.pos))
-                    jogador.enemies_killed += 1
-                if som_ligado: sounds.hit.play()
-                break
+    if estado_jogo == EstadoJogo.JOGANDO:
+        tempo_frame_ms = (time.perf_counter() - inicio_frame) * 1000
+        if orcamento is not None and reproducao is None:
+            medir_orcamento(tempo_frame_ms)
+        telemetria.observar(mundo, tempo_frame_ms)
+    if perfil.enabled:
+        perfil.end_frame(inimigos=len(mundo.inimigos), projeteis=len(mundo.projeteis), gemas=len(mundo.gemas_experiencia))
+        desenhar_perfil()
+    if primeiro_frame is not None:
+        relatar_primeiro_frame()
+
+def medir_orcamento(tempo_frame_ms):
+    """Passa o tempo do frame ao orçamento; um limite novo vai ao Mundo com os próximos Comandos."""
+    global limite_pendente
+    novo_limite = orcamento.record(tempo_frame_ms, len(mundo.inimigos))
+    if novo_limite is not None:
+        limite_pendente = novo_limite
+
+def sincronizar_orcamento():
+    """Recomeça as medições do orçamento a partir do limite que o Mundo tem agora."""
+    if orcamento is not None:
+        orcamento.reset(mundo.limite_inimigos)
+
+def desenhar_perfil():
+    """Sobreposição do perfilador: p50/p95 de cada fase, coletas do GC e entidades vivas."""
+    global proxima_leitura_perfil
+    agora = perfil.clock()
+    if agora >= proxima_leitura_perfil:
+        proxima_leitura_perfil = agora + INTERVALO_PERFIL
+        linhas_perfil[:] = linhas_do_perfil()
+    screen.surface.blits([hud_perfil.text(f"linha_{i}", linha, 18, "white", "black", 1, topleft=(10, 40 + i * 16))
+                          for i, linha in enumerate(linhas_perfil)], doreturn=False)
+
+def linhas_do_perfil():
+    """Texto da sobreposição, das fases mais lentas (p95) para as mais rápidas."""
+    percentis = perfil.percentiles()
+    linhas = [f"{nome}: p50 {p50:.2f} / p95 {p95:.2f} ms"
+              for nome, (p50, p95) in sorted(percentis.items(), key=lambda item: -item[1][1])]
+    geracao0, geracao1, geracao2 = perfil.gc_counts()
+    linhas.append(f"GC ({perfil.history_seconds:.0f}s): {geracao0} / {geracao1} / {geracao2} coletas (gerações 0/1/2)")
+    linhas.append(" | ".join(f"{nome} {quantidade}" for nome, quantidade in perfil.last_counters().items()))
+    linhas.append("F3 desliga | F4 salva trace")
+    return linhas
 
-    # --- Lidar com Gemas de Experiência ---
-    for gema_atual in gemas_experiencia[:]: # 'gema_atual' é uma instância de GemaExperiencia
-        if jogador.actor.colliderect(gema_atual.actor):
-            gemas_experiencia.remove(gema_atual)
-            if som_ligado: sounds.collect.play() # 'collect' é nome do arquivo de som
-            if jogador.process_gem_collection(): # True se subiu de nível
-                if som_ligado: sounds.level_up.play() # 'level_up' é nome do arquivo de som
-                preparar_escolhas_melhoria()
-                estado_jogo = EstadoJogo.ESCOLHA_MELHORIA
+# --- FUNÇÕES DE ATUALIZAÇÃO ---
 
 def update(dt): # Hook do Pygame Zero, nome mantido
     """Hook principal de atualização do PgZero, chamado a cada frame."""
-    if estado_jogo == EstadoJogo.JOGANDO:
-        atualizar_jogando(dt)
+    global estado_jogo, escolha_pendente, fundo_pausa, limite_pendente, inicio_frame
+    perfil.begin_frame() # O frame medido vai daqui até o fim do draw()
+    inicio_frame = time.perf_counter() # Idem para o orçamento de frame
+    if not carga_relatada and recursos.done:
+        aguardar_recursos() # Já está pronta: não espera, só converte a folha ainda no menu
+        relatar_carga()
+    if estado_jogo not in (EstadoJogo.JOGANDO, EstadoJogo.ESCOLHA_MELHORIA):
+        return
+    if reproducao is not None:
+        atualizar_reproducao(dt)
+        return
+
+    comandos = Comandos(
+        esquerda=keyboard.left or keyboard.a,
+        direita=keyboard.right or keyboard.d,
+        cima=keyboard.up or keyboard.w,
+        baixo=keyboard.down or keyboard.s,
+        disparos=tuple(disparos_pendentes),
+        escolha_melhoria=escolha_pendente,
+        limite_inimigos=limite_pendente,
+    )
+
+    # O Mundo roda quantos ticks fixos couberem no tempo deste frame (às vezes nenhum)
+    with perfil.section("Mundo.avancar"):
+        passos, eventos = mundo.avancar(dt, comandos)
+    tratar_eventos(eventos)
+    if passos:
+        # Cliques só são consumidos quando algum tick rodou
+        disparos_pendentes.clear()
+        escolha_pendente = None
+        limite_pendente = None
+    if mundo.melhoria_aplicada is not None:
+        # Anotada quando o Mundo aplica a escolha, e não no clique: cliques repetidos na pausa valem uma vez só
+        log.info("Jogador escolheu: %s", mundo.melhoria_aplicada.description) # 'description' vem do módulo Itens
+        telemetria.melhoria(mundo, mundo.melhoria_aplicada)
+        mundo.melhoria_aplicada = None
+
+    atualizar_pausa(passos and comandos.escolha_melhoria is not None)
+
+def atualizar_pausa(escolheu):
+    """Acompanha o estado do Mundo depois dos ticks do frame, preparando ou desfazendo a tela de escolha."""
+    global estado_jogo, fundo_pausa
+    estado_jogo = mundo.estado
+    if estado_jogo != EstadoJogo.ESCOLHA_MELHORIA or escolheu:
+        # Saiu da pausa (ou já subiu de nível de novo): a próxima pausa captura botões e fundo novos
+        botoes_opcao.clear()
+        fundo_pausa = None
+    if estado_jogo == EstadoJogo.ESCOLHA_MELHORIA and not botoes_opcao:
+        preparar_escolhas_melhoria()
+
+def atualizar_reproducao(dt):
+    """Roda os ticks do frame com os comandos gravados em vez do teclado e do mouse."""
+    global escolha_pendente
+    disparos_pendentes.clear() # Cliques durante a reprodução não entram na partida
+    escolha_pendente = None
+
+    eventos = []
+    escolheu = False
+    for _ in range(mundo.ticks_do_frame(dt)):
+        comandos = next(reproducao, None) if reproducao is not None else None
+        if comandos is None:
+            encerrar_reproducao()
+            comandos = SEM_COMANDOS
+        escolheu = escolheu or comandos.escolha_melhoria is not None
+        eventos.extend(mundo.passo(PASSO_FIXO, comandos))
+    mundo.melhoria_aplicada = None # As escolhas da gravação não são do jogador: nem log, nem telemetria
+    tratar_eventos(eventos)
+    atualizar_pausa(escolheu)
+
+def iniciar_reproducao(caminho, tick=None):
+    """Carrega uma gravação, avança o Mundo sem desenhar até `tick` e deixa o resto tocando no update()."""
+    global estado_jogo, reproducao, gravacao_reproduzida
+    gravacao = Gravacao.carregar(caminho)
+    if gravacao.dt != PASSO_FIXO:
+        # O jogo só anda em ticks de PASSO_FIXO, e a partida continua a mesma gravação depois dela
+        raise ValueError(f"{caminho} foi gravada com ticks de {gravacao.dt} s, e o jogo só toca o passo fixo de "
+                         f"{PASSO_FIXO} s; reproduza-a com reproduzir.py, sem --abrir")
+    gravacao_reproduzida = gravacao
+    reiniciar_jogo(gravacao_reproduzida.semente)
+    inicio = time.perf_counter()
+    _, reproducao = gravacao_reproduzida.reproduzir(mundo, tick) # Sem gravar: os comandos já estão nela
+    log.info("Gravação %s: tick %s de %s, alcançado em %.2fs", caminho, mundo.tick, gravacao_reproduzida.ticks,
+             time.perf_counter() - inicio)
+    atualizar_pausa(False)
+
+def continuar_partida(caminho):
+    """Abre o jogo no estado salvo em `caminho` (F6)."""
+    reiniciar_jogo()
+    inicio = time.perf_counter()
+    carregar_estado(caminho, mundo)
+    sincronizar_orcamento()
+    telemetria.iniciar(mundo, "estado_salvo")
+    log.info("Estado %s carregado em %.1f ms (%s inimigos, %s projéteis, %s gemas)", caminho,
+             (time.perf_counter() - inicio) * 1000, len(mundo.inimigos), len(mundo.projeteis), len(mundo.gemas_experiencia))
+    atualizar_pausa(False)
+
+def encerrar_reproducao():
+    """Fim da gravação: daqui em diante os comandos voltam a vir do jogador."""
+    global reproducao
+    if reproducao is not None:
+        reproducao = None
+        mundo.gravacao = gravacao_reproduzida # A partida continua a mesma gravação
+        sincronizar_orcamento()
+        telemetria.iniciar(mundo, "reproducao")
+        log.info("Fim da gravação no tick %s: o controle volta para o jogador", mundo.tick)
+
+def salvar_gravacao(caminho=None):
+    """Salva a gravação da partida atual, com o resumo do estado para conferir a reprodução."""
+    if mundo.gravacao is None:
+        return None
+    return mundo.gravacao.salvar(caminho or f"gravacao-{time.strftime('%Y%m%d-%H%M%S')}.rep", mundo)
+
+def tratar_eventos(eventos):
+    """Toca os sons e aplica os efeitos de tela pedidos pelo Mundo neste passo."""
+    for evento in eventos:
+        if som_ligado: vozes.queue(evento) # Os eventos têm o nome dos arquivos de som
+    vozes.flush()
+    if "game_over" in eventos:
+        music.stop()
+        telemetria.encerrar(mundo, "fim_de_jogo")
+        caminho = salvar_gravacao(ARQUIVO_ULTIMA_PARTIDA)
+        if caminho:
+            log.info("Partida salva em %s (reproduza com reproduzir.py)", caminho)
+        relatar_pools()
+        relatar_hud()
+        relatar_sons()
 
 # --- SUBIR DE NÍVEL & MECÂNICAS DO JOGO ---
 
 def preparar_escolhas_melhoria():
-    """Prepara uma lista de opções de melhoria para o jogador."""
-    global opcoes_melhoria, botoes_opcao
-    opcoes_melhoria.clear()
+    """Posiciona um botão para cada opção de melhoria sorteada pelo Mundo."""
     botoes_opcao.clear()
-    
-    # Obtém 2 opções de melhoria aleatórias do sistema de itens
-    opcoes_melhoria = get_upgrade_options(jogador, num_options=2) # 'get_upgrade_options' é importado
 
     largura_botao, altura_botao, espacamento_botoes = 450, 90, 30
-    num_opcoes = len(opcoes_melhoria)
+    num_opcoes = len(mundo.opcoes_melhoria)
     pos_y_inicial_botoes = HEIGHT / 2 - ((altura_botao * num_opcoes + espacamento_botoes * (num_opcoes - 1)) / 2) + 50
 
     for i in range(num_opcoes):
         pos_y_botao = pos_y_inicial_botoes + i * (altura_botao + espacamento_botoes)
         botoes_opcao.append(Rect(WIDTH / 2 - largura_botao / 2, pos_y_botao, largura_botao, altura_botao))
 
-def gerar_inimigo():
-    """Gera um novo inimigo em uma posição aleatória fora da tela."""
-    lado_tela = random.choice(['top', 'bottom', 'left', 'right']) # Mantido em inglês para lógica simples, poderia ser traduzido
-    if lado_tela == 'top': posicao_spawn = (random.randint(0, WIDTH), -30)
-    elif lado_tela == 'bottom': posicao_spawn = (random.randint(0, WIDTH), HEIGHT + 30)
-    elif lado_tela == 'left': posicao_spawn = (-30, random.randint(0, HEIGHT))
-    else: posicao_spawn = (WIDTH + 30, random.randint(0, HEIGHT)) # right
-    
-    # Adiciona variedade na geração de inimigos
-    if random.random() < 0.7: # 70% de chance para um Lobo
-        inimigos.append(Wolf(posicao_spawn)) # 'Wolf' é classe importada
-    else: # 30% de chance para um Morcego
-        inimigos.append(Bat(posicao_spawn)) # 'Bat' é classe importada
-
-    # Aumenta a taxa de geração ao longo do tempo
-    atraso_spawn = max(0.5, 2.5 - tempo_decorrido * 0.04)
-    clock.schedule_unique(gerar_inimigo, atraso_spawn) # 'clock' é objeto global do Pygame Zero
+def encerrar_telemetria():
+    """Ao sair do jogo, fecha a partida em andamento na telemetria."""
+    telemetria.encerrar(mundo, "saiu")
+
+def relatar_pools():
+    """Mostra a taxa de reaproveitamento e o pico de instâncias vivas de cada pool."""
+    for nome, estatisticas in mundo.estatisticas_pools().items():
+        log.info("Pool de %s: %.1f%% reaproveitados (%s/%s), pico de %s vivos", nome, estatisticas["hit_rate"] * 100,
+                 estatisticas["reused"], estatisticas["acquired"], estatisticas["peak_live"])
+
+def relatar_hud():
+    """Mostra quantos widgets e textos do HUD vieram do cache em vez de serem redesenhados."""
+    estatisticas = hud.stats()
+    texto = estatisticas["text"]
+    log.info("HUD: %.1f%% dos widgets reaproveitados (%s/%s), cache de texto %.1f%% (%s/%s, %s entradas)",
+             estatisticas["hit_rate"] * 100, estatisticas["reused"], estatisticas["reused"] + estatisticas["rebuilt"],
+             texto["hit_rate"] * 100, texto["hits"], texto["hits"] + texto["misses"], texto["entries"])
+
+def relatar_sons():
+    """Mostra, para cada som, quantos pedidos tocaram e quantos foram agrupados ou descartados."""
+    for nome, estatisticas in vozes.stats().items():
+        log.info("Som %s: %s tocados, %s suprimidos de %s pedidos", nome, estatisticas["played"],
+                 estatisticas["suppressed"], estatisticas["requested"])
 
 # --- HOOKS DE EVENTO ---
 
+def on_key_down(key): # Hook do Pygame Zero
+    """
+    F3 liga/desliga o perfilador; F4 salva os últimos segundos medidos como trace do Chrome;
+    F5 salva a gravação da partida em andamento e F6, o estado do mundo.
+    """
+    if key == keys.F3:
+        log.info("Perfilador %s", "ligado" if perfil.toggle() else "desligado")
+    elif key == keys.F4 and perfil.frames:
+        log.info("Trace salvo em %s (abra em chrome://tracing ou ui.perfetto.dev)", perfil.export())
+    elif key == keys.F5 and estado_jogo in (EstadoJogo.JOGANDO, EstadoJogo.ESCOLHA_MELHORIA):
+        caminho = salvar_gravacao()
+        if caminho:
+            log.info("Gravação (%s ticks) salva em %s", mundo.tick, caminho)
+    elif key == keys.F6 and estado_jogo in (EstadoJogo.JOGANDO, EstadoJogo.ESCOLHA_MELHORIA):
+        caminho = salvar_estado(mundo, f"estado-{time.strftime('%Y%m%d-%H%M%S')}.sav")
+        log.info("Estado salvo em %s (continue com main.py --carregar)", caminho)
+
 def on_mouse_down(pos, button): # Hook do Pygame Zero, nome e parâmetros mantidos (pos, button)
     """Hook de evento de clique do mouse do PgZero."""
-    global estado_jogo, som_ligado
+    global estado_jogo, som_ligado, escolha_pendente
     
     if estado_jogo == EstadoJogo.MENU:
         if botao_jogar.collidepoint(pos):
             estado_jogo = EstadoJogo.JOGANDO
             reiniciar_jogo()
+            telemetria.iniciar(mundo)
         elif botao_som.collidepoint(pos):
             som_ligado = not som_ligado
             if not som_ligado: music.stop()
@@ -287,8 +679,8 @@ def on_mouse_down(pos, button): # Hook do Pygame Zero, nome e parâmetros mantid
 
     elif estado_jogo == EstadoJogo.JOGANDO:
         if button == mouse.LEFT: # 'mouse.LEFT' é constante do Pygame Zero
-            projeteis.append(Projetil(jogador.actor.pos, pos, jogador.projectile_base_damage))
-            if som_ligado: sounds.shoot.play() # 'shoot' é nome do arquivo de som
+            # O Mundo dispara (e pede o som 'shoot') no próximo update, no ponto do mundo sob o cursor
+            disparos_pendentes.append((pos[0] + deslocamento[0], pos[1] + deslocamento[1]))
             
     elif estado_jogo == EstadoJogo.FIM_DE_JOGO:
         estado_jogo = EstadoJogo.MENU
@@ -296,45 +688,23 @@ def on_mouse_down(pos, button): # Hook do Pygame Zero, nome e parâmetros mantid
     elif estado_jogo == EstadoJogo.ESCOLHA_MELHORIA:
         for i, rect_botao_atual in enumerate(botoes_opcao):
             if rect_botao_atual.collidepoint(pos) and button == mouse.LEFT:
-                item_escolhido = opcoes_melhoria[i]
-                item_escolhido.apply(jogador) # Aplica o efeito do item
-                print(f"Jogador escolheu: {item_escolhido.description}") # 'item_escolhido.description' vem do módulo Itens
-                
-                estado_jogo = EstadoJogo.JOGANDO
-                opcoes_melhoria.clear()
-                botoes_opcao.clear()
+                escolha_pendente = i # O Mundo aplica o efeito do item no próximo update
                 break
 
-# --- CLASSES AUXILIARES ---
-
-class Projetil:
-    """Representa um projétil disparado pelo jogador."""
-    def __init__(self, pos_inicial, pos_alvo, valor_dano):
-        self.actor = Actor("projectile.png", pos=pos_inicial) # "projectile.png" é nome do arquivo de imagem
-        self.dano = valor_dano
-        self.velocidade = 8
-        
-        # Calcula o ângulo e componentes de velocidade
-        angulo_radianos = math.atan2(pos_alvo[1] - pos_inicial[1], pos_alvo[0] - pos_inicial[0])
-        self.vx = math.cos(angulo_radianos) * self.velocidade
-        self.vy = math.sin(angulo_radianos) * self.velocidade
-        self.actor.angle = math.degrees(-angulo_radianos) + 90 # Ajusta o ângulo do ator
-
-    def update(self):
-        self.actor.x += self.vx
-        self.actor.y += self.vy
-
-    def draw(self):
-        self.actor.draw()
-
-class GemaExperiencia:
-    """Representa uma gema de experiência deixada por um inimigo."""
-    def __init__(self, pos): # 'pos' é a posição
-        self.actor = Actor("gem.png", pos=pos) # "gem.png" é nome do arquivo de imagem
-        self.valor_xp = 10
-
-    def draw(self):
-        self.actor.draw()
-
 # --- INICIA O JOGO ---
+parser = argparse.ArgumentParser(description="Cyber-Duck")
+parser.add_argument("--reproduzir", metavar="ARQUIVO", help="abre o jogo tocando uma partida gravada")
+parser.add_argument("--tick", type=int, default=None, help="tick da gravação em que a janela abre (padrão: o início)")
+parser.add_argument("--carregar", metavar="ARQUIVO", help="continua uma partida salva com F6")
+parser.add_argument("--log", choices=("DEBUG", "INFO", "WARNING", "ERROR"), default=NIVEL_LOG,
+                    help=f"nível mínimo das mensagens no stdout (padrão: {NIVEL_LOG})")
+argumentos, _ = parser.parse_known_args()
+LogWriter(argumentos.log).start()
+if telemetria.escritor is not None:
+    telemetria.escritor.start()
+    atexit.register(encerrar_telemetria) # Registrado depois do escritor, roda antes de ele fechar o arquivo
+if argumentos.reproduzir:
+    iniciar_reproducao(argumentos.reproduzir, argumentos.tick or 0)
+elif argumentos.carregar:
+    continuar_partida(argumentos.carregar)
 pgzrun.go() # Função do Pygame Zero para iniciar o jogo
\ No newline at end of file
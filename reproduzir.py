@@ -0,0 +1,64 @@
+"""
+Reproduz uma partida gravada (pelo jogo com F5 ou por simular.py --gravar)
+sem janela nem áudio, o mais rápido que a CPU permitir. Reproduzida até o fim,
+a partida é conferida com o resumo do estado salvo na gravação: qualquer
+diferença de um bit aparece como divergência.
+
+Uso:
+    python reproduzir.py partida.rep                    # reproduz tudo e confere
+    python reproduzir.py partida.rep --tick 5400        # para no tick 5400
+    python reproduzir.py partida.rep --tick 5400 --abrir  # abre o jogo nesse tick
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from Gravacao import Gravacao
+from Mundo import EstadoJogo, PASSO_FIXO
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprodução headless de uma partida gravada do Cyber-Duck.")
+    parser.add_argument("gravacao", help="arquivo salvo pelo jogo (F5) ou por simular.py --gravar")
+    parser.add_argument("--tick", type=int, default=None, help="para a reprodução neste tick (padrão: o último)")
+    parser.add_argument("--abrir", action="store_true", help="abre o jogo no tick escolhido, com o resto da gravação tocando")
+    args = parser.parse_args()
+
+    try:
+        gravacao = Gravacao.carregar(args.gravacao)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    if args.abrir:
+        if gravacao.dt != PASSO_FIXO:
+            parser.error(f"a gravação usa ticks de {gravacao.dt} s e o jogo só abre as do passo fixo ({PASSO_FIXO} s)")
+        # O jogo faz o mesmo avanço rápido antes de abrir a janela (veja main.py)
+        comando = [sys.executable, "main.py", "--reproduzir", os.path.abspath(args.gravacao)]
+        if args.tick is not None:
+            comando += ["--tick", str(args.tick)]
+        sys.exit(subprocess.call(comando, cwd=os.path.dirname(os.path.abspath(__file__))))
+
+    print(f"Gravação: {gravacao.ticks} ticks ({gravacao.ticks * gravacao.dt:.1f}s), semente {gravacao.semente}, "
+          f"{len(gravacao.dados)} bytes de comandos")
+
+    inicio = time.perf_counter()
+    mundo, _ = gravacao.reproduzir(ate_tick=args.tick)
+    duracao = time.perf_counter() - inicio
+
+    jogador = mundo.jogador
+    print(f"Reproduzido até o tick {mundo.tick} em {duracao:.2f}s ({mundo.tick / max(duracao, 1e-9):.0f} ticks/s)")
+    print(f"Estado: {'fim de jogo' if mundo.estado == EstadoJogo.FIM_DE_JOGO else 'vivo'} | "
+          f"Nível {jogador.level} | Inimigos derrotados {jogador.enemies_killed} | Inimigos vivos {len(mundo.inimigos)}")
+    print(f"Resumo do estado: {mundo.resumo_estado().hex()}")
+
+    if mundo.tick == gravacao.ticks and gravacao.resumo is not None:
+        if mundo.resumo_estado() == gravacao.resumo:
+            print("Reprodução idêntica à partida gravada")
+        else:
+            print(f"DIVERGIU: a partida gravada terminou com o resumo {gravacao.resumo.hex()}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
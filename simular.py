@@ -0,0 +1,113 @@
+"""
+Executa partidas do Cyber-Duck sem janela nem áudio, o mais rápido que a CPU permitir.
+
+Uso:
+    python simular.py --segundos 300 --semente 42
+    python simular.py --segundos 300 --gravar partida.rep   # depois: python reproduzir.py partida.rep
+    python simular.py --segundos 1200 --salvar-estado tarde.sav  # captura um fim de partida...
+    python simular.py --segundos 60 --carregar tarde.sav --perfil perfil.json  # ...e mede a partir dele
+    python simular.py --segundos 300 --mundo 9600x6400  # mundo grande: câmera do tamanho da janela e chunks
+"""
+import argparse
+import time
+import numpy as np
+from Mundo import Mundo, EstadoJogo, Comandos, PASSO_FIXO, LARGURA, ALTURA
+from Profiler import Profiler
+from Gravacao import Gravacao
+from Salvamento import salvar_estado, carregar_estado
+
+
+def bot_simples(mundo, tick, intervalo_tiro=10):
+    """Bot de referência: fica parado, atira no inimigo mais próximo e escolhe a primeira melhoria."""
+    if mundo.estado == EstadoJogo.ESCOLHA_MELHORIA:
+        return Comandos(escolha_melhoria=0)
+
+    disparos = ()
+    inimigos = mundo.inimigos
+    if tick % intervalo_tiro == 0 and len(inimigos):
+        x, y = mundo.jogador.hitbox.pos
+        n = len(inimigos)
+        mais_proximo = int(np.argmin((inimigos.x[:n] - x) ** 2 + (inimigos.y[:n] - y) ** 2))
+        disparos = (inimigos.pos(mais_proximo),)
+    return Comandos(disparos=disparos)
+
+
+def tamanho_mundo(texto):
+    """Tipo do argparse para um tamanho de mundo "LARGURAxALTURA", em pixels."""
+    try:
+        largura, altura = (int(parte) for parte in texto.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tamanho inválido: {texto!r} (use LARGURAxALTURA, como 9600x6400)")
+    if largura < LARGURA or altura < ALTURA:
+        raise argparse.ArgumentTypeError(f"o mundo não pode ser menor que a tela ({LARGURA}x{ALTURA})")
+    return largura, altura
+
+
+def simular(segundos, dt=PASSO_FIXO, semente=None, usar_broad_phase=True, bot=bot_simples, perfil=None, gravar=False,
+            estado=None, usar_campo_de_fluxo=True, mundo_grande=None):
+    """
+    Roda uma partida até o fim de jogo ou por `segundos` de tempo simulado.
+    Com `estado` (um arquivo de Salvamento), continua a partida salva.
+    """
+    if estado is not None:
+        mundo = carregar_estado(estado, perfil=perfil)
+    else:
+        mundo = Mundo(*(mundo_grande or (LARGURA, ALTURA)), semente=semente, usar_broad_phase=usar_broad_phase,
+                      perfil=perfil, usar_campo_de_fluxo=usar_campo_de_fluxo, visao=(LARGURA, ALTURA))
+    if gravar:
+        mundo.gravacao = Gravacao.do_mundo(mundo, dt)
+    perfil = mundo.perfil
+    limite = mundo.tempo_decorrido + segundos
+    tick = 0
+    while mundo.tempo_decorrido < limite and mundo.estado != EstadoJogo.FIM_DE_JOGO:
+        perfil.begin_frame()
+        mundo.passo(dt, bot(mundo, tick))
+        perfil.end_frame(inimigos=len(mundo.inimigos), projeteis=len(mundo.projeteis), gemas=len(mundo.gemas_experiencia))
+        tick += 1
+    return mundo, tick
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação headless do Cyber-Duck.")
+    parser.add_argument("--segundos", type=float, default=120.0, help="tempo de jogo simulado")
+    parser.add_argument("--dt", type=float, default=PASSO_FIXO, help="duração de cada tick (padrão: o passo fixo do jogo)")
+    parser.add_argument("--semente", type=int, default=None, help="semente do gerador aleatório")
+    parser.add_argument("--forca-bruta", action="store_true", help="desliga a broad-phase das colisões")
+    parser.add_argument("--sem-campo-de-fluxo", action="store_true", help="inimigos miram direto no jogador")
+    parser.add_argument("--mundo", type=tamanho_mundo, metavar="LARGURAxALTURA",
+                        help="arena maior que a tela, com câmera e chunks (padrão: a arena do tamanho da tela)")
+    parser.add_argument("--perfil", metavar="ARQUIVO", help="mede cada fase e salva os últimos segundos como trace do Chrome")
+    parser.add_argument("--gravar", metavar="ARQUIVO", help="salva a semente e os comandos de cada tick (veja reproduzir.py)")
+    parser.add_argument("--carregar", metavar="ARQUIVO", help="continua a partida de um estado salvo")
+    parser.add_argument("--salvar-estado", metavar="ARQUIVO", help="salva o estado do mundo no fim da simulação")
+    args = parser.parse_args()
+    if args.gravar and args.carregar:
+        parser.error("uma gravação começa no tick 0: não dá para gravar a partir de um estado carregado")
+
+    perfil = None
+    if args.perfil:
+        perfil = Profiler()
+        perfil.enable()
+    inicio = time.perf_counter()
+    mundo, ticks = simular(args.segundos, args.dt, args.semente, not args.forca_bruta, perfil=perfil, gravar=bool(args.gravar),
+                           estado=args.carregar, usar_campo_de_fluxo=not args.sem_campo_de_fluxo, mundo_grande=args.mundo)
+    duracao = time.perf_counter() - inicio
+
+    jogador = mundo.jogador
+    print(f"Ticks: {ticks} ({mundo.tempo_decorrido:.1f}s simulados) em {duracao:.2f}s reais "
+          f"({ticks / duracao:.0f} ticks/s)")
+    print(f"Estado final: {'fim de jogo' if mundo.estado == EstadoJogo.FIM_DE_JOGO else 'vivo'} | "
+          f"Nível {jogador.level} | Inimigos derrotados {jogador.enemies_killed} | "
+          f"Inimigos vivos {len(mundo.inimigos)} (+{len(mundo.congelados)} congelados longe da câmera)")
+    if perfil is not None:
+        for nome, (p50, p95) in sorted(perfil.percentiles().items(), key=lambda item: -item[1][1]):
+            print(f"  {nome}: p50 {p50:.3f} / p95 {p95:.3f} ms")
+        print(f"Trace salvo em {perfil.export(args.perfil)}")
+    if args.salvar_estado:
+        print(f"Estado salvo em {salvar_estado(mundo, args.salvar_estado)}")
+    if args.gravar:
+        print(f"Gravação ({ticks} ticks, semente {mundo.semente}) salva em {mundo.gravacao.salvar(args.gravar, mundo)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import numpy as np
+from Bullets import BulletRing
+from Hitbox import REFERENCE_FPS
+
+SPEED = 10
+
+
+def ring(capacity=4):
+    return BulletRing("projectile.png", SPEED, capacity)
+
+
+def box(x, y, size=20.0):
+    """Caixa de um alvo parado centrada em (x, y), nos arrays que contacts() recebe."""
+    half = size / 2
+    return (np.array([x - half]), np.array([y - half]), np.array([x + half]), np.array([y + half]),
+            np.zeros(1), np.zeros(1))
+
+
+def test_buffer_cresce_e_mantem_a_ordem_de_disparo():
+    bullets = ring()
+    for k in range(10):
+        bullets.fire((k, 0), (k, 100), damage=k)
+    assert bullets.capacity == 16 and len(bullets) == 10
+    assert bullets.damage[bullets.rows()].tolist() == list(range(10))
+
+
+def test_sweep_libera_as_linhas_que_a_cabeca_passou():
+    bullets = ring()
+    for k in range(4):
+        bullets.fire((0, 0), (0, 1), damage=k)
+    bullets.kill(bullets.rows()[0])
+    bullets.kill(bullets.rows()[0])
+    bullets.sweep()
+    assert (bullets.head, bullets.count) == (2, 2)
+    bullets.fire((0, 0), (0, 1), damage=4) # Dá a volta para a linha 0 em vez de crescer
+    assert bullets.capacity == 4
+    assert bullets.damage[bullets.rows()].tolist() == [2, 3, 4]
+    assert bullets.reused == bullets.acquired == 5
+
+
+def test_projetil_rapido_acerta_alvo_fino_que_atravessa_num_tick():
+    bullets = ring()
+    bullets.fire((0, 0), (1000, 0), damage=1)
+    bullets.update(200 / (SPEED * REFERENCE_FPS)) # 200 px num tick, passando do alvo em x = 100
+    assert bullets.x[bullets.rows()][0] > 150
+    for broad_phase in (True, False):
+        rows, targets = bullets.contacts(*box(100, 0, size=4.0), broad_phase=broad_phase)
+        assert rows.tolist() == [0] and targets.tolist() == [0]
+
+
+def test_contatos_em_ordem_de_projetil_e_tempo_de_contato():
+    bullets = ring()
+    bullets.fire((0, 0), (1000, 0), damage=1)
+    bullets.update(200 / (SPEED * REFERENCE_FPS))
+    targets = [np.concatenate(columns) for columns in zip(box(150, 0), box(50, 0))]
+    rows, hit = bullets.contacts(*targets)
+    assert hit.tolist() == [1, 0] # O alvo em x = 50 é alcançado primeiro
+
+
+def test_perfuracao_e_memoria_de_acertos():
+    bullets = ring()
+    bullets.fire((0, 0), (1, 0), damage=1, pierce=1)
+    i = bullets.rows()[0]
+    assert bullets.strike(i, 7)
+    assert not bullets.strike(i, 7) # O mesmo alvo de novo: ignorado
+    assert not bullets.dead[i]
+    assert bullets.strike(i, 8) # Sem perfuração: este acerto o destrói
+    assert bullets.dead[i] and len(bullets) == 0
+
+
+def test_colunas_ida_e_volta():
+    bullets = ring()
+    for k in range(6):
+        bullets.fire((k, k), (50, 80), damage=k, pierce=k % 2)
+    bullets.kill(bullets.rows()[1])
+    columns = bullets.columns()
+    copy = ring(capacity=2)
+    copy.load_columns(columns)
+    assert len(copy) == 5
+    for name, values in copy.columns().items():
+        assert np.array_equal(values, columns[name]), name
@@ -0,0 +1,31 @@
+import random
+import pytest
+from benchmark import Cenario, montar_mundo, repor_entidades
+
+FRAMES = 60
+DT = 1 / 60
+
+
+def rodar(cenario, usar_broad_phase, semente=5):
+    """Resumos do estado a cada frame da carga do benchmark, com o mesmo sorteio de entidades."""
+    rng = random.Random(semente)
+    mundo = montar_mundo(cenario, semente, usar_broad_phase)
+    resumos = []
+    for _ in range(FRAMES):
+        repor_entidades(mundo, cenario, rng)
+        mundo.tempo_decorrido += DT
+        mundo.mover(DT, (False, False, False, False))
+        mundo.resolver_colisoes()
+        resumos.append(mundo.resumo_estado())
+    return mundo, resumos
+
+
+@pytest.mark.parametrize("orbital", [False, True])
+def test_broad_phase_da_o_mesmo_resultado_que_forca_bruta(orbital):
+    cenario = Cenario(1000, 200, 100, orbital)
+    grade, resumos_grade = rodar(cenario, True)
+    bruta, resumos_bruta = rodar(cenario, False)
+    for frame, (a, b) in enumerate(zip(resumos_grade, resumos_bruta)):
+        assert a == b, f"divergiu no frame {frame}"
+    # A carga precisa de fato colidir, senão a comparação não prova nada
+    assert grade.jogador.enemies_killed > 0
@@ -0,0 +1,61 @@
+import pytest
+from Gravacao import Gravacao
+from Mundo import Mundo, Comandos, PASSO_FIXO
+from simular import bot_simples
+
+TICKS = 3000
+
+
+def campos(comandos):
+    return comandos.teclas, [tuple(alvo) for alvo in comandos.disparos], comandos.escolha_melhoria, comandos.limite_inimigos
+
+
+def partida_gravada(semente=4):
+    mundo = Mundo(semente=semente)
+    mundo.gravacao = Gravacao.do_mundo(mundo)
+    mundo.entradas = [] # Os comandos como o bot os deu, para comparar com os lidos do arquivo
+    for tick in range(TICKS):
+        comandos = bot_simples(mundo, tick)
+        if tick == 600:
+            comandos = Comandos(*comandos.teclas, disparos=((12.5, 700.25), (3.0, 4.0)), limite_inimigos=40)
+        mundo.entradas.append(campos(comandos))
+        mundo.passo(PASSO_FIXO, comandos)
+    return mundo
+
+
+def test_salvar_e_carregar_reproduz_a_partida(tmp_path):
+    mundo = partida_gravada()
+    caminho = mundo.gravacao.salvar(tmp_path / "partida.rep", mundo)
+    gravacao = Gravacao.carregar(caminho)
+    assert (gravacao.semente, gravacao.dt, len(gravacao)) == (mundo.semente, PASSO_FIXO, TICKS)
+    assert [campos(c) for c in gravacao] == mundo.entradas
+
+    reproduzido, restantes = gravacao.reproduzir()
+    assert reproduzido.tick == TICKS
+    assert reproduzido.resumo_estado() == mundo.resumo_estado() == gravacao.resumo
+    assert next(restantes, None) is None
+
+
+def test_reproduzir_ate_um_tick_devolve_o_resto(tmp_path):
+    mundo = partida_gravada()
+    gravacao = Gravacao.carregar(mundo.gravacao.salvar(tmp_path / "partida.rep", mundo))
+    parcial, restantes = gravacao.reproduzir(ate_tick=1000)
+    assert parcial.tick == 1000
+    for comandos in restantes:
+        parcial.passo(gravacao.dt, comandos)
+    assert parcial.resumo_estado() == mundo.resumo_estado()
+
+
+def test_carregar_recusa_arquivos_invalidos(tmp_path):
+    lixo = tmp_path / "lixo.rep"
+    lixo.write_bytes(b"nada a ver")
+    with pytest.raises(ValueError, match="não é uma gravação"):
+        Gravacao.carregar(lixo)
+
+    mundo = partida_gravada()
+    caminho = tmp_path / "partida.rep"
+    mundo.gravacao.salvar(caminho, mundo)
+    truncado = tmp_path / "truncado.rep"
+    truncado.write_bytes(caminho.read_bytes()[:-5])
+    with pytest.raises(ValueError, match="truncado"):
+        Gravacao.carregar(truncado)
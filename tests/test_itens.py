@@ -0,0 +1,50 @@
+import random
+from collections import Counter
+import pytest
+from Itens import Item, UpgradeRegistry, UPGRADES, OrbitalWeaponUnlock, OrbitalDamageUpgrade, _alias_tables
+
+
+class Jogador:
+    orbital_weapon_active = False
+
+
+def item(nome, peso, requer=None):
+    return type(nome, (Item,), {"weight": peso, "requires": requer or {}})
+
+
+@pytest.mark.parametrize("pesos", [[1, 1, 1], [5, 1, 0.5, 3.5], [0.1, 10]])
+def test_tabelas_de_alias_reproduzem_os_pesos(pesos):
+    probabilidade, alias = _alias_tables(pesos)
+    n = len(pesos)
+    chance = [0.0] * n
+    for i in range(n):
+        chance[i] += probabilidade[i] / n
+        chance[alias[i]] += (1 - probabilidade[i]) / n
+    assert chance == pytest.approx([peso / sum(pesos) for peso in pesos])
+
+
+def test_sorteio_segue_os_pesos():
+    registro = UpgradeRegistry([item("Comum", 6), item("Medio", 3), item("Raro", 1)])
+    rng = random.Random(2)
+    contagem = Counter(type(registro.sample(Jogador(), 1, rng)[0]).__name__ for _ in range(20000))
+    assert contagem["Comum"] / 20000 == pytest.approx(0.6, abs=0.02)
+    assert contagem["Medio"] / 20000 == pytest.approx(0.3, abs=0.02)
+    assert contagem["Raro"] / 20000 == pytest.approx(0.1, abs=0.02)
+
+
+def test_sorteio_sem_repeticao_e_com_menos_itens_que_o_pedido():
+    registro = UpgradeRegistry([item("A", 1), item("B", 100), item("C", 1), item("Nunca", 0)])
+    rng = random.Random(3)
+    for _ in range(200):
+        opcoes = registro.sample(Jogador(), 2, rng)
+        assert len(set(opcoes)) == 2
+    assert sorted(type(opcao).__name__ for opcao in registro.sample(Jogador(), 5, rng)) == ["A", "B", "C"]
+
+
+def test_requisitos_dependem_do_estado_do_jogador():
+    jogador = Jogador()
+    sem_orbital = {type(opcao) for opcao in UPGRADES.pool(jogador)[0]}
+    assert OrbitalWeaponUnlock in sem_orbital and OrbitalDamageUpgrade not in sem_orbital
+    jogador.orbital_weapon_active = True
+    com_orbital = {type(opcao) for opcao in UPGRADES.pool(jogador)[0]}
+    assert OrbitalWeaponUnlock not in com_orbital and OrbitalDamageUpgrade in com_orbital
@@ -0,0 +1,47 @@
+import pytest
+from Mundo import Mundo, Comandos, PASSO_FIXO, MAX_PASSOS_POR_FRAME
+
+
+def test_frames_longos_e_curtos_avancam_o_mesmo_numero_de_ticks():
+    mundo = Mundo(semente=1)
+    ticks = sum(mundo.avancar(1 / 30)[0] for _ in range(60)) # 2 s a 30 FPS
+    assert ticks == mundo.tick == 240
+    outro = Mundo(semente=1)
+    sum(outro.avancar(1 / 240)[0] for _ in range(480)) # Os mesmos 2 s a 240 FPS
+    assert outro.tick == 240
+    assert outro.resumo_estado() == mundo.resumo_estado()
+
+
+def test_sobra_do_frame_fica_no_acumulador():
+    mundo = Mundo(semente=1)
+    passos, _ = mundo.avancar(PASSO_FIXO * 2.5)
+    assert passos == 2
+    assert mundo.alfa == pytest.approx(0.5)
+    passos, _ = mundo.avancar(PASSO_FIXO * 0.75)
+    assert passos == 1
+    assert mundo.alfa == pytest.approx(0.25)
+
+
+def test_frame_lento_roda_no_maximo_max_passos():
+    mundo = Mundo(semente=1)
+    passos, _ = mundo.avancar(1.0)
+    assert passos == MAX_PASSOS_POR_FRAME
+    assert mundo.alfa == pytest.approx(0, abs=1e-9) # O tempo que não coube é descartado, não cobrado no frame seguinte
+    assert mundo.avancar(PASSO_FIXO)[0] == 1
+
+
+def test_comandos_de_um_toque_valem_so_no_primeiro_tick():
+    mundo = Mundo(semente=1)
+    mundo.avancar(PASSO_FIXO * 4, Comandos(direita=True, disparos=((0.0, 0.0),)))
+    assert mundo.tick == 4
+    assert len(mundo.projeteis) == 1 # Quatro ticks, um disparo
+    assert mundo.jogador.hitbox.pos[0] > mundo.largura / 2 # A tecla vale para todos
+
+
+def test_mesma_semente_e_comandos_repetem_a_partida():
+    a, b = Mundo(semente=7), Mundo(semente=7)
+    for tick in range(1200):
+        comandos = Comandos(esquerda=tick % 240 < 120, baixo=tick % 90 < 30)
+        a.passo(PASSO_FIXO, comandos)
+        b.passo(PASSO_FIXO, comandos)
+    assert a.resumo_estado() == b.resumo_estado()
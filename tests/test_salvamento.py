@@ -0,0 +1,29 @@
+import pytest
+from Mundo import Mundo, PASSO_FIXO, LARGURA, ALTURA
+from Salvamento import estado_em_bytes, estado_de_bytes
+from simular import bot_simples
+
+SEMENTE = 3
+TICKS_DEPOIS = 4000 # Depois de salvar, as duas partidas seguem por estes ticks
+CONFERIR_A_CADA = 500
+
+
+# Na semente 3, o enxame está vazio no tick 2000 e o inimigo mais novo acabou de morrer no 9500:
+# nos dois casos o próximo handle não sai dos handles carregados
+@pytest.mark.parametrize("ticks_antes", [2000, 9500])
+def test_salvar_e_continuar_segue_a_partida_original(ticks_antes):
+    original = Mundo(LARGURA, ALTURA, semente=SEMENTE, usar_campo_de_fluxo=True)
+    for tick in range(ticks_antes):
+        original.passo(PASSO_FIXO, bot_simples(original, tick))
+    carregado = estado_de_bytes(estado_em_bytes(original))
+    assert carregado.resumo_estado() == original.resumo_estado()
+
+    for tick in range(ticks_antes, ticks_antes + TICKS_DEPOIS):
+        original.passo(PASSO_FIXO, bot_simples(original, tick))
+        carregado.passo(PASSO_FIXO, bot_simples(carregado, tick))
+        if tick % CONFERIR_A_CADA == 0:
+            assert carregado.resumo_estado() == original.resumo_estado(), f"divergiu até o tick {original.tick}"
+    assert carregado.resumo_estado() == original.resumo_estado()
+    n = original.inimigos.count
+    assert (carregado.inimigos.handle[:n] == original.inimigos.handle[:n]).all()
+    assert [g.handle for g in carregado.gemas_experiencia] == [g.handle for g in original.gemas_experiencia]